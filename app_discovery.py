@@ -0,0 +1,513 @@
+"""
+Gideon Application Discovery
+============================
+Finds installed applications so "open <anything installed>" works, not only
+the names listed in config.APPLICATIONS.
+
+Backends (config.APP_DISCOVERY_BACKENDS, earlier wins on a name clash):
+- known_paths: Chrome at config.CHROME_PATHS
+- desktop_entries: Linux .desktop files in the XDG application folders
+- start_menu: Windows Start Menu shortcuts
+- path: executables on PATH (off by default). These are never matched
+  fuzzily: only path_program() finds them, by exact name, and the open
+  handler asks for confirmation before running one
+
+Each backend lists a set of folders. The index keeps the apps found in each
+folder together with the folder's modification time and is saved to
+config.APP_INDEX_PATH. A background thread re-checks the modification times
+every config.APP_DISCOVERY_INTERVAL seconds and lists again only the folders
+that changed, so startup reads one JSON file and a command never touches the
+disk to find an application.
+
+Discovered apps (except PATH programs) join config.APPLICATIONS in the
+"applications" entity index (config entries win), which the generic open
+handler resolves names with.
+
+Usage:
+    python app_discovery.py              # Scan and list installed applications
+    python app_discovery.py --find code  # Show what a spoken name resolves to
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import logging
+import threading
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Fix Unicode encoding issues on Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8')
+
+import config
+
+logger = logging.getLogger("Gideon.AppDiscovery")
+
+# Bump when the index file layout changes
+INDEX_FORMAT = 1
+
+# Desktop entry field codes ("%u", "%F") that are not part of the command
+_FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+
+
+class DiscoveredApp:
+    """
+    An installed application and how to start it.
+    """
+
+    def __init__(self, name: str, command: List[str], source: str):
+        """
+        Initialize the app.
+
+        Args:
+            name: Spoken name ("google chrome")
+            command: Program and arguments, or a single shortcut (.lnk) path
+            source: Backend that found it
+        """
+        self.name = name
+        self.command = command
+        self.source = source
+
+    def launch(self) -> None:
+        """
+        Start the application.
+
+        Raises:
+            FileNotFoundError: If the program no longer exists
+        """
+        if sys.platform == 'win32' and self.command[0].lower().endswith((".lnk", ".url")):
+            os.startfile(self.command[0])
+        else:
+            subprocess.Popen(self.command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             start_new_session=sys.platform != 'win32')
+
+    def __repr__(self) -> str:
+        return f"DiscoveredApp({self.name!r}, {self.command!r}, source={self.source!r})"
+
+
+def _spoken_name(text: str) -> str:
+    """Name as it would be said ("google-chrome-stable" -> "google chrome stable")"""
+    return " ".join(text.lower().replace("-", " ").replace("_", " ").replace(".", " ").split())
+
+
+# ==================== BACKENDS ====================
+# A backend is (folders, scan): folders() lists the folders to watch and
+# scan(folder) returns {spoken name: command} for one folder.
+
+def _known_path_folders() -> List[Path]:
+    return [Path(path).parent for path in config.CHROME_PATHS]
+
+
+def _scan_known_paths(folder: Path) -> Dict[str, List[str]]:
+    apps: Dict[str, List[str]] = {}
+    for path in config.CHROME_PATHS:
+        if Path(path).parent == folder and os.path.isfile(path):
+            apps["chrome"] = apps["google chrome"] = [path]
+    return apps
+
+
+def _desktop_entry_folders() -> List[Path]:
+    if sys.platform == 'win32':
+        return []
+    data_home = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    roots = [data_home] + data_dirs.split(":") + [
+        str(Path.home() / ".local" / "share" / "flatpak" / "exports" / "share"),
+        "/var/lib/flatpak/exports/share",
+        "/var/lib/snapd/desktop",
+    ]
+    folders = []
+    for root in roots:
+        folder = Path(root) / "applications"
+        if root and folder not in folders:
+            folders.append(folder)
+    return folders
+
+
+def _parse_desktop_entry(path: Path) -> Optional[Tuple[str, List[str]]]:
+    """(spoken name, command) of a launchable .desktop file, or None"""
+    fields: Dict[str, str] = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line:
+                    key, _, value = line.partition("=")
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+
+    if (fields.get("Type") != "Application" or not fields.get("Name") or not fields.get("Exec")
+            or "true" in (fields.get("NoDisplay", "").lower(), fields.get("Hidden", "").lower(),
+                          fields.get("Terminal", "").lower())):
+        return None
+
+    try:
+        words = shlex.split(fields["Exec"])
+    except ValueError:
+        return None
+    command = [word.replace("%%", "%") for word in words if word not in _FIELD_CODES]
+    if not command:
+        return None
+    return _spoken_name(fields["Name"]), command
+
+
+def _scan_desktop_entries(folder: Path) -> Dict[str, List[str]]:
+    apps: Dict[str, List[str]] = {}
+    for path in sorted(folder.glob("*.desktop")):
+        entry = _parse_desktop_entry(path)
+        if entry is not None:
+            apps.setdefault(entry[0], entry[1])
+    return apps
+
+
+def _start_menu_folders() -> List[Path]:
+    if sys.platform != 'win32':
+        return []
+    folders = []
+    for base in (os.environ.get("PROGRAMDATA"), os.environ.get("APPDATA")):
+        if not base:
+            continue
+        root = Path(base) / "Microsoft" / "Windows" / "Start Menu" / "Programs"
+        # Shortcuts live in subfolders too, and a folder's modification
+        # time only changes for its own entries
+        for folder, _, _ in os.walk(root):
+            folders.append(Path(folder))
+    return folders
+
+
+def _scan_start_menu(folder: Path) -> Dict[str, List[str]]:
+    apps: Dict[str, List[str]] = {}
+    for path in sorted(folder.iterdir()):
+        if path.suffix.lower() in (".lnk", ".url") and "uninstall" not in path.stem.lower():
+            apps.setdefault(_spoken_name(path.stem), [str(path)])
+    return apps
+
+
+def _path_folders() -> List[Path]:
+    folders = []
+    for entry in os.environ.get("PATH", "").split(os.pathsep):
+        folder = Path(entry)
+        if entry and folder not in folders:
+            folders.append(folder)
+    return folders
+
+
+def _scan_path(folder: Path) -> Dict[str, List[str]]:
+    if sys.platform == 'win32':
+        extensions = {ext.lower() for ext in os.environ.get("PATHEXT", ".EXE").split(";") if ext}
+        is_program = lambda entry: os.path.splitext(entry.name)[1].lower() in extensions
+        name_of = lambda entry: os.path.splitext(entry.name)[0]
+    else:
+        is_program = lambda entry: os.access(entry.path, os.X_OK)
+        name_of = lambda entry: entry.name
+
+    apps: Dict[str, List[str]] = {}
+    with os.scandir(folder) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not entry.name.startswith(".") and entry.is_file() and is_program(entry):
+                apps.setdefault(_spoken_name(name_of(entry)), [entry.path])
+    return apps
+
+
+BACKENDS: Dict[str, Tuple[Callable[[], List[Path]], Callable[[Path], Dict[str, List[str]]]]] = {
+    "known_paths": (_known_path_folders, _scan_known_paths),
+    "desktop_entries": (_desktop_entry_folders, _scan_desktop_entries),
+    "start_menu": (_start_menu_folders, _scan_start_menu),
+    "path": (_path_folders, _scan_path),
+}
+
+
+# ==================== INDEX ====================
+
+def _folder_mtime(folder: Path) -> Optional[int]:
+    """Modification time of a folder, or None if it does not exist"""
+    try:
+        return os.stat(folder).st_mtime_ns
+    except OSError:
+        return None
+
+
+class AppDiscovery:
+    """
+    Persisted index of installed applications, refreshed folder by folder.
+    """
+
+    def __init__(self, path: Optional[Path] = None, backends: Optional[List[str]] = None,
+                 interval: float = config.APP_DISCOVERY_INTERVAL):
+        """
+        Initialize discovery (nothing is scanned yet).
+
+        Args:
+            path: Index file (default: config.APP_INDEX_PATH)
+            backends: Backend names in precedence order (default: config.APP_DISCOVERY_BACKENDS)
+            interval: Seconds between background refreshes
+        """
+        self.path = Path(path or config.APP_INDEX_PATH)
+        self.backends = list(backends or config.APP_DISCOVERY_BACKENDS)
+        self.interval = interval
+        self.apps: Dict[str, DiscoveredApp] = {}
+        self.generation = 0  # Increases whenever self.apps is replaced
+        self._folders: Dict[str, dict] = {}  # "backend|folder" -> {"mtime", "apps"}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> bool:
+        """
+        Read the saved index.
+
+        Returns:
+            True if an index was loaded
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Application index unreadable, rescanning: {e}")
+            return False
+
+        if not isinstance(saved, dict) or saved.get("format") != INDEX_FORMAT:
+            return False
+
+        with self._lock:
+            self._folders = saved.get("folders", {})
+            self._publish()
+        logger.info(f"Application index loaded: {len(self.apps)} applications")
+        return True
+
+    def save(self) -> None:
+        """Write the index next to its destination and rename it into place"""
+        with self._lock:
+            saved = {"format": INDEX_FORMAT, "created": time.time(), "folders": self._folders}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_name(self.path.name + ".tmp")
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            os.replace(temporary, self.path)
+
+    def refresh(self) -> int:
+        """
+        List again the folders whose modification time changed.
+
+        Returns:
+            Number of folders scanned (0 = the index was current)
+        """
+        start = time.perf_counter()
+        folders: Dict[str, dict] = {}
+        scanned = 0
+
+        for backend in self.backends:
+            if backend not in BACKENDS:
+                logger.warning(f"Unknown application discovery backend '{backend}'")
+                continue
+            list_folders, scan = BACKENDS[backend]
+            try:
+                backend_folders = list_folders()
+            except OSError as e:
+                logger.warning(f"Application discovery '{backend}' failed: {e}")
+                continue
+
+            for folder in backend_folders:
+                key = f"{backend}|{folder}"
+                mtime = _folder_mtime(folder)
+                cached = self._folders.get(key)
+                if cached is not None and cached["mtime"] == mtime:
+                    folders[key] = cached
+                    continue
+
+                apps: Dict[str, List[str]] = {}
+                if mtime is not None:
+                    try:
+                        apps = scan(folder)
+                    except OSError as e:
+                        logger.debug(f"Could not list {folder}: {e}")
+                folders[key] = {"mtime": mtime, "apps": apps}
+                scanned += 1
+
+        if scanned or folders.keys() != self._folders.keys():
+            with self._lock:
+                self._folders = folders
+                self._publish()
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"Could not save application index: {e}")
+            logger.info(f"Application index refreshed: {scanned} folder(s) scanned, "
+                        f"{len(self.apps)} applications in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return scanned
+
+    def _publish(self) -> None:
+        """Rebuild self.apps from the folders (lock held); earlier backends win"""
+        apps: Dict[str, DiscoveredApp] = {}
+        for key, folder in self._folders.items():
+            backend = key.partition("|")[0]
+            for name, command in folder["apps"].items():
+                if name not in apps:
+                    apps[name] = DiscoveredApp(name, command, backend)
+        self.apps = apps
+        self.generation += 1
+
+    def start(self) -> None:
+        """Refresh in a background thread now and every interval"""
+        if self._thread is not None:
+            logger.warning("Application discovery already running")
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="GideonAppDiscovery")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop refreshing"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Refresh until stopped"""
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error in application discovery: {e}")
+            if self._stop_event.wait(self.interval):
+                break
+
+
+# Global discovery instance
+_discovery: Optional[AppDiscovery] = None
+
+
+def get_app_discovery() -> AppDiscovery:
+    """
+    Get or create the global application index (singleton pattern).
+
+    Returns:
+        AppDiscovery with the saved index loaded
+    """
+    global _discovery
+
+    if _discovery is None:
+        _discovery = AppDiscovery()
+        if config.ENABLE_APP_DISCOVERY:
+            _discovery.load()
+    return _discovery
+
+
+def start_discovery() -> AppDiscovery:
+    """
+    Load the saved index and keep it current in the background.
+
+    Returns:
+        Running AppDiscovery
+    """
+    discovery = get_app_discovery()
+    if config.ENABLE_APP_DISCOVERY:
+        discovery.start()
+    return discovery
+
+
+def chrome_path() -> Optional[str]:
+    """
+    Chrome executable: config.CHROME_PATH, else the one discovery found,
+    else config.find_chrome_path() (probed once, for when discovery is off
+    or has not finished its first scan).
+
+    Returns:
+        Path, or None if Chrome is not installed
+    """
+    if config.CHROME_PATH:
+        return config.CHROME_PATH
+    apps = get_app_discovery().apps
+    app = apps.get("chrome") or apps.get("google chrome")
+    if app is not None and app.source != "start_menu":
+        return app.command[0]
+    return _probed_chrome_path()
+
+
+@lru_cache(maxsize=1)
+def _probed_chrome_path() -> Optional[str]:
+    """config.find_chrome_path(), probed on first use only"""
+    return config.find_chrome_path()
+
+
+def path_program(name: str) -> Optional[DiscoveredApp]:
+    """
+    Find a program on PATH by its exact name.
+
+    Args:
+        name: Spoken name ("htop")
+
+    Returns:
+        DiscoveredApp found by the "path" backend, or None
+    """
+    app = get_app_discovery().apps.get(_spoken_name(name))
+    return app if app is not None and app.source == "path" else None
+
+
+# ==================== COMMAND LINE ====================
+
+def main():
+    """Main entry point"""
+    import argparse
+    from entity_index import get_entity_index
+
+    parser = argparse.ArgumentParser(
+        description="Scan installed applications for the generic \"open\" command",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python app_discovery.py
+  python app_discovery.py --find "vs code"
+  python app_discovery.py --backend desktop_entries --backend path
+        """
+    )
+
+    parser.add_argument('--find', metavar='NAME', help='Show what a spoken name resolves to')
+    parser.add_argument('--backend', action='append', choices=sorted(BACKENDS), help='Backends to use (repeatable)')
+
+    args = parser.parse_args()
+
+    discovery = AppDiscovery(backends=args.backend)
+    discovery.load()
+    start = time.perf_counter()
+    scanned = discovery.refresh()
+    print(f"✅ {len(discovery.apps)} applications ({scanned} folder(s) scanned "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms): {discovery.path}")
+
+    if args.find:
+        global _discovery
+        _discovery = discovery
+        matches = get_entity_index("applications").search(args.find)
+        if not matches:
+            print(f"❌ Nothing matches '{args.find}'")
+        for name, score in matches:
+            app = discovery.apps.get(name)
+            target = " ".join(app.command) if app is not None else config.APPLICATIONS.get(name)
+            print(f"   {score:.2f}  {name:30} {target}")
+    else:
+        for name in sorted(discovery.apps):
+            app = discovery.apps[name]
+            print(f"   {name:30} [{app.source}] {' '.join(app.command)}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
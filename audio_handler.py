@@ -23,10 +23,13 @@ import json
 import wave
 import time
 import logging
+from math import gcd
 from pathlib import Path
-from typing import Optional, Callable, Tuple
+from typing import Optional, Callable, Tuple, List, Dict
 import threading
 import queue
+from collections import deque
+from contextlib import contextmanager
 
 # Fix Unicode encoding issues on Windows
 if sys.platform == 'win32':
@@ -46,8 +49,647 @@ except ImportError as e:
     print("   pip install vosk sounddevice numpy")
     sys.exit(1)
 
+from audio_preprocessing import AudioPreprocessor
+from recognizer_worker import RecognizerWorker, RemoteModel, RemoteRecognizer, result_confidence
+from model_server import ServerModel
+
 logger = logging.getLogger("Gideon.AudioHandler")
 
+# Fallback wake words when config is not importable (matches config.WAKE_WORDS)
+DEFAULT_WAKE_WORDS = ["gideon", "hey gideon", "ok gideon"]
+
+# Seconds after Gideon stops speaking during which captured audio is still
+# its own voice (room echo, device latency)
+PLAYBACK_TAIL = 0.3
+
+
+# ==================== OWN-VOICE GATE ====================
+# Handlers on the command executor speak while the main loop is listening.
+# Listens drop every block captured during playback (plus PLAYBACK_TAIL) and
+# start over, so Gideon never dispatches what it said itself.
+_playback_lock = threading.Lock()
+_playback_depth = 0
+_playback_generation = 0
+_playback_ended = float("-inf")
+
+
+@contextmanager
+def playback():
+    """Context manager held while Gideon speaks (see utils.speak)"""
+    global _playback_depth, _playback_generation, _playback_ended
+    with _playback_lock:
+        _playback_depth += 1
+        _playback_generation += 1
+    try:
+        yield
+    finally:
+        with _playback_lock:
+            _playback_depth -= 1
+            _playback_ended = time.monotonic()
+
+
+def playback_active() -> bool:
+    """True while Gideon speaks and for PLAYBACK_TAIL seconds afterwards"""
+    return _playback_depth > 0 or time.monotonic() - _playback_ended < PLAYBACK_TAIL
+
+
+def playback_generation() -> int:
+    """Number of times Gideon started speaking (changes when playback begins)"""
+    return _playback_generation
+
+
+def create_recognizer(model, sample_rate: int, grammar: Optional[str] = None):
+    """
+    Create a recognizer for an in-process vosk.Model, an out-of-process
+    RemoteModel or a model hosted by the model server (ServerModel).
+
+    Args:
+        model: vosk.Model, RemoteModel or ServerModel
+        sample_rate: Audio sample rate
+        grammar: Optional JSON grammar restricting the vocabulary
+
+    Returns:
+        vosk.KaldiRecognizer or RemoteRecognizer (same interface)
+    """
+    if isinstance(model, (RemoteModel, ServerModel)):
+        return RemoteRecognizer(model, sample_rate, grammar)
+    if grammar:
+        return vosk.KaldiRecognizer(model, sample_rate, grammar)
+    return vosk.KaldiRecognizer(model, sample_rate)
+
+
+class WakeWordSpotter:
+    """
+    Lightweight always-on wake word spotter (stage one of the pipeline).
+
+    Two cheap checks run before the full open-vocabulary recognizer is
+    ever involved:
+    1. A NumPy energy gate that skips decoding entirely while the room is quiet
+    2. A grammar-restricted KaldiRecognizer that only knows the wake words
+
+    The grammar recognizer shares the already loaded model, so the spotter
+    adds no memory and decodes against a tiny search graph.
+    """
+
+    def __init__(
+        self,
+        model,
+        sample_rate: int,
+        wake_words: Optional[List[str]] = None,
+        energy_threshold: float = 100.0,
+        hangover_blocks: int = 5
+    ):
+        """
+        Initialize the wake word spotter.
+
+        Args:
+            model: Loaded vosk.Model, RemoteModel or ServerModel (shared with the full recognizer)
+            sample_rate: Audio sample rate of the blocks fed to process()
+            wake_words: Wake phrases to listen for (default: DEFAULT_WAKE_WORDS)
+            energy_threshold: Mean absolute amplitude that counts as sound
+            hangover_blocks: Blocks to keep decoding after the energy drops
+        """
+        self.sample_rate = sample_rate
+        self.wake_words = [w.lower() for w in (wake_words or DEFAULT_WAKE_WORDS)]
+        self.energy_threshold = energy_threshold
+        self.hangover_blocks = hangover_blocks
+        self._active_blocks = 0
+
+        # "[unk]" absorbs any speech that is not a wake word
+        grammar = json.dumps(self.wake_words + ["[unk]"])
+        self.recognizer = create_recognizer(model, sample_rate, grammar)
+
+    def process(self, data: bytes) -> bool:
+        """
+        Feed one block of 16-bit mono audio to the spotter.
+
+        Args:
+            data: Raw int16 audio bytes
+
+        Returns:
+            True if a wake word was spotted in this block
+        """
+        # Stage 1: energy gate - silent blocks never reach the decoder
+        samples = np.frombuffer(data, dtype=np.int16)
+        if samples.size and np.abs(samples).mean() >= self.energy_threshold:
+            self._active_blocks = self.hangover_blocks
+        elif self._active_blocks > 0:
+            self._active_blocks -= 1
+        else:
+            return False
+
+        # Stage 2: grammar-restricted decode (partials give the fastest trigger)
+        if self.recognizer.AcceptWaveform(data):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+
+        if self._contains_wake_word(text):
+            logger.info(f"Wake word spotted: '{text}'")
+            self.reset()
+            return True
+
+        # End of a sound segment - drop decoder state before going idle
+        if self._active_blocks == 0:
+            self.recognizer.Reset()
+
+        return False
+
+    def reset(self) -> None:
+        """Clear decoder state and the energy gate"""
+        self.recognizer.Reset()
+        self._active_blocks = 0
+
+    def _contains_wake_word(self, text: str) -> bool:
+        """Check if decoded text contains any wake phrase as whole words."""
+        padded = f" {text.lower().strip()} "
+        return any(f" {wake_word} " in padded for wake_word in self.wake_words)
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational-ratio resampler (e.g. 48 kHz or 44.1 kHz -> 16 kHz).
+
+    Implements upsample-by-L, low-pass, downsample-by-M as a polyphase filter:
+    each output sample only multiplies the taps of the one phase that lines up
+    with real input samples. Filter history and phase are carried between
+    blocks, so feeding a stream block by block gives the same output as
+    resampling it in one go. All per-block work is vectorized NumPy.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, taps_per_phase: int = 24):
+        """
+        Initialize the resampler.
+
+        Args:
+            input_rate: Sample rate of the audio fed to process()
+            output_rate: Sample rate of the audio returned
+            taps_per_phase: Filter length per phase (higher = sharper cutoff, more CPU)
+        """
+        self.input_rate = int(input_rate)
+        self.output_rate = int(output_rate)
+
+        divisor = gcd(self.input_rate, self.output_rate)
+        self.up = self.output_rate // divisor
+        self.down = self.input_rate // divisor
+        self.taps_per_phase = taps_per_phase
+
+        # Windowed-sinc prototype low-pass at the upsampled rate, cut off just
+        # below the lower of the two Nyquist frequencies
+        num_taps = taps_per_phase * self.up
+        cutoff = 0.95 * min(1.0, self.up / self.down) / self.up
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        prototype = cutoff * np.sinc(cutoff * n) * np.kaiser(num_taps, 8.0) * self.up
+
+        # phases[p, t] = prototype[p + t * up]
+        self._phases = prototype.reshape(taps_per_phase, self.up).T.astype(np.float32)
+        self._tap_offsets = np.arange(taps_per_phase)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear filter history (call between unrelated streams)"""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._offset = 0  # Next output position, in upsampled samples from block start
+
+    def process(self, samples: "np.ndarray") -> "np.ndarray":
+        """
+        Resample one block.
+
+        Args:
+            samples: 1-D int16 input block at input_rate
+
+        Returns:
+            1-D int16 output block at output_rate (length varies by +-1 between blocks)
+        """
+        if self.up == self.down:
+            return samples
+
+        block = samples.astype(np.float32)
+        buffer = np.concatenate([self._history, block])
+
+        # Outputs whose newest input sample lies inside this block
+        upsampled_length = len(block) * self.up
+        count = max(0, -(-(upsampled_length - self._offset) // self.down))
+        positions = self._offset + self.down * np.arange(count)
+        input_index, phase = np.divmod(positions, self.up)
+
+        # Gather taps_per_phase input samples per output and apply that output's phase
+        gather = (self.taps_per_phase - 1 + input_index)[:, None] - self._tap_offsets[None, :]
+        output = np.einsum('ij,ij->i', buffer[gather], self._phases[phase])
+
+        self._offset = self._offset + count * self.down - upsampled_length
+        self._history = buffer[len(buffer) - (self.taps_per_phase - 1):]
+
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16)
+
+    def process_bytes(self, data: bytes) -> bytes:
+        """Resample one block of raw int16 bytes"""
+        return self.process(np.frombuffer(data, dtype=np.int16)).tobytes()
+
+
+def benchmark_resampler(
+    input_rate: int,
+    output_rate: int,
+    seconds: float = 10.0,
+    block_seconds: float = 0.1
+) -> float:
+    """
+    Measure the resampler's real-time factor on synthetic audio.
+
+    Args:
+        input_rate: Capture sample rate
+        output_rate: Model sample rate
+        seconds: Seconds of audio to process
+        block_seconds: Block size, as used by the input streams
+
+    Returns:
+        Processing time / audio duration (must stay far below 1.0)
+    """
+    resampler = PolyphaseResampler(input_rate, output_rate)
+    block_frames = int(input_rate * block_seconds)
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(input_rate * seconds)) * 3000).astype(np.int16)
+
+    start = time.perf_counter()
+    for offset in range(0, len(audio), block_frames):
+        resampler.process(audio[offset:offset + block_frames])
+    elapsed = time.perf_counter() - start
+
+    return elapsed / seconds
+
+
+def get_device_sample_rate(device: Optional[int] = None) -> int:
+    """
+    Get the native (default) sample rate of an input device.
+
+    Args:
+        device: Audio input device index (None = default)
+
+    Returns:
+        Device default sample rate in Hz
+    """
+    return int(sd.query_devices(device, 'input')['default_samplerate'])
+
+
+def read_wav_int16(wav_path: Path, sample_rate: int) -> "np.ndarray":
+    """
+    Read a PCM WAV file as mono int16 samples, resampled to sample_rate if needed.
+
+    Args:
+        wav_path: Path to a 16-bit PCM WAV file
+        sample_rate: Sample rate the caller expects
+
+    Returns:
+        1-D int16 NumPy array
+
+    Raises:
+        ValueError: If the file is not 16-bit PCM
+    """
+    with wave.open(str(wav_path), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        file_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width != 2:
+        raise ValueError(f"{wav_path}: expected 16-bit PCM, got {sample_width * 8}-bit")
+
+    samples = np.frombuffer(frames, dtype=np.int16)
+    if channels > 1:
+        # Downmix to mono (Vosk requires a single channel)
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+    if file_rate != sample_rate:
+        samples = PolyphaseResampler(file_rate, sample_rate).process(samples)
+
+    return samples
+
+
+class WavInputStream:
+    """
+    File-driven stand-in for sounddevice.RawInputStream.
+
+    Replays a WAV file block by block into the same callback the microphone
+    stream would call, so recognition code cannot tell the difference.
+    A short tail of silence is appended so Vosk can endpoint the last phrase.
+    """
+
+    def __init__(
+        self,
+        wav_path: Path,
+        samplerate: int,
+        blocksize: int,
+        callback: Callable,
+        realtime: bool = False,
+        trailing_silence: float = 1.0
+    ):
+        """
+        Initialize the WAV replay stream.
+
+        Args:
+            wav_path: 16-bit PCM WAV file to replay
+            samplerate: Sample rate expected by the recognizer
+            blocksize: Frames per callback block
+            callback: sounddevice-style callback(indata, frames, time_info, status)
+            realtime: Sleep between blocks to mimic a live device
+            trailing_silence: Seconds of silence appended after the file
+        """
+        self.wav_path = Path(wav_path)
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.callback = callback
+        self.realtime = realtime
+        self.trailing_silence = trailing_silence
+        self.active = False
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "WavInputStream":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start replaying the file on a background thread"""
+        samples = read_wav_int16(self.wav_path, self.samplerate)
+        silence = np.zeros(int(self.trailing_silence * self.samplerate), dtype=np.int16)
+        audio = np.concatenate([samples, silence])
+
+        self._stop_event.clear()
+        self.active = True
+        self._thread = threading.Thread(target=self._run, args=(audio,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop replaying and wait for the background thread"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.active = False
+
+    def _run(self, audio: "np.ndarray") -> None:
+        """Deliver blocks to the callback until the file is exhausted"""
+        block_duration = self.blocksize / self.samplerate
+
+        for offset in range(0, len(audio), self.blocksize):
+            if self._stop_event.is_set():
+                break
+            block = audio[offset:offset + self.blocksize]
+            self.callback(block.tobytes(), len(block), None, None)
+            if self.realtime:
+                time.sleep(block_duration)
+
+        self.active = False
+
+
+class SharedInputStream:
+    """
+    One long-lived microphone stream shared by every listen call.
+
+    Opening and closing a PortAudio stream per listen adds latency and clips
+    the first syllable. This keeps a single RawInputStream running, fans its
+    blocks out to subscribers, and keeps a pre-roll ring buffer of the most
+    recent unconsumed audio so a new listen starts with the audio captured
+    just before it began.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        device: Optional[int] = None,
+        blocksize: Optional[int] = None,
+        preroll_seconds: float = 0.5,
+        capture_rate: Optional[int] = None
+    ):
+        """
+        Initialize the shared stream (call start() to open the device).
+
+        Args:
+            sample_rate: Sample rate delivered to subscribers
+            device: Audio input device index (None = default)
+            blocksize: Frames per block at sample_rate (default: 100 ms)
+            preroll_seconds: Audio kept from before each listen starts
+            capture_rate: Device sample rate, resampled to sample_rate (None = same)
+        """
+        self.sample_rate = sample_rate
+        self.capture_rate = capture_rate or sample_rate
+        self.device = device
+        self.blocksize = blocksize or sample_rate // 10
+        self._resampler: Optional[PolyphaseResampler] = None
+        if self.capture_rate != sample_rate:
+            self._resampler = PolyphaseResampler(self.capture_rate, sample_rate)
+        preroll_blocks = max(1, int(round(preroll_seconds * sample_rate / self.blocksize)))
+        self._preroll: deque = deque(maxlen=preroll_blocks)
+        self._subscribers: List[Callable] = []
+        self._lock = threading.Lock()
+        self._stream = None
+
+    @property
+    def active(self) -> bool:
+        """True while the underlying device stream is running"""
+        return self._stream is not None and self._stream.active
+
+    def start(self) -> None:
+        """Open and start the device stream (no-op if already running)"""
+        if self._stream is not None:
+            return
+
+        if self._resampler is not None:
+            self._resampler.reset()
+
+        self._stream = sd.RawInputStream(
+            samplerate=self.capture_rate,
+            blocksize=round(self.blocksize * self.capture_rate / self.sample_rate),
+            dtype='int16',
+            channels=1,
+            device=self.device,
+            callback=self._audio_callback
+        )
+        self._stream.start()
+        logger.info(f"Persistent input stream started ({self._preroll.maxlen * self.blocksize / self.sample_rate:.1f} s pre-roll)")
+
+    def stop(self) -> None:
+        """Stop and close the device stream"""
+        if self._stream is None:
+            return
+
+        try:
+            self._stream.stop()
+            self._stream.close()
+        finally:
+            self._stream = None
+            self.clear_preroll()
+            logger.info("Persistent input stream stopped")
+
+    def clear_preroll(self) -> None:
+        """Drop buffered pre-roll audio (e.g. after Gideon itself has spoken)"""
+        with self._lock:
+            self._preroll.clear()
+
+    def subscribe(self, callback: Callable, include_preroll: bool = True) -> "StreamSubscription":
+        """
+        Create a subscription that feeds this stream's blocks to a callback.
+
+        Args:
+            callback: sounddevice-style callback(indata, frames, time_info, status)
+            include_preroll: Replay buffered pre-roll audio first
+
+        Returns:
+            StreamSubscription context manager
+        """
+        return StreamSubscription(self, callback, include_preroll)
+
+    def _add_subscriber(self, callback: Callable, include_preroll: bool) -> None:
+        """Register a subscriber, replaying pre-roll under the lock to keep block order"""
+        with self._lock:
+            if include_preroll:
+                for data in self._preroll:
+                    callback(data, len(data) // 2, None, None)
+            self._preroll.clear()
+            self._subscribers.append(callback)
+
+    def _remove_subscriber(self, callback: Callable) -> None:
+        """Unregister a subscriber"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _audio_callback(self, indata, frames, time_info, status) -> None:
+        """Called by sounddevice for each block; fans out or buffers as pre-roll"""
+        data = bytes(indata)
+        if self._resampler is not None:
+            data = self._resampler.process_bytes(data)
+            frames = len(data) // 2
+
+        with self._lock:
+            if not self._subscribers:
+                # Nobody listening - keep it as pre-roll for the next listen
+                self._preroll.append(data)
+                return
+            for callback in self._subscribers:
+                callback(data, frames, time_info, status)
+
+
+class StreamSubscription:
+    """
+    Context manager that reads from a SharedInputStream.
+
+    Quacks like sd.RawInputStream (context manager with an `active` flag),
+    so listen code can use it wherever it would open its own stream.
+    """
+
+    def __init__(self, shared_stream: SharedInputStream, callback: Callable, include_preroll: bool = True):
+        self.shared_stream = shared_stream
+        self.callback = callback
+        self.include_preroll = include_preroll
+
+    @property
+    def active(self) -> bool:
+        return self.shared_stream.active
+
+    def __enter__(self) -> "StreamSubscription":
+        self.shared_stream._add_subscriber(self.callback, self.include_preroll)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shared_stream._remove_subscriber(self.callback)
+
+
+class SlotRecognizer:
+    """
+    Large-model recognizer for free-form command parameters.
+
+    Tiered recognition keeps the small model for every utterance and only
+    re-decodes the slot audio (a YouTube query, a folder name) with a large
+    model. The large model is loaded on first use and unloaded again after
+    idle_timeout seconds without requests, so its memory is only held while
+    it is actually being used.
+    """
+
+    def __init__(self, model_path: str, sample_rate: int = 16000, idle_timeout: float = 300.0):
+        """
+        Initialize the slot recognizer (the model is not loaded yet).
+
+        Args:
+            model_path: Path to the large Vosk model directory
+            sample_rate: Sample rate of the audio passed to transcribe()
+            idle_timeout: Seconds without requests before the model is unloaded
+        """
+        self.model_path = Path(model_path)
+        self.sample_rate = sample_rate
+        self.idle_timeout = idle_timeout
+        self._model = None
+        self._lock = threading.Lock()
+        self._unload_timer: Optional[threading.Timer] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True while the large model is in memory"""
+        return self._model is not None
+
+    def transcribe(self, audio: bytes) -> str:
+        """
+        Decode an audio segment with the large model.
+
+        Args:
+            audio: Raw int16 mono audio at sample_rate
+
+        Returns:
+            Recognized text (may be empty)
+
+        Raises:
+            FileNotFoundError: If the large model is not installed
+        """
+        with self._lock:
+            self._cancel_unload()
+
+            if self._model is None:
+                if not self.model_path.exists():
+                    raise FileNotFoundError(f"Slot model not found at: {self.model_path}")
+                load_start = time.perf_counter()
+                logger.info(f"Loading slot model from: {self.model_path}")
+                self._model = vosk.Model(str(self.model_path))
+                logger.info(f"Slot model loaded in {time.perf_counter() - load_start:.1f} s")
+
+            try:
+                recognizer = vosk.KaldiRecognizer(self._model, self.sample_rate)
+                recognizer.AcceptWaveform(audio)
+                return json.loads(recognizer.FinalResult()).get("text", "").strip()
+            finally:
+                self._schedule_unload()
+
+    def unload(self) -> None:
+        """Release the large model immediately"""
+        with self._lock:
+            self._cancel_unload()
+            self._release()
+
+    def _release(self) -> None:
+        """Drop the model reference (lock must be held)"""
+        if self._model is not None:
+            self._model = None
+            logger.info("Slot model unloaded")
+
+    def _idle_unload(self) -> None:
+        """Timer callback: unload after idle_timeout"""
+        with self._lock:
+            self._unload_timer = None
+            self._release()
+
+    def _schedule_unload(self) -> None:
+        """Restart the idle timer (lock must be held)"""
+        self._unload_timer = threading.Timer(self.idle_timeout, self._idle_unload)
+        self._unload_timer.daemon = True
+        self._unload_timer.start()
+
+    def _cancel_unload(self) -> None:
+        """Stop a pending idle timer (lock must be held)"""
+        if self._unload_timer is not None:
+            self._unload_timer.cancel()
+            self._unload_timer = None
+
 
 class VoskAudioHandler:
     """
@@ -61,7 +703,11 @@ class VoskAudioHandler:
         self,
         model_path: str = "vosk-model-small-en-us-0.15",
         sample_rate: int = 16000,
-        device: Optional[int] = None
+        device: Optional[int] = None,
+        max_alternatives: int = 0,
+        native_rate: bool = False,
+        out_of_process: bool = False,
+        use_model_server: bool = False
     ):
         """
         Initialize Vosk audio handler.
@@ -70,6 +716,13 @@ class VoskAudioHandler:
             model_path: Path to Vosk model directory
             sample_rate: Audio sample rate (16000 Hz recommended for speech)
             device: Audio input device index (None = default)
+            max_alternatives: Number of N-best hypotheses to request (0 = single best)
+            native_rate: Capture at the device's default sample rate and
+                resample to sample_rate in software
+            out_of_process: Load the model in a dedicated worker process
+                (audio via shared memory, restarted automatically on a crash)
+            use_model_server: Attach to a running model_server.py instead of
+                loading the model (falls back to loading it if no server runs)
 
         Raises:
             FileNotFoundError: If Vosk model not found
@@ -80,6 +733,49 @@ class VoskAudioHandler:
         self.device = device
         self.audio_queue = queue.Queue()
         self.is_listening = False
+        self._wake_word_spotter: Optional[WakeWordSpotter] = None
+        self._phrase_recognizers: Dict[Tuple[str, ...], object] = {}  # Grammar recognizers by phrase set
+        self.max_alternatives = max_alternatives
+
+        # Device capture rate; audio is resampled to sample_rate when they differ
+        self.capture_rate = sample_rate
+        if native_rate:
+            try:
+                self.capture_rate = get_device_sample_rate(device)
+            except Exception as e:
+                logger.warning(f"Could not query device sample rate, capturing at {sample_rate} Hz: {e}")
+        if self.capture_rate != sample_rate:
+            logger.info(f"Capturing at {self.capture_rate} Hz, resampling to {sample_rate} Hz")
+
+        # File-driven input (see set_wav_input); None = live microphone
+        self.wav_input: Optional[Path] = None
+        self.wav_realtime = False
+
+        # Long-lived microphone stream (see start_input_stream); None = open per listen
+        self._shared_stream: Optional[SharedInputStream] = None
+
+        # Optional N-best rescoring hook: receives [(text, confidence), ...]
+        # in recognizer order and returns the text to use (see commands.rescore_alternatives)
+        self.rescorer: Optional[Callable[[List[Tuple[str, float]]], Optional[str]]] = None
+
+        # Optional noise reduction + AGC applied to every block before recognition
+        self.preprocessor: Optional[AudioPreprocessor] = None
+
+        # Tiered recognition: large model for free-form slots (see transcribe_slot)
+        self.slot_recognizer: Optional[SlotRecognizer] = None
+        self.last_utterance_audio = b""  # Audio fed to the recognizer by the last listen
+        self.last_utterance_offset = 0.0  # Recognizer time (seconds) where that audio starts
+        self.last_words: Optional[List[dict]] = None  # Word timings of the last result
+        self.last_confidence: Optional[float] = None  # Its confidence (see result_confidence)
+        # Vosk word times count from the recognizer's creation, across Reset()
+        self._recognizer_samples = 0
+
+        # Parallel decoding in other languages: language code -> worker process.
+        # Every streamed block is also fed to these workers; at the end of the
+        # utterance language_arbiter picks from [(language, text, confidence), ...]
+        self.language_workers: Dict[str, RecognizerWorker] = {}
+        self.language_arbiter: Optional[Callable[[List[Tuple[str, str, Optional[float]]]], Optional[str]]] = None
+        self._listen_outcome = "silence"  # "silence", "early" or "speech"
 
         # Validate model exists
         if not self.model_path.exists():
@@ -92,14 +788,28 @@ class VoskAudioHandler:
                 f"Recommended: vosk-model-small-en-us-0.15 (40MB)"
             )
 
+        # Attach to the model server (no load cost) when one is running
+        self.model = None
+        if use_model_server:
+            try:
+                self.model = ServerModel(str(self.model_path))
+                self.recognizer = self._create_recognizer()
+                print(f"✓ Attached to model server ({self.model_path.name})")
+                return
+            except (ConnectionError, RuntimeError) as e:
+                logger.warning(f"Model server unavailable, loading model locally: {e}")
+                self.model = None
+
         # Load Vosk model
         try:
             logger.info(f"Loading Vosk model from: {self.model_path}")
             print(f"🔄 Loading Vosk model: {self.model_path.name}...")
 
-            self.model = vosk.Model(str(self.model_path))
-            self.recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)  # Enable word-level timestamps
+            if out_of_process:
+                self.model = RemoteModel(str(self.model_path), sample_rate=sample_rate)
+            else:
+                self.model = vosk.Model(str(self.model_path))
+            self.recognizer = self._create_recognizer()
 
             logger.info("Vosk model loaded successfully")
             print("✓ Vosk audio handler initialized (offline mode)")
@@ -115,7 +825,9 @@ class VoskAudioHandler:
         self,
         duration: int = 5,
         phrase_time_limit: int = 10,
-        silence_threshold: float = 500.0
+        silence_threshold: float = 500.0,
+        early_commit: Optional[Callable[[str], bool]] = None,
+        stable_blocks: int = 3
     ) -> Optional[str]:
         """
         Listen for a single voice command with timeout.
@@ -124,6 +836,10 @@ class VoskAudioHandler:
             duration: Maximum seconds to wait for speech to start
             phrase_time_limit: Maximum seconds for complete phrase
             silence_threshold: Volume threshold to detect speech (lower = more sensitive)
+            early_commit: Optional predicate for stable partial hypotheses. When
+                given, audio is streamed and listening stops as soon as a partial
+                has been stable for stable_blocks blocks and the predicate accepts it.
+            stable_blocks: Number of unchanged 100 ms partials before early commit
 
         Returns:
             Recognized text (lowercase) or None if no speech detected
@@ -131,17 +847,39 @@ class VoskAudioHandler:
         logger.debug("Starting single command listen")
 
         try:
+            # Replayed WAV input and the persistent stream always use the streaming path
+            if early_commit is not None or self.wav_input is not None or self._shared_stream is not None:
+                text = self._listen_streaming(
+                    duration, phrase_time_limit, silence_threshold, early_commit, stable_blocks
+                )
+                if self.language_workers and self._listen_outcome == "speech":
+                    text = self._arbitrate_languages(text)
+                if text:
+                    logger.info(f"Recognized: '{text}'")
+                    return text.lower()
+                logger.debug("No text recognized")
+                return None
+
             # Record audio
             logger.debug(f"Recording audio for {phrase_time_limit} seconds...")
 
+            generation = playback_generation()
             recording = sd.rec(
-                int(phrase_time_limit * self.sample_rate),
-                samplerate=self.sample_rate,
+                int(phrase_time_limit * self.capture_rate),
+                samplerate=self.capture_rate,
                 channels=1,
                 dtype='int16',
                 device=self.device,
                 blocking=True
             )
+            if playback_active() or playback_generation() != generation:
+                logger.debug("Recording overlapped Gideon's speech, discarded")
+                return None
+            if self.capture_rate != self.sample_rate:
+                recording = PolyphaseResampler(self.capture_rate, self.sample_rate).process(recording[:, 0])
+            if self.preprocessor is not None:
+                self.preprocessor.reset()
+                recording = self.preprocessor.process(recording.reshape(-1))
 
             # Check if audio contains speech (volume-based detection)
             audio_volume = np.abs(recording).mean()
@@ -153,11 +891,14 @@ class VoskAudioHandler:
 
             # Convert to bytes for Vosk
             audio_bytes = recording.tobytes()
+            self.last_utterance_audio = audio_bytes
+            self.last_utterance_offset = self._recognizer_samples / self.sample_rate
+            self.last_words = None
+            self.last_confidence = None
 
             # Process with Vosk
-            if self.recognizer.AcceptWaveform(audio_bytes):
-                result = json.loads(self.recognizer.Result())
-                text = result.get("text", "").strip()
+            if self._accept_waveform(audio_bytes):
+                text = self._result_text(self.recognizer.Result())
                 logger.debug(f"Final result: {text}")
             else:
                 # Get partial result if no final result
@@ -166,8 +907,7 @@ class VoskAudioHandler:
                 logger.debug(f"Partial result: {text}")
 
             # Reset recognizer for next command
-            self.recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)
+            self.recognizer.Reset()
 
             if text:
                 logger.info(f"Recognized: '{text}'")
@@ -191,10 +931,595 @@ class VoskAudioHandler:
             print(f"❌ Audio error: {e}")
             return None
 
+    def start_input_stream(self, preroll_seconds: float = 0.5) -> None:
+        """
+        Keep one microphone stream open for all subsequent listens.
+
+        Individual listens then become cheap reads from the running stream and
+        start with up to preroll_seconds of audio from just before they began.
+
+        Args:
+            preroll_seconds: Seconds of pre-roll audio to keep
+
+        Raises:
+            sd.PortAudioError: If the device cannot be opened
+        """
+        if self._shared_stream is None:
+            self._shared_stream = SharedInputStream(
+                self.sample_rate,
+                device=self.device,
+                preroll_seconds=preroll_seconds,
+                capture_rate=self.capture_rate
+            )
+        self._shared_stream.start()
+
+    def stop_input_stream(self) -> None:
+        """Close the persistent stream; listens go back to opening their own"""
+        if self._shared_stream is not None:
+            self._shared_stream.stop()
+            self._shared_stream = None
+
+    def discard_preroll(self) -> None:
+        """Drop buffered pre-roll audio so it is not mistaken for the next command"""
+        if self._shared_stream is not None:
+            self._shared_stream.clear_preroll()
+
+    def set_wav_input(self, wav_path: Optional[str], realtime: bool = False) -> None:
+        """
+        Replace the microphone with a WAV file (or restore it with None).
+
+        Every stream the handler opens afterwards replays the file from the
+        start through exactly the same code path as live audio.
+
+        Args:
+            wav_path: 16-bit PCM WAV file, or None for the live microphone
+            realtime: Pace blocks at real-time speed instead of as fast as possible
+        """
+        self.wav_input = Path(wav_path) if wav_path is not None else None
+        self.wav_realtime = realtime
+        logger.debug(f"Audio input set to: {self.wav_input or 'microphone'}")
+
+    def _open_input_stream(self, blocksize: int, callback: Callable):
+        """
+        Open the raw int16 input stream for this handler.
+
+        Audio always reaches the callback at self.sample_rate; when the device
+        captures at a different rate each block is resampled first. With a
+        preprocessor set, every block is also cleaned up before the callback.
+
+        Args:
+            blocksize: Frames per callback block (at self.sample_rate)
+            callback: sounddevice-style callback(indata, frames, time_info, status)
+
+        Returns:
+            WavInputStream for file replay, a StreamSubscription when the
+            persistent stream is running (its own 100 ms block size applies),
+            otherwise a new sd.RawInputStream
+        """
+        if self.preprocessor is not None:
+            # Keep the learned noise profile between listens on the live microphone
+            self.preprocessor.reset(keep_profile=self.wav_input is None)
+            preprocessor = self.preprocessor
+            recognizer_callback = callback
+
+            def preprocessing_callback(indata, frames, time_info, status):
+                data = preprocessor.process_bytes(bytes(indata))
+                if data:
+                    recognizer_callback(data, len(data) // 2, time_info, status)
+
+            callback = preprocessing_callback
+
+        if self.wav_input is not None:
+            return WavInputStream(
+                self.wav_input,
+                samplerate=self.sample_rate,
+                blocksize=blocksize,
+                callback=callback,
+                realtime=self.wav_realtime
+            )
+
+        if self._shared_stream is not None and self._shared_stream.active:
+            return self._shared_stream.subscribe(callback)
+
+        if self.capture_rate != self.sample_rate:
+            resampler = PolyphaseResampler(self.capture_rate, self.sample_rate)
+            model_callback = callback
+
+            def resampling_callback(indata, frames, time_info, status):
+                data = resampler.process_bytes(bytes(indata))
+                model_callback(data, len(data) // 2, time_info, status)
+
+            callback = resampling_callback
+            blocksize = round(blocksize * self.capture_rate / self.sample_rate)
+
+        return sd.RawInputStream(
+            samplerate=self.capture_rate,
+            blocksize=blocksize,
+            dtype='int16',
+            channels=1,
+            device=self.device,
+            callback=callback
+        )
+
+    def _create_recognizer(self) -> "vosk.KaldiRecognizer":
+        """Create a full-vocabulary recognizer with this handler's settings."""
+        recognizer = create_recognizer(self.model, self.sample_rate)
+        recognizer.SetWords(True)  # Enable word-level timestamps
+        if self.max_alternatives > 0:
+            recognizer.SetMaxAlternatives(self.max_alternatives)
+        return recognizer
+
+    def _accept_waveform(self, data: bytes) -> bool:
+        """Feed the full recognizer, keeping track of its clock (see transcribe_slot)"""
+        self._recognizer_samples += len(data) // 2
+        return self.recognizer.AcceptWaveform(data)
+
+    def _result_text(self, result_json: str) -> str:
+        """
+        Extract the best text from a Result()/FinalResult() JSON string.
+
+        With N-best enabled Vosk returns {"alternatives": [...]} instead of
+        {"text": ...}; the alternatives are handed to the rescorer (if any),
+        otherwise the acoustically best one is used.
+
+        Args:
+            result_json: JSON returned by the recognizer
+
+        Returns:
+            Recognized text (may be empty)
+        """
+        result = json.loads(result_json)
+
+        alternatives = result.get("alternatives")
+        if alternatives is None:
+            self.last_words = result.get("result")
+            self.last_confidence = result_confidence(result)
+            return result.get("text", "").strip()
+
+        hypotheses = [
+            (alt.get("text", "").strip(), float(alt.get("confidence", 0.0)))
+            for alt in alternatives
+        ]
+        hypotheses = [(text, confidence) for text, confidence in hypotheses if text]
+        if not hypotheses:
+            return ""
+
+        best = hypotheses[0][0]
+        if self.rescorer is not None:
+            try:
+                best = self.rescorer(hypotheses) or best
+            except Exception as e:
+                logger.error(f"N-best rescoring failed: {e}", exc_info=True)
+
+        # Keep word timings of the chosen alternative for slot re-decoding
+        chosen = next((i for i, alt in enumerate(alternatives) if alt.get("text", "").strip() == best), None)
+        self.last_words = alternatives[chosen].get("result") if chosen is not None else None
+        self.last_confidence = result_confidence(result, chosen) if chosen is not None else None
+        return best
+
+    def _listen_streaming(
+        self,
+        duration: float,
+        phrase_time_limit: float,
+        silence_threshold: float,
+        early_commit: Optional[Callable[[str], bool]],
+        stable_blocks: int
+    ) -> Optional[str]:
+        """
+        Stream one utterance through the recognizer, committing early when safe.
+
+        Returns as soon as one of these happens:
+        - A partial hypothesis stayed unchanged for stable_blocks blocks and
+          early_commit() accepts it (e.g. "time", "open chrome")
+        - Vosk endpoints the utterance and produces a final result
+        - phrase_time_limit is reached (the final result so far is used)
+
+        Args:
+            duration: Maximum seconds to wait for speech to start
+            phrase_time_limit: Maximum seconds for complete phrase
+            silence_threshold: Volume threshold to detect speech
+            early_commit: Predicate deciding if a stable partial can be dispatched
+                (None = only stop on endpoint or phrase limit)
+            stable_blocks: Number of unchanged partials required
+
+        Returns:
+            Recognized text or None if no speech detected
+        """
+        blocks: queue.Queue = queue.Queue()
+
+        def audio_callback(indata, frames, time_info, status):
+            """Called for each audio block by sounddevice"""
+            if status:
+                logger.warning(f"Audio callback status: {status}")
+            # None marks a block of Gideon's own voice
+            blocks.put(None if playback_active() else bytes(indata))
+
+        start_time = time.time()
+        audio_seconds = 0.0  # Audio time, so file replay is not bound to the wall clock
+        speech_started = False
+        last_partial = ""
+        stable_count = 0
+        utterance: List[bytes] = []  # Kept for tiered slot re-decoding
+
+        self.recognizer.Reset()
+        self.last_utterance_offset = self._recognizer_samples / self.sample_rate
+        self.last_words = None
+        self.last_confidence = None
+        self._listen_outcome = "silence"
+        for worker in self.language_workers.values():
+            worker.reset()
+
+        try:
+            with self._open_input_stream(self.sample_rate // 10, audio_callback) as stream:  # 100 ms blocks
+                while audio_seconds < phrase_time_limit:
+                    try:
+                        data = blocks.get(timeout=0.1)
+                    except queue.Empty:
+                        # Replayed file exhausted, or the device stopped delivering audio
+                        if not stream.active or time.time() - start_time > phrase_time_limit + 1.0:
+                            break
+                        continue
+
+                    # Gideon is speaking: forget what was heard and listen again afterwards
+                    if data is None:
+                        if utterance:
+                            logger.debug("Gideon spoke during the listen, restarting it")
+                            self.recognizer.Reset()
+                            for worker in self.language_workers.values():
+                                worker.reset()
+                            utterance.clear()
+                            self.last_utterance_offset = self._recognizer_samples / self.sample_rate
+                            audio_seconds = 0.0
+                            speech_started = False
+                            self._listen_outcome = "silence"
+                            last_partial = ""
+                            stable_count = 0
+                        start_time = time.time()
+                        continue
+
+                    audio_seconds += len(data) / (2 * self.sample_rate)
+
+                    # Give up if speech never starts within the wait window
+                    if not speech_started:
+                        volume = np.abs(np.frombuffer(data, dtype=np.int16)).mean()
+                        if volume >= silence_threshold:
+                            speech_started = True
+                            self._listen_outcome = "speech"
+                        elif audio_seconds > duration:
+                            logger.debug("No speech detected (silence)")
+                            return None
+
+                    utterance.append(data)
+                    for worker in self.language_workers.values():
+                        worker.feed(data)
+
+                    if self._accept_waveform(data):
+                        text = self._result_text(self.recognizer.Result())
+                        if text:
+                            logger.debug(f"Final result: {text}")
+                            return text
+                        continue
+
+                    partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+                    if partial and partial == last_partial:
+                        stable_count += 1
+                    else:
+                        last_partial = partial
+                        stable_count = 0
+
+                    if early_commit is not None and stable_count >= stable_blocks and early_commit(partial):
+                        logger.info(f"Early commit on stable partial: '{partial}'")
+                        self._listen_outcome = "early"
+                        return partial
+
+                # Phrase limit or end of input reached - flush whatever the decoder has
+                if not speech_started:
+                    logger.debug("No speech detected (silence)")
+                    return None
+                text = self._result_text(self.recognizer.FinalResult())
+                logger.debug(f"Final result at phrase limit: {text}")
+                return text or None
+
+        finally:
+            self.last_utterance_audio = b"".join(utterance)
+            # Reset recognizer for next command
+            self.recognizer.Reset()
+
+    def _arbitrate_languages(self, english_text: Optional[str]) -> Optional[str]:
+        """
+        Collect the language workers' transcripts and pick the final text.
+
+        The workers decoded the utterance in parallel while it was spoken, so
+        this only waits for their final flush.
+
+        Args:
+            english_text: Result of the in-process recognizer
+
+        Returns:
+            Text chosen by language_arbiter (or the English text without one)
+        """
+        # Workers use the same N-best setting, so confidences share one scale
+        candidates = [("en", english_text or "", self.last_confidence)]
+
+        for language, worker in self.language_workers.items():
+            result = worker.finish()
+            if result and result[0]:
+                candidates.append((language, result[0], result[1]))
+                logger.debug(f"{language} result: '{result[0]}' (confidence {result[1]:.2f})")
+
+        if self.language_arbiter is not None:
+            try:
+                chosen = self.language_arbiter(candidates)
+                if chosen:
+                    return chosen
+            except Exception as e:
+                logger.error(f"Language arbitration failed: {e}", exc_info=True)
+
+        return english_text or next((text for _, text, _ in candidates if text), None)
+
+    def stop_language_workers(self) -> None:
+        """Stop all language worker processes"""
+        for worker in self.language_workers.values():
+            worker.stop()
+        self.language_workers.clear()
+
+    def close(self) -> None:
+        """Release the input stream, worker processes and an out-of-process model"""
+        self.stop_input_stream()
+        self.stop_language_workers()
+        if isinstance(self.model, (RemoteModel, ServerModel)):
+            self.model.close()
+
+    def transcribe_slot(self, slot_text: str, padding: float = 0.25) -> Optional[str]:
+        """
+        Re-decode a free-form parameter of the last utterance with the large model.
+
+        The slot's words are located in the last result's word timings and only
+        that span of audio (plus padding) is sent to the slot recognizer. Word
+        times are on the recognizer's clock, which keeps running across
+        Reset(), so they are shifted by the time the last listen started.
+
+        Args:
+            slot_text: Parameter as recognized by the small model (e.g. "lo fi beats")
+            padding: Seconds of audio added on either side of the slot
+
+        Returns:
+            Large-model text for the slot, or None if tiered recognition is off
+            or the slot cannot be located in the last utterance
+        """
+        if self.slot_recognizer is None or not self.last_utterance_audio or not self.last_words:
+            return None
+
+        slot_words = slot_text.lower().split()
+        words = [w.get("word", "").lower() for w in self.last_words]
+        if not slot_words or slot_words[0] not in words:
+            return None
+
+        first = words.index(slot_words[0])
+        last = max((i for i, w in enumerate(words) if w == slot_words[-1] and i >= first), default=None)
+        if last is None:
+            return None
+
+        start = self.last_words[first]["start"] - self.last_utterance_offset
+        end = self.last_words[last]["end"] - self.last_utterance_offset
+        start_byte = 2 * round(max(0.0, start - padding) * self.sample_rate)
+        end_byte = 2 * round((end + padding) * self.sample_rate)
+        segment = self.last_utterance_audio[start_byte:end_byte] if end_byte > start_byte else b""
+        if not segment:
+            logger.debug(f"Slot '{slot_text}' lies outside the buffered utterance")
+            return None
+
+        try:
+            decode_start = time.perf_counter()
+            text = self.slot_recognizer.transcribe(segment)
+            logger.info(f"Slot re-decoded: '{slot_text}' -> '{text}' "
+                        f"({(time.perf_counter() - decode_start) * 1000:.0f} ms)")
+            return text or None
+        except Exception as e:
+            logger.error(f"Slot re-decoding failed: {e}")
+            return None
+
+    def listen_for_phrase(
+        self,
+        phrases: List[str],
+        timeout: float = 10.0,
+        phrase_time_limit: float = 3.0,
+        trailing_silence: float = 0.3,
+        silence_threshold: float = 100.0
+    ) -> Optional[str]:
+        """
+        Listen for one of a small set of phrases (e.g. a yes/no answer).
+
+        A grammar-restricted recognizer (shared model, tiny search graph) is
+        streamed 50 ms blocks. Instead of waiting for Vosk's endpointing, the
+        answer is committed as soon as a hypothesis exists and the speaker has
+        been quiet for trailing_silence seconds.
+
+        Args:
+            phrases: Phrases the recognizer may return (words missing from the
+                model vocabulary are ignored by Vosk)
+            timeout: Maximum seconds to wait for speech to start
+            phrase_time_limit: Maximum seconds of speech
+            trailing_silence: Seconds of quiet after speech that end the answer
+            silence_threshold: Mean absolute amplitude that counts as speech
+
+        Returns:
+            Recognized phrase text (may include "[unk]"), or None if nothing was heard
+        """
+        key = tuple(sorted(set(p.lower() for p in phrases)))
+        recognizer = self._phrase_recognizers.get(key)
+        if recognizer is None:
+            # "[unk]" absorbs speech outside the phrase set instead of forcing a match
+            recognizer = create_recognizer(self.model, self.sample_rate, json.dumps(list(key) + ["[unk]"]))
+            self._phrase_recognizers[key] = recognizer
+        recognizer.Reset()
+
+        blocks: queue.Queue = queue.Queue()
+
+        def audio_callback(indata, frames, time_info, status):
+            """Called for each audio block by sounddevice"""
+            if status:
+                logger.warning(f"Phrase stream status: {status}")
+            blocks.put(None if playback_active() else bytes(indata))
+
+        start_time = time.time()
+        audio_seconds = 0.0
+        speech_seconds = 0.0
+        quiet_seconds = 0.0
+        speech_started = False
+        heard = ""
+
+        try:
+            with self._open_input_stream(self.sample_rate // 20, audio_callback) as stream:  # 50 ms blocks
+                while speech_seconds < phrase_time_limit:
+                    try:
+                        data = blocks.get(timeout=0.1)
+                    except queue.Empty:
+                        if not stream.active or time.time() - start_time > timeout + phrase_time_limit + 1.0:
+                            break
+                        continue
+
+                    # Gideon's own voice (another handler speaking) is not the answer
+                    if data is None:
+                        if speech_started or heard:
+                            recognizer.Reset()
+                            audio_seconds = speech_seconds = quiet_seconds = 0.0
+                            speech_started = False
+                            heard = ""
+                        start_time = time.time()
+                        continue
+
+                    block_seconds = len(data) / (2 * self.sample_rate)
+                    audio_seconds += block_seconds
+                    volume = np.abs(np.frombuffer(data, dtype=np.int16)).mean()
+
+                    if volume >= silence_threshold:
+                        speech_started = True
+                        quiet_seconds = 0.0
+                    elif not speech_started:
+                        if audio_seconds > timeout:
+                            logger.debug("No answer (silence)")
+                            return None
+                    else:
+                        quiet_seconds += block_seconds
+
+                    if speech_started:
+                        speech_seconds += block_seconds
+
+                    if recognizer.AcceptWaveform(data):
+                        text = json.loads(recognizer.Result()).get("text", "").strip()
+                        if text and text != "[unk]":
+                            return text
+                        heard = text or heard
+                    else:
+                        heard = json.loads(recognizer.PartialResult()).get("partial", "").strip() or heard
+
+                    # Short endpoint: speech is over and the decoder already has an answer
+                    if heard and quiet_seconds >= trailing_silence:
+                        break
+
+                if not speech_started:
+                    return None
+                final = json.loads(recognizer.FinalResult()).get("text", "").strip()
+                return final or heard or None
+
+        except sd.PortAudioError as e:
+            logger.error(f"Audio device error while listening for phrase: {e}")
+            return None
+
+        finally:
+            recognizer.Reset()
+
+    def get_wake_word_spotter(self) -> WakeWordSpotter:
+        """
+        Get the wake word spotter for this handler (created on first use).
+
+        Returns:
+            WakeWordSpotter sharing this handler's model
+        """
+        if self._wake_word_spotter is None:
+            try:
+                import config
+                wake_words = config.WAKE_WORDS
+                energy_threshold = config.SILENCE_THRESHOLD
+                hangover_blocks = config.WAKE_WORD_HANGOVER_BLOCKS
+            except (ImportError, AttributeError):
+                wake_words, energy_threshold, hangover_blocks = DEFAULT_WAKE_WORDS, 100.0, 5
+
+            self._wake_word_spotter = WakeWordSpotter(
+                self.model,
+                self.sample_rate,
+                wake_words=wake_words,
+                energy_threshold=energy_threshold,
+                hangover_blocks=hangover_blocks
+            )
+            logger.info(f"Wake word spotter ready: {self._wake_word_spotter.wake_words}")
+
+        return self._wake_word_spotter
+
+    def wait_for_wake_word(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a wake word is heard (stage one of the two-stage pipeline).
+
+        Only the energy gate and the grammar-restricted spotter run here,
+        so idle CPU stays low while Gideon waits all day.
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait forever)
+
+        Returns:
+            True if a wake word was spotted, False on timeout or error
+        """
+        spotter = self.get_wake_word_spotter()
+        spotter.reset()
+        blocks: queue.Queue = queue.Queue()
+
+        def audio_callback(indata, frames, time_info, status):
+            """Called for each audio block by sounddevice"""
+            if status:
+                logger.warning(f"Wake word stream status: {status}")
+            blocks.put(None if playback_active() else bytes(indata))
+
+        deadline = None if timeout is None else time.time() + timeout
+
+        try:
+            # 100 ms blocks for a quick trigger
+            with self._open_input_stream(self.sample_rate // 10, audio_callback) as stream:
+                while deadline is None or time.time() < deadline:
+                    try:
+                        data = blocks.get(timeout=0.1)
+                    except queue.Empty:
+                        if not stream.active:
+                            break
+                        continue
+
+                    # "Gideon" spoken by Gideon itself is not a wake word
+                    if data is None:
+                        spotter.reset()
+                        continue
+
+                    if spotter.process(data):
+                        return True
+
+            return False
+
+        except sd.PortAudioError as e:
+            logger.error(f"Audio device error while waiting for wake word: {e}")
+            print(f"\n❌ Microphone error: {e}")
+            time.sleep(1.0)  # Back off before the caller retries the device
+            return False
+
+        except Exception as e:
+            logger.error(f"Error while waiting for wake word: {e}", exc_info=True)
+            time.sleep(1.0)
+            return False
+
     def continuous_listen(
         self,
         callback: Callable[[str], None],
-        silence_timeout: float = 2.0
+        silence_timeout: float = 2.0,
+        require_wake_word: bool = False,
+        command_window: float = 5.0
     ) -> None:
         """
         Continuously listen and call callback with recognized text.
@@ -203,6 +1528,8 @@ class VoskAudioHandler:
         Args:
             callback: Function to call with recognized text
             silence_timeout: Seconds of silence before considering phrase complete
+            require_wake_word: Gate the full recognizer behind the wake word spotter
+            command_window: Seconds the full recognizer stays open after a wake word
 
         Example:
             def handle_command(text):
@@ -212,6 +1539,8 @@ class VoskAudioHandler:
             handler.continuous_listen(handle_command)
         """
         self.is_listening = True
+        spotter = self.get_wake_word_spotter() if require_wake_word else None
+        window_deadline: Optional[float] = None
 
         def audio_callback(indata, frames, time_info, status):
             """Called for each audio block by sounddevice"""
@@ -226,14 +1555,7 @@ class VoskAudioHandler:
             print("🎤 Continuous listening mode active...")
             print("   Press Ctrl+C to stop")
 
-            with sd.RawInputStream(
-                samplerate=self.sample_rate,
-                blocksize=8000,
-                dtype='int16',
-                channels=1,
-                device=self.device,
-                callback=audio_callback
-            ):
+            with self._open_input_stream(8000, audio_callback) as stream:
                 last_text_time = time.time()
                 current_phrase = []
 
@@ -242,10 +1564,23 @@ class VoskAudioHandler:
                         # Get audio data from queue (with timeout)
                         data = self.audio_queue.get(timeout=0.1)
 
+                        # Stage one: only the spotter runs until a wake word opens a window
+                        if spotter is not None:
+                            if window_deadline is None:
+                                if spotter.process(data):
+                                    print("👂 Wake word detected - listening for command...")
+                                    self.recognizer.Reset()
+                                    window_deadline = time.time() + command_window
+                                continue
+
+                            if time.time() > window_deadline:
+                                logger.debug("Command window closed without a command")
+                                window_deadline = None
+                                continue
+
                         # Process with Vosk
-                        if self.recognizer.AcceptWaveform(data):
-                            result = json.loads(self.recognizer.Result())
-                            text = result.get("text", "").strip()
+                        if self._accept_waveform(data):
+                            text = self._result_text(self.recognizer.Result())
 
                             if text:
                                 logger.info(f"Continuous mode recognized: '{text}'")
@@ -257,6 +1592,9 @@ class VoskAudioHandler:
                                 callback(complete_text.lower())
                                 current_phrase = []
 
+                                # Command handled - go back to wake word spotting
+                                window_deadline = None
+
                         else:
                             # Check for silence timeout
                             if current_phrase and (time.time() - last_text_time) > silence_timeout:
@@ -267,6 +1605,10 @@ class VoskAudioHandler:
                                 current_phrase = []
 
                     except queue.Empty:
+                        # Replayed file exhausted - nothing more will arrive
+                        if not stream.active:
+                            break
+
                         # No audio data, check for silence timeout
                         if current_phrase and (time.time() - last_text_time) > silence_timeout:
                             complete_text = " ".join(current_phrase)
@@ -305,8 +1647,8 @@ class VoskAudioHandler:
 
         try:
             recording = sd.rec(
-                int(duration * self.sample_rate),
-                samplerate=self.sample_rate,
+                int(duration * self.capture_rate),
+                samplerate=self.capture_rate,
                 channels=1,
                 dtype='int16',
                 device=self.device
@@ -316,7 +1658,7 @@ class VoskAudioHandler:
             print("\n   Volume levels:")
             for i in range(duration):
                 sd.wait(int(1000))  # Wait 1 second
-                chunk = recording[i * self.sample_rate:(i + 1) * self.sample_rate]
+                chunk = recording[i * self.capture_rate:(i + 1) * self.capture_rate]
                 volume = np.abs(chunk).mean()
                 bar = "█" * int(volume / 200)
                 print(f"   {volume:5.0f} {bar}")
@@ -392,6 +1734,7 @@ class VoskAudioHandler:
             "model_path": str(self.model_path),
             "model_name": self.model_path.name,
             "sample_rate": self.sample_rate,
+            "capture_rate": self.capture_rate,
             "device": self.device,
             "offline": True,
             "vosk_version": vosk.__version__ if hasattr(vosk, '__version__') else "unknown"
@@ -406,6 +1749,58 @@ class VoskAudioHandler:
 _global_handler: Optional[VoskAudioHandler] = None
 
 
+def set_audio_handler(handler: VoskAudioHandler) -> None:
+    """
+    Register an already created handler as the global instance.
+
+    gideon.py builds its handler from config; registering it here makes
+    utils.listen_for_command() reuse the same model and recognizer settings
+    instead of loading a second copy.
+
+    Args:
+        handler: VoskAudioHandler to use globally
+    """
+    global _global_handler
+    _global_handler = handler
+
+
+_slot_recognizer: Optional[SlotRecognizer] = None
+
+
+def get_slot_recognizer(
+    model_path: str,
+    sample_rate: int = 16000,
+    idle_timeout: float = 300.0
+) -> SlotRecognizer:
+    """
+    Get the shared SlotRecognizer (singleton pattern), so the large model
+    is loaded at most once per process.
+
+    Args:
+        model_path: Path to the large Vosk model directory
+        sample_rate: Sample rate of slot audio
+        idle_timeout: Seconds without requests before the model is unloaded
+
+    Returns:
+        SlotRecognizer instance
+    """
+    global _slot_recognizer
+
+    if _slot_recognizer is None:
+        _slot_recognizer = SlotRecognizer(model_path, sample_rate, idle_timeout)
+
+    return _slot_recognizer
+
+
+def discard_preroll() -> None:
+    """
+    Drop pre-roll audio of the global handler, if one exists.
+    Called after Gideon speaks so its own voice is not fed into the next listen.
+    """
+    if _global_handler is not None:
+        _global_handler.discard_preroll()
+
+
 def get_audio_handler(model_path: Optional[str] = None) -> VoskAudioHandler:
     """
     Get global VoskAudioHandler instance (singleton pattern).
@@ -420,14 +1815,23 @@ def get_audio_handler(model_path: Optional[str] = None) -> VoskAudioHandler:
     global _global_handler
 
     if _global_handler is None:
-        if model_path is None:
-            try:
-                from config import VOSK_MODEL_PATH
-                model_path = VOSK_MODEL_PATH
-            except ImportError:
+        max_alternatives = 0
+        native_rate = False
+        try:
+            import config
+            max_alternatives = config.RECOGNITION_MAX_ALTERNATIVES
+            native_rate = config.CAPTURE_AT_NATIVE_RATE
+            if model_path is None:
+                model_path = config.VOSK_MODEL_PATH
+        except (ImportError, AttributeError):
+            if model_path is None:
                 model_path = "vosk-model-small-en-us-0.15"
 
-        _global_handler = VoskAudioHandler(model_path=model_path)
+        _global_handler = VoskAudioHandler(
+            model_path=model_path,
+            max_alternatives=max_alternatives,
+            native_rate=native_rate
+        )
 
     return _global_handler
 
@@ -502,6 +1906,11 @@ def run_diagnostics():
     print("\n[4/5] Checking audio devices...")
     handler.list_audio_devices()
 
+    if handler.capture_rate != handler.sample_rate:
+        rtf = benchmark_resampler(handler.capture_rate, handler.sample_rate)
+        print(f"\n   Resampling {handler.capture_rate} -> {handler.sample_rate} Hz: "
+              f"{rtf * 100:.2f}% of real time")
+
     # Test 5: Test microphone
     print("\n[5/5] Testing microphone...")
     result = handler.test_microphone(duration=3)
@@ -0,0 +1,292 @@
+"""
+Gideon Batch Transcription
+==========================
+Transcribes directories of WAV recordings (e.g. collected failed commands)
+across a process pool, so throughput scales with the number of CPU cores.
+
+Each worker process loads the Vosk model once at startup and keeps its own
+recognizer, which is reset between files. Results are streamed to a JSONL
+file as they complete:
+
+    {"file": "...", "text": "open cron", "duration": 1.8, "confidence": 0.87,
+     "words": [{"word": "open", "start": 0.42, "end": 0.71, "conf": 1.0}, ...],
+     "decode_seconds": 0.21, "error": null}
+
+Usage:
+    python batch_transcribe.py recordings/ --output transcripts.jsonl
+    python batch_transcribe.py recordings/ --model large-en --workers 8
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Fix Unicode encoding issues on Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8')
+
+try:
+    import vosk
+    import numpy as np
+    from tqdm import tqdm
+except ImportError as e:
+    print(f"❌ Missing required package: {e}")
+    print("\n📦 Install required packages:")
+    print("   pip install vosk numpy tqdm")
+    sys.exit(1)
+
+import config
+from vosk_setup import MODELS, resolve_model_path
+
+logger = logging.getLogger("Gideon.BatchTranscribe")
+
+# Frames fed to the recognizer per AcceptWaveform call
+CHUNK_FRAMES = 4000
+
+
+# ==================== WORKER PROCESS ====================
+# State below lives in each worker process, set once by _init_worker()
+
+_worker_model: Optional["vosk.Model"] = None
+_worker_recognizers: Dict[int, "vosk.KaldiRecognizer"] = {}
+
+
+def _init_worker(model_path: str) -> None:
+    """Load the model once per worker process (Pool initializer)."""
+    global _worker_model
+
+    vosk.SetLogLevel(-1)  # Silence Kaldi logs from every worker
+    _worker_model = vosk.Model(model_path)
+
+
+def _get_recognizer(sample_rate: int) -> "vosk.KaldiRecognizer":
+    """Get this worker's recognizer for a sample rate, creating it on first use."""
+    recognizer = _worker_recognizers.get(sample_rate)
+
+    if recognizer is None:
+        recognizer = vosk.KaldiRecognizer(_worker_model, sample_rate)
+        recognizer.SetWords(True)  # Word timestamps and confidences
+        _worker_recognizers[sample_rate] = recognizer
+    else:
+        recognizer.Reset()
+
+    return recognizer
+
+
+def _read_wav(wav_path: Path) -> Tuple[bytes, int, float]:
+    """
+    Read a 16-bit PCM WAV file as mono audio bytes.
+
+    Returns:
+        (audio_bytes, sample_rate, duration_seconds) tuple
+
+    Raises:
+        ValueError: If the file is not 16-bit PCM
+    """
+    with wave.open(str(wav_path), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frame_count = wav_file.getnframes()
+        frames = wav_file.readframes(frame_count)
+
+    if sample_width != 2:
+        raise ValueError(f"expected 16-bit PCM, got {sample_width * 8}-bit")
+
+    if channels > 1:
+        # Downmix to mono (Vosk requires a single channel)
+        samples = np.frombuffer(frames, dtype=np.int16).reshape(-1, channels)
+        frames = samples.mean(axis=1).astype(np.int16).tobytes()
+
+    return frames, sample_rate, frame_count / sample_rate
+
+
+def transcribe_file(wav_path: str) -> Dict:
+    """
+    Transcribe one WAV file in a worker process.
+
+    Args:
+        wav_path: Path to the WAV file
+
+    Returns:
+        Result dict (see module docstring); "error" is set instead of raising
+    """
+    result = {
+        "file": wav_path,
+        "text": "",
+        "duration": 0.0,
+        "confidence": 0.0,
+        "words": [],
+        "decode_seconds": 0.0,
+        "error": None,
+    }
+
+    try:
+        audio, sample_rate, duration = _read_wav(Path(wav_path))
+        result["duration"] = round(duration, 3)
+
+        decode_start = time.perf_counter()
+        recognizer = _get_recognizer(sample_rate)
+
+        segments = []
+        chunk_bytes = CHUNK_FRAMES * 2
+        for offset in range(0, len(audio), chunk_bytes):
+            if recognizer.AcceptWaveform(audio[offset:offset + chunk_bytes]):
+                segments.append(json.loads(recognizer.Result()))
+        segments.append(json.loads(recognizer.FinalResult()))
+
+        result["decode_seconds"] = round(time.perf_counter() - decode_start, 3)
+
+        words = [word for segment in segments for word in segment.get("result", [])]
+        result["words"] = words
+        result["text"] = " ".join(s["text"] for s in segments if s.get("text"))
+        if words:
+            result["confidence"] = round(sum(w.get("conf", 0.0) for w in words) / len(words), 4)
+
+    except Exception as e:
+        result["error"] = str(e)
+
+    return result
+
+
+# ==================== BATCH DRIVER ====================
+
+def find_wav_files(input_dir: Path, recursive: bool = True) -> List[Path]:
+    """
+    Find WAV files in a directory.
+
+    Args:
+        input_dir: Directory to search
+        recursive: Include subdirectories
+
+    Returns:
+        Sorted list of WAV file paths
+    """
+    pattern = "**/*.wav" if recursive else "*.wav"
+    return sorted(p for p in Path(input_dir).glob(pattern) if p.is_file())
+
+
+def transcribe_directory(
+    input_dir: Path,
+    output_path: Path,
+    model_path: Path,
+    workers: Optional[int] = None,
+    recursive: bool = True
+) -> Dict:
+    """
+    Transcribe every WAV file in a directory across a process pool.
+
+    Args:
+        input_dir: Directory of recordings
+        output_path: JSONL file to write results to
+        model_path: Vosk model directory
+        workers: Number of worker processes (default: CPU count)
+        recursive: Include subdirectories
+
+    Returns:
+        Summary dict (files, failed, audio_seconds, wall_seconds, speedup)
+    """
+    if not Path(model_path).exists():
+        raise FileNotFoundError(f"Vosk model not found at: {model_path}")
+
+    files = find_wav_files(input_dir, recursive)
+    # Never start more workers (and model loads) than there are files
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+
+    print(f"\n📂 Found {len(files)} WAV files in {input_dir}")
+    print(f"⚙️  Transcribing with {workers} worker processes ({Path(model_path).name})")
+
+    wall_start = time.perf_counter()
+    audio_seconds = 0.0
+    failed = 0
+
+    # Small chunks keep workers balanced when file lengths vary
+    chunksize = max(1, min(16, len(files) // (workers * 4) or 1))
+
+    with open(output_path, "w", encoding="utf-8") as out, multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(str(model_path),)
+    ) as pool:
+        results = pool.imap_unordered(transcribe_file, [str(f) for f in files], chunksize=chunksize)
+        for result in tqdm(results, total=len(files), unit="file", desc="Transcribing"):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            audio_seconds += result["duration"]
+            if result["error"]:
+                failed += 1
+                logger.warning(f"Failed to transcribe {result['file']}: {result['error']}")
+
+    wall_seconds = time.perf_counter() - wall_start
+
+    return {
+        "files": len(files),
+        "failed": failed,
+        "audio_seconds": round(audio_seconds, 1),
+        "wall_seconds": round(wall_seconds, 1),
+        "speedup": round(audio_seconds / wall_seconds, 1) if wall_seconds else 0.0,
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Transcribe directories of WAV recordings in parallel with Vosk",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python batch_transcribe.py recordings/
+  python batch_transcribe.py recordings/ --output failed.jsonl --workers 8
+  python batch_transcribe.py recordings/ --model large-en --model-dir models/
+        """
+    )
+
+    parser.add_argument('input_dir', help='Directory containing WAV recordings')
+    parser.add_argument('--output', default='transcripts.jsonl', help='JSONL output file')
+    parser.add_argument(
+        '--model',
+        default=config.VOSK_MODEL_PATH,
+        help=f"Model key ({', '.join(MODELS.keys())}) or model directory"
+    )
+    parser.add_argument('--model-dir', default='.', help='Directory containing downloaded models')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-recursive', action='store_true', help='Do not search subdirectories')
+
+    args = parser.parse_args()
+
+    try:
+        summary = transcribe_directory(
+            Path(args.input_dir),
+            Path(args.output),
+            resolve_model_path(args.model, args.model_dir),
+            workers=args.workers,
+            recursive=not args.no_recursive
+        )
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        print("   Run: python vosk_setup.py")
+        sys.exit(1)
+
+    print(f"\n✅ Transcribed {summary['files'] - summary['failed']}/{summary['files']} files")
+    print(f"   Audio: {summary['audio_seconds']} s | Wall: {summary['wall_seconds']} s "
+          f"| {summary['speedup']}x real time")
+    print(f"   Results: {args.output}")
+
+    sys.exit(0 if summary["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Gideon Command Executor
+=======================
+Runs command handlers off the listen loop so Gideon keeps listening
+(including for "shutdown gideon") while slow commands work.
+
+Features:
+- Fixed pool of daemon worker threads (a hung handler never blocks exit)
+- Per-command deadlines, counted from when a worker starts the command:
+  overdue commands are cancelled and reported
+- A "working on it" callback once a command exceeds the latency budget
+- Cooperative cancellation: handlers poll is_cancelled(), and
+  run_subprocess() kills its child process when the command is cancelled
+
+Python threads cannot be killed, so a handler stuck in a call that never
+checks for cancellation (e.g. network I/O) keeps its worker busy until it
+returns; its late result is discarded.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import time
+import queue
+import logging
+import threading
+import subprocess
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger("Gideon.CommandExecutor")
+
+# How often the monitor checks budgets and deadlines (seconds)
+MONITOR_INTERVAL = 0.1
+
+# Job currently running on this worker thread (see current_job)
+_local = threading.local()
+
+
+class CommandCancelled(Exception):
+    """Raised inside a handler when its command was cancelled or timed out"""
+
+
+# ==================== JOBS ====================
+
+class CommandJob:
+    """
+    One command submitted to the executor.
+
+    status is "queued", "running", "done", "failed", "timed_out" or "cancelled".
+    """
+
+    def __init__(self, description: str, call: Callable[[], Tuple[bool, str]], deadline: float):
+        self.description = description
+        self.call = call
+        self.deadline = deadline
+        self.submitted = time.time()
+        self.started: Optional[float] = None  # When a worker picked it up
+        self.status = "queued"
+        self.result: Optional[Tuple[bool, str]] = None
+        self.announced = False  # "Working on it" already said
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the command was submitted"""
+        return time.time() - self.submitted
+
+    @property
+    def run_time(self) -> float:
+        """Seconds since a worker started the command (0 while queued)"""
+        return 0.0 if self.started is None else time.time() - self.started
+
+    @property
+    def finished(self) -> bool:
+        """True once the job has a final status"""
+        return self.status in ("done", "failed", "timed_out", "cancelled")
+
+    def _start(self) -> bool:
+        """Mark a queued job as running; returns False if it already finished"""
+        with self._lock:
+            if self.status != "queued":
+                return False
+            self.status = "running"
+            self.started = time.time()
+            return True
+
+    def _finish(self, status: str, result: Tuple[bool, str]) -> bool:
+        """Set the final status once; returns False if the job had already finished"""
+        with self._lock:
+            if self.finished:
+                return False
+            self.status = status
+            self.result = result
+            return True
+
+
+def current_job() -> Optional[CommandJob]:
+    """Get the job running on the calling thread (None outside the executor)"""
+    return getattr(_local, "job", None)
+
+
+def is_cancelled() -> bool:
+    """True if the command running on the calling thread should stop"""
+    job = current_job()
+    return job is not None and job.cancel_event.is_set()
+
+
+def check_cancelled() -> None:
+    """
+    Raise CommandCancelled if the current command should stop.
+
+    Raises:
+        CommandCancelled: If the command was cancelled or passed its deadline
+    """
+    if is_cancelled():
+        raise CommandCancelled(current_job().description)
+
+
+def run_subprocess(args: List[str], timeout: float, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() that also stops when the current command is cancelled.
+
+    Args:
+        args: Command line
+        timeout: Maximum seconds to let the process run
+        **kwargs: Passed to subprocess.Popen (e.g. text=True)
+
+    Returns:
+        CompletedProcess with captured stdout/stderr
+
+    Raises:
+        subprocess.TimeoutExpired: If the process ran longer than timeout
+        CommandCancelled: If the command was cancelled while the process ran
+    """
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+    deadline = time.time() + timeout
+
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=MONITOR_INTERVAL)
+            return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+        except subprocess.TimeoutExpired:
+            if is_cancelled() or time.time() > deadline:
+                process.kill()
+                process.communicate()
+                check_cancelled()
+                raise subprocess.TimeoutExpired(args, timeout)
+
+
+def run_concurrently(calls: List[Callable[[], Tuple[bool, str]]]) -> List[Tuple[bool, str]]:
+    """
+    Run several handler calls at once as part of the current command.
+
+    Each call runs on its own thread that shares the caller's job, so
+    check_cancelled() and run_subprocess() inside it still respond to
+    cancellation and the deadline.
+
+    Args:
+        calls: Handler calls returning (success, message)
+
+    Returns:
+        Results in the order of calls (an exception becomes a failed result)
+
+    Raises:
+        CommandCancelled: If the command was cancelled while the calls ran
+    """
+    job = current_job()
+    results: List[Tuple[bool, str]] = [(False, "Not run")] * len(calls)
+
+    def run(position: int, call: Callable[[], Tuple[bool, str]]) -> None:
+        _local.job = job
+        try:
+            results[position] = call()
+        except CommandCancelled:
+            results[position] = (False, "Cancelled")
+        except Exception as e:
+            logger.error(f"Concurrent command part failed: {e}", exc_info=True)
+            results[position] = (False, f"Error: {e}")
+        finally:
+            _local.job = None
+
+    threads = [
+        threading.Thread(target=run, args=(position, call), name=f"Gideon-command-part-{position}", daemon=True)
+        for position, call in enumerate(calls)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    check_cancelled()
+    return results
+
+
+# ==================== EXECUTOR ====================
+
+class CommandExecutor:
+    """
+    Worker pool for command handlers with deadlines and cancellation.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        latency_budget: float = 1.5,
+        on_slow: Optional[Callable[[CommandJob], None]] = None,
+        on_done: Optional[Callable[[CommandJob], None]] = None
+    ):
+        """
+        Initialize the executor and start its threads.
+
+        Args:
+            workers: Number of handler threads
+            latency_budget: Seconds a command may run before on_slow is called
+            on_slow: Called once per command that exceeds the latency budget
+                (e.g. to say "working on it")
+            on_done: Called with each job once it has a final status
+        """
+        self.latency_budget = latency_budget
+        self.on_slow = on_slow
+        self.on_done = on_done
+
+        self._queue: queue.Queue = queue.Queue()
+        self._jobs: List[CommandJob] = []
+        self._jobs_lock = threading.Lock()
+        self._running = True
+
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"Gideon-command-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        self._threads.append(threading.Thread(target=self._monitor_loop, name="Gideon-command-monitor", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, description: str, call: Callable[[], Tuple[bool, str]], deadline: float) -> CommandJob:
+        """
+        Queue a command for execution.
+
+        Args:
+            description: Command description for logs and messages
+            call: Runs the handler and returns (success, message)
+            deadline: Seconds the command may run (from when a worker starts
+                it, not while it waits in the queue) before it is cancelled
+
+        Returns:
+            The queued CommandJob
+        """
+        job = CommandJob(description, call, deadline)
+        with self._jobs_lock:
+            self._jobs.append(job)
+        self._queue.put(job)
+        logger.info(f"Command queued: {description} (deadline {deadline:.0f} s)")
+        return job
+
+    def running(self) -> List[CommandJob]:
+        """Get the commands that are queued or running"""
+        with self._jobs_lock:
+            return [job for job in self._jobs if not job.finished]
+
+    def cancel_all(self) -> int:
+        """
+        Cancel every queued or running command.
+
+        Returns:
+            Number of commands cancelled
+        """
+        cancelled = 0
+        for job in self.running():
+            if self._complete(job, "cancelled", (False, f"Cancelled: {job.description}")):
+                cancelled += 1
+        return cancelled
+
+    def shutdown(self) -> None:
+        """Cancel outstanding commands and stop the threads (without waiting on stuck handlers)"""
+        self.cancel_all()
+        self._running = False
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def _complete(self, job: CommandJob, status: str, result: Tuple[bool, str], background: bool = False) -> bool:
+        """
+        Finish a job, signal its handler to stop and report it.
+
+        Args:
+            job: Job to finish
+            status: Final status
+            result: (success, message) to report
+            background: Run on_done on its own thread (used by the monitor,
+                which must keep enforcing other deadlines while it speaks)
+
+        Returns:
+            False if the job had already finished
+        """
+        if not job._finish(status, result):
+            return False
+        job.cancel_event.set()
+        with self._jobs_lock:
+            if job in self._jobs:
+                self._jobs.remove(job)
+
+        if status in ("timed_out", "cancelled"):
+            logger.warning(f"Command {status.replace('_', ' ')}: {job.description} after {job.elapsed:.1f} s")
+        if self.on_done is not None:
+            if background:
+                threading.Thread(target=self._report_done, args=(job,),
+                                 name="Gideon-command-done", daemon=True).start()
+            else:
+                self._report_done(job)
+        return True
+
+    def _worker_loop(self) -> None:
+        """Handler thread: run queued jobs one at a time"""
+        while self._running:
+            job = self._queue.get()
+            if job is None:
+                return
+            if not job._start():
+                continue  # Cancelled or timed out while queued
+
+            _local.job = job
+            try:
+                result = job.call()
+                self._complete(job, "done", result)
+            except CommandCancelled:
+                self._complete(job, "cancelled", (False, f"Cancelled: {job.description}"))
+            except Exception as e:
+                logger.error(f"Command failed: {job.description}: {e}", exc_info=True)
+                self._complete(job, "failed", (False, f"Error: {e}"))
+            finally:
+                _local.job = None
+
+    def _monitor_loop(self) -> None:
+        """Announce slow commands and time out overdue ones"""
+        while self._running:
+            time.sleep(MONITOR_INTERVAL)
+            for job in self.running():
+                if job.run_time > job.deadline:
+                    self._complete(job, "timed_out", (False, f"Timed out: {job.description}"), background=True)
+                elif not job.announced and job.elapsed > self.latency_budget:
+                    job.announced = True
+                    if self.on_slow is not None:
+                        # Speaking takes seconds; deadlines keep being enforced meanwhile
+                        threading.Thread(target=self._announce_slow, args=(job,),
+                                         name="Gideon-command-slow", daemon=True).start()
+
+    def _report_done(self, job: CommandJob) -> None:
+        """Run on_done for a finished job"""
+        try:
+            self.on_done(job)
+        except Exception as e:
+            logger.error(f"Command completion callback failed: {e}")
+
+    def _announce_slow(self, job: CommandJob) -> None:
+        """Run on_slow for a job (on its own thread)"""
+        try:
+            self.on_slow(job)
+        except Exception as e:
+            logger.error(f"Slow command callback failed: {e}")
@@ -0,0 +1,189 @@
+"""
+Gideon Command Plugins
+======================
+Command packs that add commands without touching commands.py.
+
+A pack is a Python package with a gideon_commands.json manifest next to its
+__init__.py. The manifest uses the data file format of registry_loader.py
+(the "commands", "aliases", "applications", "websites" and "urdu_commands"
+sections, plus optional "name", "version" and "description"), with handlers
+written as "module:function":
+
+    {
+      "name": "git-tools",
+      "commands": [
+        {"description": "Show git status", "keywords": ["git status"],
+         "handler": "git_tools.handlers:git_status"}
+      ]
+    }
+
+Packs are found in two places:
+- Local packs: plugins/<pack>/gideon_commands.json (config.PLUGIN_DIR is
+  added to the import path the first time a pack handler is loaded)
+- Installed packs: distributions that declare an entry point in the
+  config.PLUGIN_ENTRY_POINT_GROUP group naming their package, e.g. in
+  pyproject.toml: [project.entry-points."gideon.command_packs"]
+  git-tools = "git_tools"
+
+Discovery only reads manifests: the package is located with
+importlib.util.find_spec(), which does not import a top-level package. The
+handler module is imported the first time one of its commands runs, so
+startup time does not grow with the number of packs.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import sys
+import time
+import logging
+import importlib
+import importlib.util
+import threading
+from functools import lru_cache
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+import config
+
+logger = logging.getLogger("Gideon.Plugins")
+
+# Manifest file name inside a pack
+MANIFEST_NAME = "gideon_commands.json"
+
+
+class LazyHandler:
+    """
+    Command handler that imports its module on first call.
+    """
+
+    def __init__(self, target: str, argument: Optional[str] = None):
+        """
+        Initialize the handler (nothing is imported yet).
+
+        Args:
+            target: "package.module:function"
+            argument: Fixed parameter passed to the function, if any
+
+        Raises:
+            ValueError: If target is not in "module:function" form
+        """
+        module_name, _, function_name = target.partition(":")
+        if not module_name or not function_name.isidentifier():
+            raise ValueError(f"Handler must be 'module:function', got '{target}'")
+
+        self.target = target
+        self.module_name = module_name
+        self.function_name = function_name
+        self.argument = argument
+        self._function: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """True once the handler module has been imported"""
+        return self._function is not None
+
+    def load(self) -> Callable:
+        """
+        Import the handler module (first call only).
+
+        Returns:
+            The handler function
+
+        Raises:
+            ImportError: If the module or function cannot be found
+        """
+        if self._function is None:
+            with self._lock:
+                if self._function is None:
+                    start = time.perf_counter()
+                    _add_plugin_dir_to_path()
+                    module = importlib.import_module(self.module_name)
+                    function = getattr(module, self.function_name, None)
+                    if not callable(function):
+                        raise ImportError(f"{self.module_name} has no handler '{self.function_name}'")
+                    self._function = function
+                    logger.info(f"Loaded plugin handler {self.target} "
+                                f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return self._function
+
+    def __call__(self, *args: Any) -> Any:
+        function = self.load()
+        if self.argument is not None:
+            return function(self.argument)
+        return function(*args)
+
+    def __repr__(self) -> str:
+        return f"LazyHandler({self.target!r}, loaded={self.loaded})"
+
+
+def _add_plugin_dir_to_path() -> None:
+    """Make local packs importable"""
+    plugin_dir = str(config.PLUGIN_DIR)
+    if Path(plugin_dir).is_dir() and plugin_dir not in sys.path:
+        sys.path.append(plugin_dir)
+
+
+# ==================== DISCOVERY ====================
+
+def local_manifests(plugin_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Find the manifests of local packs.
+
+    Args:
+        plugin_dir: Directory of packs (default: config.PLUGIN_DIR)
+
+    Returns:
+        Sorted manifest paths (plugins/<pack>/gideon_commands.json)
+    """
+    plugin_dir = Path(plugin_dir or config.PLUGIN_DIR)
+    if not plugin_dir.is_dir():
+        return []
+    return sorted(plugin_dir.glob(f"*/{MANIFEST_NAME}"))
+
+
+@lru_cache(maxsize=None)
+def installed_manifests(group: str = config.PLUGIN_ENTRY_POINT_GROUP) -> List[Path]:
+    """
+    Find the manifests of installed packs through their entry points.
+
+    Scanning installed distributions is slow next to a stat(), so the result
+    is cached; call installed_manifests.cache_clear() after installing a pack.
+
+    Args:
+        group: Entry point group
+
+    Returns:
+        Manifest paths, in entry point name order
+    """
+    manifests = []
+    for entry_point in sorted(entry_points(group=group), key=lambda ep: ep.name):
+        try:
+            spec = importlib.util.find_spec(entry_point.module)
+        except (ImportError, ValueError) as e:
+            logger.warning(f"Command pack '{entry_point.name}' not found: {e}")
+            continue
+
+        if spec is None or not spec.submodule_search_locations:
+            logger.warning(f"Command pack '{entry_point.name}' must name a package, got '{entry_point.value}'")
+            continue
+
+        manifest = Path(list(spec.submodule_search_locations)[0]) / MANIFEST_NAME
+        if manifest.is_file():
+            manifests.append(manifest)
+        else:
+            logger.warning(f"Command pack '{entry_point.name}' has no {MANIFEST_NAME}")
+    return manifests
+
+
+def discover_manifests() -> List[Path]:
+    """
+    Find every command pack manifest (local packs first).
+
+    Returns:
+        Manifest paths (empty when config.ENABLE_PLUGINS is off)
+    """
+    if not config.ENABLE_PLUGINS:
+        return []
+    return local_manifests() + installed_manifests()
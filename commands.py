@@ -8,8 +8,10 @@ Author: Muhammad Ali (CodeCelix Internship)
 """
 
 import logging
-from typing import Tuple, Optional, Dict, Any, Callable
+import math
+from typing import Tuple, Optional, Dict, Any, Callable, List, Union
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import random
 
@@ -18,6 +20,12 @@ import utils
 import workflows
 import scheduler
 import multilingual
+from command_executor import CommandCancelled, run_subprocess
+from slot_grammar import SlotGrammar
+from entity_index import resolve_entity, record_use
+from intent_ranker import IntentRanker
+from phonetic_index import PhoneticIndex, merge_compounds, phonetic_key
+from utterance import Utterance, normalize_utterance, clean_text, strip_wake_word as _strip_leading_wake_word
 
 logger = logging.getLogger("Gideon.Commands")
 
@@ -241,24 +249,7 @@ def cmd_empty_recycle_bin() -> Tuple[bool, str]:
     """Empty the recycle bin (with confirmation)."""
     try:
         # Ask for confirmation
-        utils.speak("Are you sure you want to empty the recycle bin? Say yes or no.")
-
-        # Listen for response
-        response = utils.listen_for_command(timeout=10)
-
-        if not response:
-            utils.speak("No response received. Cancelling for safety.")
-            return False, "Operation cancelled - no response"
-
-        response_lower = response.lower().strip()
-
-        # Check for confirmation
-        yes_phrases = ["yes", "yeah", "sure", "confirm", "do it", "go ahead", "proceed", "ok", "okay"]
-
-        confirmed = any(phrase in response_lower for phrase in yes_phrases)
-
-        if not confirmed:
-            utils.speak("Cancelled.")
+        if not utils.ask_confirmation("empty the recycle bin"):
             return False, "Operation cancelled by user"
 
         # Empty recycle bin
@@ -268,12 +259,11 @@ def cmd_empty_recycle_bin() -> Tuple[bool, str]:
         import subprocess
         import os
 
-        # Use PowerShell to empty recycle bin
-        result = subprocess.run(
+        # Use PowerShell to empty recycle bin (killed if the command is cancelled)
+        result = run_subprocess(
             ["powershell", "-Command", "Clear-RecycleBin -Force -ErrorAction SilentlyContinue"],
-            capture_output=True,
-            text=True,
-            timeout=30
+            timeout=30,
+            text=True
         )
 
         if result.returncode == 0 or result.returncode == 1:  # 1 is also ok (no items)
@@ -292,6 +282,8 @@ def cmd_empty_recycle_bin() -> Tuple[bool, str]:
         utils.speak(message)
         logger.error(message)
         return False, message
+    except CommandCancelled:
+        raise
     except Exception as e:
         message = f"Error emptying recycle bin: {str(e)}"
         utils.speak(message)
@@ -318,6 +310,29 @@ def cmd_play_music() -> Tuple[bool, str]:
     return success, message
 
 
+def cmd_play_song(song_name: str) -> Tuple[bool, str]:
+    """
+    Play a song from the Music folder by name.
+
+    Args:
+        song_name: Name of the song as spoken (file name without extension)
+    """
+    match = resolve_entity("songs", song_name)
+    if match is None:
+        # Not in the Music folder: find it on YouTube instead
+        logger.info(f"No local song matches '{song_name}', searching YouTube")
+        return cmd_youtube(song_name)
+
+    song_key, song = match
+    success, message = utils.play_music_file(song)
+    if success:
+        record_use("songs", song_key)
+        utils.speak(f"Playing {song.stem}")
+    else:
+        utils.speak(message)
+    return success, message
+
+
 def cmd_open_music_folder() -> Tuple[bool, str]:
     """Open the Music folder."""
     return cmd_open_app("file explorer")
@@ -483,6 +498,16 @@ def cmd_language_info() -> Tuple[bool, str]:
     return True, message
 
 
+# ==================== REGISTRY COMMANDS ====================
+def cmd_reload_commands() -> Tuple[bool, str]:
+    """Reload commands, aliases, applications and websites from command packs and data files."""
+    import registry_loader  # Imported here: registry_loader builds on this module
+
+    success, message = registry_loader.reload_registry(rescan_packages=True)
+    utils.speak("Commands reloaded" if success else "I couldn't reload the commands. Check the data files.")
+    return success, message
+
+
 # ==================== COMMAND PATTERNS ====================
 
 class CommandPattern:
@@ -497,7 +522,10 @@ class CommandPattern:
         description: str,
         requires_param: bool = False,
         param_extractor: Optional[Callable[[str], Optional[str]]] = None,
-        priority: int = 0
+        priority: int = 0,
+        free_form_param: bool = False,
+        deadline: Optional[float] = None,
+        slots: Optional[List[str]] = None
     ):
         """
         Initialize a command pattern.
@@ -509,6 +537,12 @@ class CommandPattern:
             requires_param: Whether this command needs a parameter
             param_extractor: Function to extract parameter from command
             priority: Higher priority commands are checked first (default: 0)
+            free_form_param: Parameter is open vocabulary (search query, name),
+                re-decoded with the large model in tiered recognition mode
+            deadline: Seconds the handler may run before it is cancelled
+                (None = config.COMMAND_DEADLINE)
+            slots: Slot templates such as "create folder {name} [on desktop]",
+                compiled once (see slot_grammar); takes precedence over param_extractor
         """
         self.keywords = [k.lower() for k in keywords]
         self.handler = handler
@@ -516,6 +550,9 @@ class CommandPattern:
         self.requires_param = requires_param
         self.param_extractor = param_extractor
         self.priority = priority
+        self.free_form_param = free_form_param
+        self.deadline = deadline if deadline is not None else config.COMMAND_DEADLINE
+        self.slot_grammar = SlotGrammar(slots) if slots else None
 
     def matches(self, command: str) -> bool:
         """
@@ -561,6 +598,13 @@ class CommandPattern:
         if abs(len(word1) - len(word2)) > 2:
             return False
 
+        # The same sound ("chrome" / "cron"). The key drops inner vowels, so
+        # short words collide (lock/like, time/dim): require 4+ letters and
+        # the same first letter
+        if (min(len(word1), len(word2)) >= 4 and word1[0] == word2[0]
+                and phonetic_key(word1) == phonetic_key(word2)):
+            return True
+
         # Calculate simple Levenshtein distance
         distance = self._levenshtein_distance(word1, word2)
         max_distance = max(2, len(word1) // 3)  # Allow up to 2 edits or 33% of word length
@@ -588,97 +632,33 @@ class CommandPattern:
 
         return previous_row[-1]
 
+    def extract_slots(self, command: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract all typed slots with the compiled slot grammar.
+
+        Returns:
+            Dict of slot name -> value, or None if no template matches
+            (or the pattern has no slot grammar)
+        """
+        if self.slot_grammar is None:
+            return None
+        return self.slot_grammar.match(command)
+
     def extract_param(self, command: str) -> Optional[str]:
         """Extract parameter from command if needed."""
         if not self.requires_param:
             return None
 
+        if self.slot_grammar is not None:
+            slots = self.extract_slots(command)
+            return slots.get(self.slot_grammar.primary_slot) if slots else None
+
         if self.param_extractor:
             return self.param_extractor(command)
 
         return None
 
 
-# ==================== PARAMETER EXTRACTORS ====================
-
-def extract_app_name(command: str) -> Optional[str]:
-    """Extract application name from 'open X' command."""
-    command_lower = command.lower()
-
-    # Try "open X"
-    if "open" in command_lower:
-        parts = command_lower.split("open", 1)
-        if len(parts) > 1:
-            app_name = parts[1].strip()
-            # Remove common filler words
-            app_name = app_name.replace("the", "").strip()
-            return app_name
-
-    return None
-
-
-def extract_website_name(command: str) -> Optional[str]:
-    """Extract website name from command."""
-    command_lower = command.lower()
-
-    # Patterns: "open website X", "go to X", "browse X"
-    patterns = ["open website ", "go to ", "browse ", "open "]
-
-    for pattern in patterns:
-        if pattern in command_lower:
-            parts = command_lower.split(pattern, 1)
-            if len(parts) > 1:
-                website = parts[1].strip()
-                website = website.replace("website", "").strip()
-                return website
-
-    return None
-
-
-def extract_folder_name(command: str) -> Optional[str]:
-    """
-    Extract folder name from various folder creation command patterns.
-    Handles: 'create folder X', 'create a folder named X', 'create folder on desktop named X'
-    """
-    command_lower = command.lower().strip()
-
-    # Remove common filler words
-    command_clean = command_lower.replace(" a ", " ").replace(" the ", " ")
-
-    # Pattern 1: "create folder named X" or "make folder named X"
-    named_patterns = [
-        r"named\s+(.+)",
-        r"called\s+(.+)",
-    ]
-
-    import re
-    for pattern in named_patterns:
-        match = re.search(pattern, command_clean)
-        if match:
-            folder_name = match.group(1).strip()
-            # Remove trailing words like "on desktop", "on the desktop"
-            folder_name = re.sub(r'\s+on\s+(desktop|the\s+desktop).*$', '', folder_name)
-            if folder_name:
-                return folder_name
-
-    # Pattern 2: "create folder X" (simple pattern)
-    simple_patterns = ["create folder ", "make folder ", "new folder "]
-
-    for pattern in simple_patterns:
-        if pattern in command_clean:
-            parts = command_clean.split(pattern, 1)
-            if len(parts) > 1:
-                folder_name = parts[1].strip()
-                # Remove trailing words
-                folder_name = re.sub(r'\s+on\s+(desktop|the\s+desktop).*$', '', folder_name)
-                # Remove "named" prefix if present
-                folder_name = re.sub(r'^named\s+', '', folder_name)
-                if folder_name and folder_name not in ['on', 'the', 'desktop', 'a']:
-                    return folder_name
-
-    return None
-
-
 # ==================== COMMAND REGISTRY ====================
 
 COMMAND_REGISTRY: list[CommandPattern] = [
@@ -708,8 +688,17 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         handler=cmd_youtube,
         description="Play video on YouTube",
         requires_param=True,
-        param_extractor=utils.extract_youtube_query,
-        priority=90
+        slots=[
+            "(play|search|search for|find) {query} (on|in) (youtube|yt)",
+            "(play|search|search for|find) {query} (youtube|yt)",
+            "(youtube|yt) (play|search|search for) {query}",
+            "(play|search|search for) (on|in) (youtube|yt) [for] {query}",
+            "[open] (youtube|yt) [and] [play] {query}",
+            "play [video] {query}",
+        ],
+        priority=90,
+        free_form_param=True,
+        deadline=20.0
     ),
 
     # ===== WORKFLOWS (Multi-task automation) =====
@@ -717,21 +706,24 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         keywords=["start my workday", "start workday", "begin workday", "workday start"],
         handler=cmd_start_workday,
         description="Start workday workflow (opens apps, creates folder)",
-        priority=85
+        priority=85,
+        deadline=60.0
     ),
 
     CommandPattern(
         keywords=["start coding", "start coding session", "begin coding", "setup coding"],
         handler=cmd_start_coding,
         description="Start coding session workflow",
-        priority=85
+        priority=85,
+        deadline=60.0
     ),
 
     CommandPattern(
         keywords=["end workday", "finish workday", "end my workday", "wrap up work"],
         handler=cmd_end_workday,
         description="End workday workflow",
-        priority=85
+        priority=85,
+        deadline=60.0
     ),
 
     CommandPattern(
@@ -948,8 +940,13 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         handler=cmd_create_folder,
         description="Create a folder",
         requires_param=True,
-        param_extractor=extract_folder_name,
-        priority=50
+        slots=[
+            "(create|make) [a|the] [new] folder (on|in) [the] desktop [(named|called)] {name}",
+            "(create|make) [a|the] [new] folder [(named|called)] {name} [(on|in) [the] desktop]",
+            "new folder [(named|called)] {name} [(on|in) [the] desktop]",
+        ],
+        priority=50,
+        free_form_param=True
     ),
 
     CommandPattern(
@@ -963,14 +960,16 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         keywords=["clean downloads", "organize downloads", "clean download folder", "organize download folder"],
         handler=cmd_clean_downloads,
         description="Clean and organize downloads folder (with confirmation)",
-        priority=50
+        priority=50,
+        deadline=120.0
     ),
 
     CommandPattern(
         keywords=["empty recycle bin", "clean recycle bin", "clear recycle bin", "empty trash", "clean trash", "clear trash", "clean up recycle bin", "clean up recyclebin"],
         handler=cmd_empty_recycle_bin,
         description="Empty recycle bin (with confirmation)",
-        priority=50
+        priority=50,
+        deadline=60.0
     ),
 
     # ===== SCHEDULING COMMANDS =====
@@ -1003,6 +1002,14 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         priority=50
     ),
 
+    # ===== REGISTRY =====
+    CommandPattern(
+        keywords=["reload commands", "refresh commands", "reload command data", "reload data files"],
+        handler=cmd_reload_commands,
+        description="Reload commands from the data files",
+        priority=60
+    ),
+
     # ===== MUSIC =====
     CommandPattern(
         keywords=["play music", "play song", "play some music"],
@@ -1011,6 +1018,19 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         priority=50
     ),
 
+    CommandPattern(
+        keywords=["play song", "play the song", "play track", "play my song", "from my music"],
+        handler=cmd_play_song,
+        description="Play a song from Music folder by name",
+        requires_param=True,
+        slots=[
+            "play [the|my] (song|track) {song}",
+            "play {song} from [my] music [folder]",
+        ],
+        priority=95,
+        free_form_param=True
+    ),
+
     CommandPattern(
         keywords=["open music folder"],
         handler=cmd_open_music_folder,
@@ -1024,7 +1044,7 @@ COMMAND_REGISTRY: list[CommandPattern] = [
         handler=cmd_open_app,
         description="Open an application (generic)",
         requires_param=True,
-        param_extractor=extract_app_name,
+        slots=["open [the] {app} [app|application]"],
         priority=10
     ),
 ]
@@ -1033,63 +1053,660 @@ COMMAND_REGISTRY: list[CommandPattern] = [
 COMMAND_REGISTRY.sort(key=lambda x: x.priority, reverse=True)
 
 
+# ==================== REGISTRY INDEX ====================
+# The intent ranker, phonetic index and early commit index are all derived
+# from the registry, so they live together in one RegistryIndex. Reloading the
+# registry (registry_loader.py) builds and warms a new index off the listen
+# thread, then swaps it in with a single assignment; a dispatch that already
+# holds the old index finishes on it.
+
+class RegistryIndex:
+    """
+    A command registry and the lookup structures derived from it.
+    """
+
+    def __init__(
+        self,
+        patterns: List[CommandPattern],
+        aliases: Optional[Dict[str, List[str]]] = None,
+        known_names: Optional[List[str]] = None,
+        urdu_commands: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the index (structures are built on first use or by warm()).
+
+        Args:
+            patterns: Command patterns (sorted here by priority, highest first)
+            aliases: Base command -> aliases (default: config.COMMAND_ALIASES)
+            known_names: Application and website names for compound merging
+                (default: config.APPLICATIONS and config.WEBSITES names)
+            urdu_commands: Roman Urdu phrase -> English command
+                (default: multilingual.ALL_URDU_COMMANDS)
+        """
+        self.patterns = sorted(patterns, key=lambda x: x.priority, reverse=True)
+        self.aliases = config.COMMAND_ALIASES if aliases is None else aliases
+        self.known_names = (list(config.APPLICATIONS) + list(config.WEBSITES)) if known_names is None else known_names
+        self.urdu_commands = multilingual.ALL_URDU_COMMANDS if urdu_commands is None else urdu_commands
+
+        self._intent_ranker: Optional[IntentRanker] = None
+        self._phonetic_index: Optional[PhoneticIndex] = None
+        self._early_commit: Optional[Tuple[Dict[str, list], Dict[str, set]]] = None
+
+    @property
+    def intent_ranker(self) -> IntentRanker:
+        """TF-IDF ranker over every registry keyword"""
+        if self._intent_ranker is None:
+            self._intent_ranker = IntentRanker(self.patterns, prior_weight=config.INTENT_PRIOR_WEIGHT)
+        return self._intent_ranker
+
+    @property
+    def phonetic_index(self) -> PhoneticIndex:
+        """
+        Phonetic index of every keyword word plus application and website
+        names, used to re-join words the recognizer split ("note pad")
+        """
+        if self._phonetic_index is None:
+            words = {word for pattern in self.patterns for keyword in pattern.keywords for word in keyword.split()}
+            self._phonetic_index = PhoneticIndex([w for w in words if len(w) >= 3] + list(self.known_names))
+        return self._phonetic_index
+
+    @property
+    def early_commit(self) -> Tuple[Dict[str, list], Dict[str, set]]:
+        """(phrase_owners, prefix_targets) for early commit and rescoring"""
+        if self._early_commit is None:
+            self._early_commit = _build_early_commit_index(self)
+        return self._early_commit
+
+    def warm(self) -> None:
+        """Build every structure now, so the first dispatch does not pay for it."""
+        ranker, phonetic_index, early_commit = self.intent_ranker, self.phonetic_index, self.early_commit
+        logger.debug(f"Registry index warmed: {len(self.patterns)} patterns, "
+                     f"{len(phonetic_index.names)} known words, {len(early_commit[0])} phrases")
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Get every built structure as plain data (see registry_artifact).
+
+        Returns:
+            Picklable dict; patterns are referenced by their position in self.patterns
+        """
+        self.warm()
+        position = {id(pattern): i for i, pattern in enumerate(self.patterns)}
+        phrase_owners, prefix_targets = self.early_commit
+        return {
+            "intent_ranker": self.intent_ranker.export_state(),
+            "phonetic_index": self.phonetic_index,
+            "phrase_owners": {
+                phrase: [position[id(p)] for p in owners] for phrase, owners in phrase_owners.items()
+            },
+            "prefix_targets": {
+                prefix: [None if p is None else position[id(p)] for p in targets]
+                for prefix, targets in prefix_targets.items()
+            },
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Adopt structures exported from an index over the same patterns.
+
+        Args:
+            state: Output of export_state()
+        """
+        patterns = self.patterns
+        self._intent_ranker = IntentRanker.from_state(patterns, state["intent_ranker"])
+        self._phonetic_index = state["phonetic_index"]
+        self._early_commit = (
+            {phrase: [patterns[i] for i in owners] for phrase, owners in state["phrase_owners"].items()},
+            {prefix: {None if i is None else patterns[i] for i in targets}
+             for prefix, targets in state["prefix_targets"].items()},
+        )
+
+
+_registry_index = RegistryIndex(COMMAND_REGISTRY)
+
+
+def get_registry_index() -> RegistryIndex:
+    """Get the current registry index (read it once per dispatch)."""
+    return _registry_index
+
+
+def swap_registry_index(index: RegistryIndex) -> None:
+    """
+    Make a new registry index current.
+
+    Args:
+        index: Index to publish (call index.warm() first so readers never build it)
+    """
+    global _registry_index, COMMAND_REGISTRY
+
+    _registry_index = index
+    COMMAND_REGISTRY = index.patterns
+    _partial_commits_alone.cache_clear()
+    logger.info(f"Registry index swapped in: {len(index.patterns)} patterns")
+
+
+# ==================== INTENT RANKING ====================
+
+def get_intent_ranker() -> IntentRanker:
+    """Get the intent ranker of the current registry."""
+    return get_registry_index().intent_ranker
+
+
+def rank_intents(command: Union[str, Utterance], top_k: int = config.INTENT_TOP_K) -> List[Tuple[CommandPattern, float]]:
+    """
+    Rank registry patterns for a command.
+
+    Args:
+        command: English voice command or normalized Utterance
+        top_k: Number of intents to return
+
+    Returns:
+        [(pattern, confidence), ...] best first
+    """
+    return get_intent_ranker().rank(_as_utterance(command).canonical, top_k)
+
+
+def get_phonetic_index() -> PhoneticIndex:
+    """Get the phonetic index of known words of the current registry."""
+    return get_registry_index().phonetic_index
+
+
+def merge_compound_words(command: str, index: Optional[RegistryIndex] = None) -> str:
+    """
+    Re-join known words the recognizer split apart, and correct misheard
+    application/website names.
+
+    Args:
+        command: Normalized command ("open note pad")
+        index: Registry index to use (default: the current one)
+
+    Returns:
+        Command with compounds merged ("open notepad")
+    """
+    index = index or get_registry_index()
+    tokens = [_correct_known_name(token, index) for token in merge_compounds(command.split(), index.phonetic_index)]
+    merged = " ".join(tokens)
+    if merged != command:
+        logger.debug(f"Merged compound words: '{command}' -> '{merged}'")
+    return merged
+
+
+def _correct_known_name(token: str, index: RegistryIndex) -> str:
+    """
+    Replace a misrecognized application or website name ("cron" -> "chrome").
+
+    Only unknown words of 4+ letters are corrected, and only to a one-word
+    application/website name with the same first letter, so ordinary words
+    ("tom", "time") are never rewritten. Used for ranking only: parameters
+    are still extracted from the recognized text.
+    """
+    if len(token) < 4 or token in index.phonetic_index.names:
+        return token
+    match = index.phonetic_index.best_match(token)
+    if match is None or " " in match[0] or match[0][0] != token[0] or match[0] not in index.known_names:
+        return token
+    return match[0]
+
+
+def _candidate_patterns(
+    normalized_command: str,
+    index: Optional[RegistryIndex] = None
+) -> List[Tuple[CommandPattern, float]]:
+    """
+    Patterns to try for a normalized command, best first.
+
+    With the intent ranker: the top INTENT_TOP_K intents at or above
+    INTENT_MIN_CONFIDENCE. Without it: the first pattern whose matches() is true.
+    """
+    index = index or get_registry_index()
+    normalized_command = merge_compound_words(normalized_command, index)
+
+    if not config.ENABLE_INTENT_RANKER:
+        pattern = next((p for p in index.patterns if p.matches(normalized_command)), None)
+        return [(pattern, 1.0)] if pattern else []
+
+    ranked = index.intent_ranker.rank(normalized_command, config.INTENT_TOP_K)
+    logger.debug("Intent ranking: " + ", ".join(f"{p.description} {c:.2f}" for p, c in ranked))
+    return [(pattern, confidence) for pattern, confidence in ranked
+            if confidence >= config.INTENT_MIN_CONFIDENCE]
+
+
+# ==================== EARLY COMMIT ====================
+# Lookup structures for committing stable partial hypotheses before the
+# recognizer endpoints. Built lazily by the RegistryIndex.
+
+def _build_early_commit_index(index: RegistryIndex) -> Tuple[Dict[str, list], Dict[str, set]]:
+    """
+    Build the early commit index of a registry.
+
+    Args:
+        index: Registry index being built (dispatch is resolved against it)
+
+    Returns:
+        (phrase_owners, prefix_targets) tuple. phrase_owners maps each registry
+        keyword and alias to the patterns that own it. prefix_targets maps every
+        proper word-prefix of a known phrase (keywords, aliases and Roman Urdu
+        commands) to the patterns its longer completions resolve to. A partial
+        that is a prefix of a phrase for a *different* command may still grow
+        into that command and must not be committed.
+    """
+    phrase_owners: Dict[str, list] = {}
+    for pattern in index.patterns:
+        for keyword in pattern.keywords:
+            phrase_owners.setdefault(keyword, []).append(pattern)
+    for base_command, aliases in index.aliases.items():
+        for alias in aliases:
+            phrase_owners.setdefault(alias, phrase_owners.get(base_command, []))
+
+    def resolve(phrase: str) -> Optional[CommandPattern]:
+        """Resolve a known phrase to the pattern dispatch would pick."""
+        owners = phrase_owners.get(phrase)
+        if owners and len(owners) == 1:
+            return owners[0]
+        english = index.urdu_commands.get(phrase) or multilingual.translate_urdu_to_english(phrase)[0]
+        return find_matching_pattern(english, index)
+
+    known_phrases = list(phrase_owners.keys()) + list(index.urdu_commands.keys())
+
+    prefix_targets: Dict[str, set] = {}
+    for phrase in known_phrases:
+        words = phrase.split()
+        if len(words) < 2:
+            continue
+        target = resolve(phrase)
+        for i in range(1, len(words)):
+            prefix_targets.setdefault(" ".join(words[:i]), set()).add(target)
+
+    return phrase_owners, prefix_targets
+
+
+def _get_early_commit_index() -> Tuple[Dict[str, list], Dict[str, set]]:
+    """Get the early commit index of the current registry."""
+    return get_registry_index().early_commit
+
+
+def strip_wake_word(command: str) -> str:
+    """
+    Strip a leading wake word from a normalized command.
+    This prevents "gideon create folder" from matching "gideon quit".
+
+    Args:
+        command: Lowercased command string
+
+    Returns:
+        Command without the leading wake word
+    """
+    return _strip_leading_wake_word(command)
+
+
+def _as_utterance(command: Union[str, Utterance]) -> Utterance:
+    """Normalize an English command string (Utterances pass through)"""
+    if isinstance(command, Utterance):
+        return command
+    return normalize_utterance(command, translate=False)
+
+
+def is_early_commit_safe(partial: str) -> bool:
+    """
+    Decide whether a stable partial hypothesis can be dispatched immediately.
+
+    A partial is safe only when all of these hold:
+    - Compound commands are off: with config.ENABLE_COMPOUND_COMMANDS any
+      complete command may still go on ("open chrome" ... "and notepad"),
+      and a stable partial cannot tell a pause from the end of the utterance
+    - It is not a word-prefix of any longer known phrase ("open", "play")
+    - It is exactly a keyword (or alias) of a single CommandPattern
+    - That pattern needs no parameter and has priority >= EARLY_COMMIT_MIN_PRIORITY
+    - The normal dispatch path would pick that same pattern
+
+    Args:
+        partial: Partial hypothesis from the recognizer
+
+    Returns:
+        True if listening can stop and the partial be dispatched now
+    """
+    # "open chrome" may be the first part of "open chrome and notepad"
+    if config.ENABLE_COMPOUND_COMMANDS:
+        return False
+    return _partial_commits_alone(partial)
+
+
+@lru_cache(maxsize=256)
+def _partial_commits_alone(partial: str) -> bool:
+    """Registry checks of is_early_commit_safe (cached until the index is swapped)"""
+    index = get_registry_index()
+    phrase_owners, prefix_targets = index.early_commit
+
+    text = strip_wake_word(clean_text(partial))
+    owners = phrase_owners.get(text, [])
+    if len(owners) != 1:
+        return False
+
+    pattern = owners[0]
+    if pattern.requires_param or pattern.priority < config.EARLY_COMMIT_MIN_PRIORITY:
+        return False
+
+    # Prefix guard: "open" could still become "open chrome"
+    if prefix_targets.get(text, set()) - {pattern}:
+        return False
+
+    # Guard against a higher-priority fuzzy match stealing the command at dispatch
+    return find_matching_pattern(text, index) is pattern
+
+
+# ==================== N-BEST RESCORING ====================
+
+def _resolution_score(hypothesis: str) -> float:
+    """
+    Score how well a hypothesis resolves against the command registry.
+
+    Returns:
+        1.0 for an exact keyword, alias, Roman Urdu phrase or shutdown trigger,
+        0.5-0.9 for a keyword contained in the text (scaled by priority, and only
+        if a required parameter can be extracted), 0.3 for a fuzzy-only match,
+        0.0 if nothing in the registry matches
+    """
+    index = get_registry_index()
+    phrase_owners, _ = index.early_commit
+
+    utterance = normalize_utterance(hypothesis)
+    if utterance.text in index.urdu_commands or utterance.is_shutdown:
+        return 1.0
+
+    normalized = utterance.canonical
+    if normalized in phrase_owners or utterance.command in phrase_owners:
+        return 1.0
+
+    for pattern in index.patterns:
+        if any(keyword in normalized for keyword in pattern.keywords):
+            if pattern.requires_param and not pattern.extract_param(utterance.english):
+                continue
+            return 0.5 + 0.4 * min(pattern.priority, 100) / 100
+
+    if any(pattern.matches(normalized) for pattern in index.patterns):
+        return 0.3
+
+    return 0.0
+
+
+def rescore_alternatives(alternatives: List[Tuple[str, float]]) -> Optional[str]:
+    """
+    Pick the best actionable hypothesis from the recognizer's N-best list.
+
+    Acoustic confidences are turned into posteriors relative to the best
+    alternative and blended with the registry resolution score, so a slightly
+    less likely "open chrome" beats a more likely but meaningless "open cron".
+
+    Args:
+        alternatives: [(text, confidence), ...] in recognizer order
+
+    Returns:
+        Text of the winning hypothesis, or None if the list is empty
+    """
+    if not alternatives:
+        return None
+
+    best_confidence = max(confidence for _, confidence in alternatives)
+    weights = [math.exp(min(0.0, confidence - best_confidence)) for _, confidence in alternatives]
+    total_weight = sum(weights)
+
+    acoustic_weight = config.RESCORE_ACOUSTIC_WEIGHT
+    best_text, best_score = alternatives[0][0], -1.0
+
+    for (text, _), weight in zip(alternatives, weights):
+        score = acoustic_weight * (weight / total_weight) + (1 - acoustic_weight) * _resolution_score(text)
+        logger.debug(f"N-best candidate '{text}': score {score:.3f}")
+        if score > best_score:
+            best_text, best_score = text, score
+
+    if best_text != alternatives[0][0]:
+        logger.info(f"N-best rescoring: '{alternatives[0][0]}' -> '{best_text}'")
+
+    return best_text
+
+
+def arbitrate_languages(candidates: List[Tuple[str, str, Optional[float]]]) -> Optional[str]:
+    """
+    Choose between transcripts of the same utterance from different language models.
+
+    Urdu-script results are transliterated to Roman Urdu first. Each candidate
+    is scored like an N-best alternative: acoustic confidence blended with how
+    well the text resolves against the registry and Roman Urdu tables.
+
+    Args:
+        candidates: [(language, text, confidence), ...]; confidence may be None
+
+    Returns:
+        Winning text (Roman Urdu for Urdu results), or None if all are empty
+    """
+    acoustic_weight = config.RESCORE_ACOUSTIC_WEIGHT
+    best_text, best_score = None, -1.0
+
+    for language, text, confidence in candidates:
+        text = multilingual.romanize_urdu(text).strip()
+        if not text:
+            continue
+        score = acoustic_weight * (0.5 if confidence is None else confidence) \
+            + (1 - acoustic_weight) * _resolution_score(text)
+        logger.debug(f"Language candidate [{language}] '{text}': score {score:.3f}")
+        if score > best_score:
+            best_text, best_score = text, score
+
+    return best_text
+
+
+# ==================== TIERED RECOGNITION ====================
+# Optional hook that re-decodes a free-form parameter with the large model
+# (see VoskAudioHandler.transcribe_slot). None = use the small model's text.
+_slot_refiner: Optional[Callable[[str], Optional[str]]] = None
+
+
+def set_slot_refiner(refiner: Optional[Callable[[str], Optional[str]]]) -> None:
+    """
+    Register the function used to refine free-form parameters.
+
+    Args:
+        refiner: Takes the small-model parameter text, returns better text or None
+    """
+    global _slot_refiner
+    _slot_refiner = refiner
+
+
+def refine_free_form_param(param: str) -> str:
+    """
+    Refine a free-form parameter with the registered slot refiner.
+
+    Args:
+        param: Parameter extracted from the small-model transcript
+
+    Returns:
+        Refined parameter, or the original one if refinement is unavailable
+    """
+    if _slot_refiner is None:
+        return param
+
+    refined = _slot_refiner(param)
+    if refined and refined != param:
+        logger.info(f"Refined parameter: '{param}' -> '{refined}'")
+        print(f"🔎 Refined: \"{param}\" → \"{refined}\"")
+        return refined
+    return param
+
+
 # ==================== COMMAND EXECUTION ====================
 
-def execute_command(command: str) -> Tuple[bool, str]:
+def find_matching_pattern(
+    command: Union[str, Utterance],
+    index: Optional[RegistryIndex] = None
+) -> Optional[CommandPattern]:
     """
-    Execute a voice command by matching it against the command registry.
+    Resolve a command to the pattern execute_command() would run, without running it.
 
     Args:
-        command: The voice command to execute
+        command: English voice command (already translated from Roman Urdu)
+            or normalized Utterance
+        index: Registry index to resolve against (default: the current one)
 
     Returns:
-        (success: bool, message: str) tuple
+        Best CommandPattern (highest ranked intent, or first match by priority
+        without the intent ranker), or None
+    """
+    candidates = _candidate_patterns(_as_utterance(command).canonical, index)
+    return candidates[0][0] if candidates else None
+
+
+def _resolve_candidates(
+    utterance: Utterance,
+    candidates: List[Tuple[CommandPattern, float]],
+    refine: bool,
+    verbose: bool
+) -> Tuple[Optional[CommandPattern], Optional[str]]:
+    """
+    Pick the first candidate that can run.
+
+    Args:
+        utterance: Normalized command
+        candidates: Output of _candidate_patterns()
+        refine: Re-decode free-form parameters with the slot recognizer
+        verbose: Log and print each match
+
+    Returns:
+        (pattern, param) tuple; param is None for commands without one,
+        pattern is None if no candidate can run
+    """
+    for pattern, confidence in candidates:
+        # Shutdown only runs when the shared shutdown check agrees ("quite" is not "quit")
+        if pattern.handler is cmd_shutdown and not utterance.is_shutdown:
+            continue
+
+        if verbose:
+            logger.info(f"✓ MATCHED: {pattern.description} (confidence {confidence:.2f}, keywords: {pattern.keywords})")
+            print(f"✓ Matched: {pattern.description}")
+
+        # Extract parameter if needed
+        if not pattern.requires_param:
+            return pattern, None
+
+        param = pattern.extract_param(utterance.english)
+        if param and refine and pattern.free_form_param:
+            param = refine_free_form_param(param)
+        if param:
+            return pattern, param
+
+        if verbose:
+            logger.info(f"No parameter for {pattern.description}, trying next intent")
+
+    return None, None
+
+
+def resolve_command(
+    command: Union[str, Utterance]
+) -> Tuple[Optional[CommandPattern], Optional[Callable[[], Tuple[bool, str]]]]:
+    """
+    Match a command and bind its handler without announcing anything.
+
+    Used for the parts of a compound utterance ("open chrome and notepad").
+    Free-form parameters are not refined, because the recorded audio covers
+    the whole utterance.
+
+    Args:
+        command: English voice command or normalized Utterance
+
+    Returns:
+        (pattern, call) tuple, or (None, None) if the command cannot run
     """
-    if not command or command.strip() == "":
-        return False, "Empty command"
+    utterance = _as_utterance(command)
+    try:
+        pattern, param = _resolve_candidates(
+            utterance, _candidate_patterns(utterance.canonical), refine=False, verbose=False
+        )
+    except Exception as e:
+        logger.debug(f"Could not resolve '{utterance.english}': {e}")
+        return None, None
+
+    if pattern is None:
+        return None, None
+    return pattern, lambda: _run_handler(pattern, utterance.english, param)
+
+
+def prepare_command(command: Union[str, Utterance]) -> Tuple[Optional[CommandPattern], Callable[[], Tuple[bool, str]]]:
+    """
+    Match a voice command and bind its handler without running it.
+
+    Matching, parameter extraction and free-form refinement happen here, on
+    the caller's thread (refinement reads the last utterance's audio, which
+    the next listen overwrites). The returned call runs only the handler, so
+    it can be handed to a CommandExecutor.
+
+    Args:
+        command: English voice command, or the Utterance normalized by the
+            listen loop (then nothing is normalized twice)
 
-    # Normalize command
-    normalized_command = utils.normalize_command(command)
+    Returns:
+        (pattern, call) tuple; pattern is None when nothing needs to run
+        (empty, unknown or incomplete command) and call reports why
+    """
+    if not command or (isinstance(command, str) and command.strip() == ""):
+        return None, lambda: (False, "Empty command")
 
-    # Strip wake words from the beginning of the command
-    # This prevents "gideon create folder" from matching "gideon quit"
-    for wake_word in config.WAKE_WORDS:
-        if normalized_command.startswith(wake_word + " "):
-            normalized_command = normalized_command[len(wake_word):].strip()
-            logger.debug(f"Stripped wake word '{wake_word}' from command")
-            break
+    # Normalize once: wake word stripped, aliases resolved
+    utterance = _as_utterance(command)
+    normalized_command = utterance.canonical
+    command = utterance.english
 
     logger.info(f"🎤 RAW COMMAND: '{command}'")
     logger.info(f"📝 NORMALIZED: '{normalized_command}'")
     print(f"\n🔍 Searching for match: '{command}'")
 
-    # Try to match against registered commands
-    for pattern in COMMAND_REGISTRY:
-        if pattern.matches(normalized_command):
-            logger.info(f"✓ MATCHED: {pattern.description} (keywords: {pattern.keywords})")
-            print(f"✓ Matched: {pattern.description}")
-            try:
-                # Extract parameter if needed
-                if pattern.requires_param:
-                    param = pattern.extract_param(command)
-                    if param:
-                        return pattern.handler(param)
-                    else:
-                        message = "I couldn't understand the full command"
-                        utils.speak(message)
-                        return False, message
-                else:
-                    return pattern.handler()
-
-            except Exception as e:
-                error_msg = utils.handle_error(e, f"Command execution: {command}")
-                utils.speak(error_msg)
-                return False, error_msg
+    # Try the best matching registered commands in turn
+    candidates = _candidate_patterns(normalized_command)
+    try:
+        pattern, param = _resolve_candidates(utterance, candidates, refine=True, verbose=True)
+    except Exception as e:
+        error_msg = utils.handle_error(e, f"Command execution: {command}")
+        utils.speak(error_msg)
+        return None, lambda: (False, error_msg)
+
+    if pattern is not None:
+        return pattern, lambda: _run_handler(pattern, command, param)
+
+    if candidates:
+        message = "I couldn't understand the full command"
+        utils.speak(message)
+        return None, lambda: (False, message)
 
     # No matching command found
     logger.warning(f"Unknown command: {command}")
     utils.speak(config.RESPONSES["unknown_command"])
-    return False, "Unknown command"
+    return None, lambda: (False, "Unknown command")
+
+
+def _run_handler(pattern: CommandPattern, command: str, param: Optional[str] = None) -> Tuple[bool, str]:
+    """Run a matched handler, speaking and returning any error"""
+    try:
+        return pattern.handler(param) if pattern.requires_param else pattern.handler()
+
+    except CommandCancelled:
+        raise  # Reported by the executor
+
+    except Exception as e:
+        error_msg = utils.handle_error(e, f"Command execution: {command}")
+        utils.speak(error_msg)
+        return False, error_msg
+
+
+def execute_command(command: Union[str, Utterance]) -> Tuple[bool, str]:
+    """
+    Execute a voice command by matching it against the command registry.
+
+    Args:
+        command: The voice command to execute (English text or Utterance)
+
+    Returns:
+        (success: bool, message: str) tuple
+    """
+    _, call = prepare_command(command)
+    return call()
 
 
 def get_all_commands() -> list[Dict[str, Any]]:
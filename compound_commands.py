@@ -0,0 +1,237 @@
+"""
+Gideon Compound Commands
+========================
+Runs several commands spoken in one utterance ("open chrome and notepad",
+"chrome aur notepad kholo", "start coding then play music") in a single
+listen cycle.
+
+- The utterance is split at conjunctions (config.COMPOUND_PARALLEL_WORDS and
+  config.COMPOUND_SEQUENTIAL_WORDS) and each part is translated and matched
+  on its own
+- A short part without a verb borrows it from its neighbour: "open chrome
+  and notepad" -> "open notepad". Roman Urdu puts the verb last, so in
+  "chrome aur notepad kholo" the first part borrows from the second
+- The split is used only if every part resolves to a command, and a part
+  after a command with a free-form parameter starts with one of its own
+  keywords. Otherwise the utterance is one command, and words are never
+  borrowed from a command with a free-form parameter, so "play tom and
+  jerry on youtube" still searches for "tom and jerry"
+- Parts joined by a parallel word run at the same time; a sequential word
+  waits for the parts before it, and a failure skips the stages after it
+- What the parts would say is collected and spoken as one summary
+- While this is enabled, stable partials are never committed early (see
+  commands.is_early_commit_safe): "open chrome" could be the first part
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Callable, List, Optional, Pattern, Tuple, Union
+
+import config
+import utils
+import commands
+from command_executor import run_concurrently
+from utterance import Utterance, normalize_utterance, strip_wake_word
+
+logger = logging.getLogger("Gideon.CompoundCommands")
+
+# Longest part (in words) that may borrow a verb ("notepad", "file explorer")
+BORROW_MAX_WORDS = 2
+
+
+class CompoundAction:
+    """
+    One resolved part of a compound command.
+    """
+
+    def __init__(self, text: str, pattern: commands.CommandPattern, call: Callable[[], Tuple[bool, str]]):
+        self.text = text
+        self.pattern = pattern
+        self.call = call
+
+
+class CompoundPlan:
+    """
+    Resolved actions grouped into stages that run one after another.
+
+    Has .description and .deadline like a CommandPattern, so it can be
+    submitted to the CommandExecutor in the same way.
+    """
+
+    def __init__(self, stages: List[List[CompoundAction]]):
+        """
+        Initialize the plan.
+
+        Args:
+            stages: Actions of each stage (actions within a stage run concurrently)
+        """
+        self.stages = stages
+        self.actions = [action for stage in stages for action in stage]
+        self.description = " then ".join(
+            " and ".join(action.pattern.description for action in stage) for stage in stages
+        )
+        self.deadline = sum(max(action.pattern.deadline for action in stage) for stage in stages)
+
+    def run(self) -> Tuple[bool, str]:
+        """
+        Run every stage and speak one summary.
+
+        Returns:
+            (success, message) tuple; success only if every action succeeded
+        """
+        spoken: List[str] = []
+        results: List[Tuple[bool, str]] = []
+
+        for number, stage in enumerate(self.stages):
+            sinks: List[List[str]] = [[] for _ in stage]
+            calls = [_collecting(action.call, sink) for action, sink in zip(stage, sinks)]
+            stage_results = run_concurrently(calls) if len(calls) > 1 else [calls[0]()]
+
+            for sink in sinks:
+                spoken.extend(sink)
+            results.extend(stage_results)
+
+            later = [action.pattern.description for later_stage in self.stages[number + 1:] for action in later_stage]
+            if later and not all(success for success, _ in stage_results):
+                spoken.append(f"Skipped {', '.join(later).lower()}")
+                results.append((False, f"Skipped: {', '.join(later)}"))
+                break
+
+        if spoken:
+            utils.speak(" ".join(_sentence(text) for text in spoken))
+
+        success = all(success for success, _ in results)
+        return success, " | ".join(message for _, message in results)
+
+
+def _collecting(call: Callable[[], Tuple[bool, str]], sink: List[str]) -> Callable[[], Tuple[bool, str]]:
+    """Wrap a handler call so what it says goes to sink"""
+    def run() -> Tuple[bool, str]:
+        with utils.collect_speech(sink):
+            return call()
+    return run
+
+
+def _sentence(text: str) -> str:
+    """End text with punctuation so joined messages read as sentences"""
+    text = text.strip()
+    return text if text.endswith((".", "!", "?")) else text + "."
+
+
+# ==================== SPLITTING ====================
+
+def _leads_with_keyword(text: str, pattern: commands.CommandPattern) -> bool:
+    """True if text starts with one of the pattern's keywords (whole words)"""
+    return any(text == keyword or text.startswith(keyword + " ") for keyword in pattern.keywords)
+
+
+@lru_cache(maxsize=4)
+def _conjunction_regex(parallel: Tuple[str, ...], sequential: Tuple[str, ...]) -> Pattern:
+    """Whole-word alternation of every conjunction, longest first ("and then" before "and")"""
+    words = sorted(set(parallel) | set(sequential), key=len, reverse=True)
+    return re.compile(r"\s+(" + "|".join(re.escape(w).replace(r"\ ", r"\s+") for w in words) + r")\s+")
+
+
+def split_parts(text: str) -> List[Tuple[str, bool]]:
+    """
+    Split cleaned text at conjunctions.
+
+    Args:
+        text: Lowercased command ("open chrome and notepad then play music")
+
+    Returns:
+        [(part, sequential), ...]; sequential is True when the part follows a
+        sequential word ("then"). A single part means there is nothing to split.
+    """
+    regex = _conjunction_regex(tuple(config.COMPOUND_PARALLEL_WORDS), tuple(config.COMPOUND_SEQUENTIAL_WORDS))
+    pieces = regex.split(f" {text} ")
+    sequential_words = set(config.COMPOUND_SEQUENTIAL_WORDS)
+
+    parts = [(pieces[0].strip(), False)]
+    for i in range(1, len(pieces), 2):
+        conjunction = " ".join(pieces[i].split())
+        parts.append((pieces[i + 1].strip(), conjunction in sequential_words))
+    return parts
+
+
+def plan_compound(utterance: Utterance) -> Optional[CompoundPlan]:
+    """
+    Resolve an utterance into a compound plan.
+
+    Args:
+        utterance: Normalized utterance (its raw text is split, then each part
+            is translated on its own)
+
+    Returns:
+        CompoundPlan with two or more actions, or None if the utterance is a
+        single command
+    """
+    if not config.ENABLE_COMPOUND_COMMANDS or utterance.is_shutdown:
+        return None
+
+    parts = split_parts(strip_wake_word(utterance.text))
+    if len(parts) < 2 or len(parts) > config.COMPOUND_MAX_PARTS or not all(text for text, _ in parts):
+        return None
+
+    utterances = [normalize_utterance(text) for text, _ in parts]
+    resolved = [commands.resolve_command(part) for part in utterances]
+
+    # Borrow a verb from a resolved neighbour ("open chrome and notepad")
+    for i, (pattern, _) in enumerate(resolved):
+        if pattern is not None or len(utterances[i].command.split()) > BORROW_MAX_WORDS:
+            continue
+        for neighbour in (i - 1, i + 1):
+            if not 0 <= neighbour < len(parts):
+                continue
+            neighbour_pattern = resolved[neighbour][0]
+            neighbour_words = utterances[neighbour].command.split()
+            if neighbour_pattern is None or neighbour_pattern.free_form_param or len(neighbour_words) < 2:
+                continue
+            borrowed = normalize_utterance(f"{neighbour_words[0]} {utterances[i].command}", translate=False)
+            resolved[i] = commands.resolve_command(borrowed)
+            if resolved[i][0] is not None:
+                utterances[i] = borrowed
+                break
+
+    if any(pattern is None for pattern, _ in resolved):
+        return None
+
+    # A free-form parameter may span the conjunction ("play tom and jerry on
+    # youtube"), so the part after one must lead with its own command
+    for (pattern, _), part, (next_pattern, _) in zip(resolved, utterances[1:], resolved[1:]):
+        if pattern.free_form_param and not _leads_with_keyword(part.canonical, next_pattern):
+            return None
+
+    stages: List[List[CompoundAction]] = []
+    for (_, sequential), part, (pattern, call) in zip(parts, utterances, resolved):
+        if sequential or not stages:
+            stages.append([])
+        stages[-1].append(CompoundAction(part.english, pattern, call))
+
+    plan = CompoundPlan(stages)
+    logger.info(f"Compound command: '{utterance.raw}' -> {plan.description}")
+    return plan
+
+
+def prepare(command: Union[str, Utterance]) -> Tuple[Optional[object], Callable[[], Tuple[bool, str]]]:
+    """
+    Like commands.prepare_command(), but handles compound utterances.
+
+    Args:
+        command: Voice command or normalized Utterance
+
+    Returns:
+        (pattern, call) tuple; pattern is a CompoundPlan for a compound
+        utterance, otherwise as returned by commands.prepare_command()
+    """
+    utterance = command if isinstance(command, Utterance) else normalize_utterance(command)
+
+    plan = plan_compound(utterance)
+    if plan is None:
+        return commands.prepare_command(utterance)
+
+    print(f"\n🔗 Compound command: {plan.description}")
+    return plan, plan.run
@@ -45,6 +45,7 @@ VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
 SAMPLE_RATE = 16000  # 16kHz optimal for speech recognition
 AUDIO_CHANNELS = 1   # Mono audio (required for Vosk)
 AUDIO_DEVICE_INDEX = None  # None = default microphone, or specify device index
+CAPTURE_AT_NATIVE_RATE = True  # Capture at the device's default rate (e.g. 48 kHz) and resample to SAMPLE_RATE
 
 # Recognition Settings
 RECOGNITION_TIMEOUT = 5  # Seconds to wait for speech to start
@@ -52,8 +53,56 @@ RECOGNITION_PHRASE_LIMIT = 8  # Maximum seconds for complete phrase (reduced for
 SILENCE_THRESHOLD = 100.0  # Volume threshold to detect speech (LOWERED for better sensitivity)
 MAX_RETRY_ATTEMPTS = 3  # Number of times to ask user to repeat on failure
 
+# Audio preprocessing (noise reduction + automatic gain control before recognition)
+ENABLE_AUDIO_PREPROCESSING = False  # Set to True for noisy rooms or quiet microphones
+ENABLE_NOISE_REDUCTION = True  # Spectral gating against steady background noise (fans, hum)
+ENABLE_AGC = True  # Boost quiet speech towards AGC_TARGET_RMS, limit peaks against clipping
+AGC_TARGET_RMS = 3000.0  # Target speech level (int16 RMS)
+PREPROCESSING_CPU_BUDGET = 0.25  # Max processing time per block, as a fraction of its duration
+
+# Persistent input stream
+# One microphone stream stays open for the whole session; each listen reads
+# from it and starts with the audio captured just before it began.
+ENABLE_PERSISTENT_STREAM = True
+PREROLL_SECONDS = 0.5  # Audio kept from before each listen (avoids clipping the first syllable)
+
+# Out-of-process recognition
+# Runs the Vosk model in a dedicated worker process (audio passed through
+# shared memory), so decoding gets its own core and a crash restarts only the worker.
+RECOGNIZER_OUT_OF_PROCESS = False
+
+# Model server
+# Start once with: python model_server.py
+# Front-ends then attach in milliseconds and share one in-memory copy of each model.
+USE_MODEL_SERVER = False  # Attach to the model server (loads locally if it is not running)
+MODEL_SERVER_SOCKET = "/tmp/gideon-model.sock"  # Unix socket path (Linux/macOS)
+MODEL_SERVER_PORT = 47651  # Localhost TCP port (used where Unix sockets are unavailable)
+
+# Early commit on stable partial hypotheses
+# Short commands ("time", "open chrome") are dispatched as soon as the partial
+# result stops changing, instead of waiting for Vosk to endpoint the phrase.
+# Only applies with ENABLE_COMPOUND_COMMANDS = False: otherwise a pause after
+# "open chrome" would dispatch it before "... and notepad" is heard.
+ENABLE_EARLY_COMMIT = True
+EARLY_COMMIT_STABLE_BLOCKS = 3  # Unchanged 100 ms partials required before committing
+EARLY_COMMIT_MIN_PRIORITY = 50  # Only commands at or above this priority commit early
+
+# N-best rescoring
+# The recognizer returns several alternatives which are rescored against the
+# command registry and Urdu dictionaries, so the best *actionable* one wins.
+RECOGNITION_MAX_ALTERNATIVES = 5  # 0 = disable N-best (single best hypothesis)
+RESCORE_ACOUSTIC_WEIGHT = 0.4  # Share of the score from acoustic confidence (rest: registry fit)
+
+# Tiered recognition
+# The small model (VOSK_MODEL_PATH) handles every utterance; only free-form
+# parameters (YouTube queries, folder names) are re-decoded with the large
+# model, which is loaded on first use and unloaded when idle.
+ENABLE_TIERED_RECOGNITION = False  # Requires the large model: python vosk_setup.py --model large-en
+SLOT_MODEL_PATH = "vosk-model-en-us-0.22"  # Large English model (1.8 GB)
+SLOT_MODEL_IDLE_TIMEOUT = 300  # Seconds without free-form commands before the large model is unloaded
+
 # Multi-Language Support
-ENABLE_URDU_RECOGNITION = False  # Set to True to enable Urdu speech recognition
+ENABLE_URDU_RECOGNITION = False  # Set to True to decode every utterance with the Urdu model in parallel
 URDU_MODEL_PATH = "vosk-model-small-ur-0.3"  # Path to Urdu model (download separately)
 
 # ==================== SPEECH SETTINGS (Legacy - Kept for TTS) ====================
@@ -119,8 +168,10 @@ def find_chrome_path() -> str:
             return path
     return None
 
-# Detected Chrome path (None if not found)
-CHROME_PATH = find_chrome_path()
+# Chrome executable; None = use the one found by application discovery, or
+# find_chrome_path() on first use (app_discovery.chrome_path()), so importing
+# config never probes the disk
+CHROME_PATH = None
 
 # YouTube Configuration
 YOUTUBE_BASE_URL = "https://www.youtube.com/results?search_query="
@@ -178,6 +229,13 @@ WAKE_WORDS: List[str] = [
     "ok gideon",
 ]
 
+# Wake word gating (two-stage pipeline)
+# When enabled, a cheap grammar-restricted spotter listens for the wake words
+# above and only then opens a command window for the full recognizer.
+ENABLE_WAKE_WORD = False  # Set to True to require "gideon" before each command
+WAKE_WORD_COMMAND_WINDOW = 5  # Seconds the full recognizer stays open after the wake word
+WAKE_WORD_HANGOVER_BLOCKS = 5  # Blocks to keep decoding after energy drops (avoids clipping)
+
 # ==================== COMMAND ALIASES ====================
 # Alternative ways to invoke the same command
 COMMAND_ALIASES: Dict[str, List[str]] = {
@@ -211,10 +269,84 @@ RESPONSES = {
     "success": "Task completed successfully.",
     "cancelled": "Operation cancelled.",
     "confirm_request": "Are you sure? Say yes to confirm or no to cancel.",
+    "working_on_it": "Working on it.",
+    "command_timed_out": "Sorry, {command} is taking too long. I stopped it.",
     "you_are_welcome": "You're welcome!",
     "acknowledged": "Acknowledged.",
 }
 
+# ==================== INTENT RANKING ====================
+# Every command is scored against the utterance (TF-IDF over words and
+# character n-grams) instead of taking the first pattern whose keyword matches.
+ENABLE_INTENT_RANKER = True
+INTENT_MIN_CONFIDENCE = 0.5  # Below this the command is treated as unknown
+INTENT_PRIOR_WEIGHT = 0.1  # Ranking bonus for a priority-100 command (scaled by priority)
+INTENT_TOP_K = 3  # Candidates tried in turn when a parameter cannot be extracted
+
+# ==================== COMMAND EXECUTION ====================
+ENABLE_ASYNC_EXECUTION = True  # Run handlers on worker threads so Gideon keeps listening
+COMMAND_WORKERS = 2  # Commands that can run at the same time
+COMMAND_LATENCY_BUDGET = 1.5  # Seconds before Gideon says "working on it"
+COMMAND_DEADLINE = 30.0  # Default seconds a command may run before it is cancelled
+CANCEL_PHRASES = ["cancel", "cancel that", "stop that", "cancel command", "abort", "never mind"]
+
+# ==================== COMMAND DATA FILES ====================
+# JSON files that extend the built-in commands, aliases, applications, websites
+# and Roman Urdu commands (see registry_loader.py). Edits are picked up while
+# Gideon runs, without reloading the speech model.
+COMMAND_DATA_DIR = BASE_DIR / "data"  # *.json files, merged in file name order
+ENABLE_REGISTRY_RELOAD = True  # Watch the data files and reload them on change
+REGISTRY_RELOAD_INTERVAL = 2.0  # Seconds between checks for changed data files
+
+# ==================== REGISTRY ARTIFACT ====================
+# Built matcher structures saved to disk, keyed by a hash of the command
+# definitions, so startup loads them instead of rebuilding (see registry_artifact.py)
+ENABLE_REGISTRY_ARTIFACT = True
+REGISTRY_ARTIFACT_PATH = BASE_DIR / "cache" / "registry_index.pickle"
+
+# ==================== COMMAND PLUGINS ====================
+# Command packs described by a gideon_commands.json manifest. Handler code is
+# imported only when one of its commands first runs (see command_plugins.py).
+ENABLE_PLUGINS = True
+PLUGIN_DIR = BASE_DIR / "plugins"  # Local packs: plugins/<pack>/gideon_commands.json
+PLUGIN_ENTRY_POINT_GROUP = "gideon.command_packs"  # Installed packs name their package here
+
+# ==================== COMPOUND COMMANDS ====================
+# "open chrome and notepad then play music": parts joined by a parallel word
+# run at the same time, a sequential word waits for the parts before it.
+# Turns off early commit (see ENABLE_EARLY_COMMIT), so every command waits
+# for Vosk to endpoint the utterance.
+ENABLE_COMPOUND_COMMANDS = True
+COMPOUND_PARALLEL_WORDS = ["and", "aur", "also", "plus"]
+COMPOUND_SEQUENTIAL_WORDS = ["and then", "then", "after that", "phir", "uske baad", "us ke baad"]
+COMPOUND_MAX_PARTS = 4  # Longer utterances are treated as a single command
+
+# ==================== ENTITY INDEX ====================
+# Spoken names ("vs cold", "stack overflow website") resolved to known
+# applications, websites, folders and songs (see entity_index.py)
+ENTITY_MIN_SCORE = 0.6  # Similarity (0-1) a name needs to count as a match
+ENTITY_USAGE_WEIGHT = 0.05  # Score added per log(1 + uses), so frequent choices win close calls
+ENTITY_USAGE_PATH = BASE_DIR / "cache" / "entity_usage.json"
+ENTITY_FOLDER_DIRS = [DESKTOP_DIR, DOCUMENTS_DIR, DOWNLOADS_DIR, MUSIC_DIR]  # Folders inside these can be opened by name
+ENTITY_FILLER_WORDS = {  # Words said around a name ("the", "website") that are not part of it
+    "applications": ["the", "app", "application", "program"],
+    "websites": ["the", "website", "web site", "site", "page", "dot com"],
+    "folders": ["the", "my", "folder", "directory"],
+    "songs": ["the", "my", "song", "track"],
+}
+
+# ==================== APPLICATION DISCOVERY ====================
+# Installed applications found on PATH, in Linux .desktop entries and in the
+# Windows Start Menu, so "open <anything installed>" works (see app_discovery.py).
+# The index is saved to disk and rescanned in the background; only folders
+# whose modification time changed are listed again.
+ENABLE_APP_DISCOVERY = True
+APP_INDEX_PATH = BASE_DIR / "cache" / "app_index.json"
+APP_DISCOVERY_INTERVAL = 60.0  # Seconds between checks for installed/removed applications
+APP_DISCOVERY_BACKENDS = ["known_paths", "desktop_entries", "start_menu"]  # Earlier wins on a name clash
+# Add "path" to also run programs on PATH; they are never fuzzy-matched
+# ("reboot", "shutdown" live there) and need the exact name plus confirmation
+
 # ==================== MUSIC FILE EXTENSIONS ====================
 AUDIO_EXTENSIONS = [".mp3", ".wav", ".flac", ".m4a", ".aac", ".ogg", ".wma"]
 
@@ -245,6 +377,19 @@ DANGEROUS_OPERATIONS = [
 
 REQUIRE_CONFIRMATION = True  # Ask before executing dangerous operations
 
+# Confirmation answers shared by every yes/no prompt (phrase -> confirmed).
+# The fast confirmation grammar is built from these keys.
+CONFIRMATION_PHRASES = {
+    "yes": True, "yeah": True, "sure": True, "confirm": True, "do it": True,
+    "go ahead": True, "proceed": True, "ok": True, "okay": True, "affirmative": True,
+    "haan": True, "ji haan": True,
+    "no": False, "nope": False, "cancel": False, "don't": False, "stop": False,
+    "never mind": False, "nevermind": False, "negative": False,
+    "nahi": False, "nahin": False,
+}
+ENABLE_FAST_CONFIRMATION = True  # Grammar-restricted yes/no recognizer instead of a full listen
+CONFIRMATION_TRAILING_SILENCE = 0.3  # Seconds of quiet that end a yes/no answer
+
 # ==================== YOUTUBE SETTINGS ====================
 YOUTUBE_TRIGGERS = [
     "play",
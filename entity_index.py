@@ -0,0 +1,461 @@
+"""
+Gideon Entity Index
+===================
+Resolves spoken names to known applications, websites, folders and songs.
+
+Handlers used to look names up exactly ("vs cold" is not an application,
+"stack overflow website" is not a website) and chose music at random. Every
+catalog now has an EntityIndex that ranks known names against what was said:
+
+- Character trigrams of the name without spaces, kept as posting lists, so
+  "vs cold" -> "vs code" and "stackoverflow" -> "stack overflow" are found
+  with a few dict lookups
+- Phonetic keys (phonetic_index.py) for recognizer confusions ("cron")
+- Usage counts, persisted in config.ENTITY_USAGE_PATH, so the names used
+  most win close calls
+- Filler words ("the", "website", "folder") are dropped from the query
+
+Each catalog has a cheap signature (a generation counter bumped whenever a
+config table is replaced, the modification times of the folders it lists). A lookup compares it and, when
+it changed, adds and removes only the names that differ.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import json
+import math
+import heapq
+import logging
+import threading
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import config
+from app_discovery import get_app_discovery
+from phonetic_index import PhoneticIndex, edit_distance, max_edit_distance
+
+logger = logging.getLogger("Gideon.EntityIndex")
+
+# Similarity given to a name that sounds like the query but is spelled apart
+PHONETIC_SCORE = 0.7
+
+# Trigram matches ranked by spelling before the final scoring
+SHORTLIST_SIZE = 8
+
+# Trigram overlap (Dice) below which spelling is not compared at all
+SPELLING_MIN_DICE = 0.3
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Character trigrams of text without spaces, padded at both ends"""
+    padded = f" {text.replace(' ', '')} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EntityIndex:
+    """
+    Known names of one catalog with trigram and phonetic keys.
+    """
+
+    def __init__(self, kind: str, entities: Optional[Dict[str, Any]] = None, fillers: Iterable[str] = ()):
+        """
+        Build the index.
+
+        Args:
+            kind: Catalog name ("applications", "websites", ...)
+            entities: Name -> value (executable, URL, path)
+            fillers: Words around a name that are not part of it
+        """
+        self.kind = kind
+        self.entities: Dict[str, Any] = {}
+        self.fillers = sorted({" ".join(f.lower().split()) for f in fillers}, key=len, reverse=True)
+        self._grams: Dict[str, Set[str]] = {}
+        self._compact: Dict[str, str] = {}  # Name without spaces -> name ("notepad" for "note pad")
+        self._postings: Dict[str, Set[str]] = {}
+        self._phonetic = PhoneticIndex()
+        self._lock = threading.Lock()
+        if entities:
+            self.sync(entities)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def _add(self, name: str, value: Any) -> None:
+        grams = _trigrams(name)
+        self.entities[name] = value
+        self._grams[name] = grams
+        self._compact.setdefault(name.replace(" ", ""), name)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(name)
+        self._phonetic.add(name)
+
+    def _remove(self, name: str) -> None:
+        del self.entities[name]
+        compact = name.replace(" ", "")
+        if self._compact.get(compact) == name:
+            del self._compact[compact]
+        for gram in self._grams.pop(name):
+            names = self._postings[gram]
+            names.discard(name)
+            if not names:
+                del self._postings[gram]
+        self._phonetic.remove(name)
+
+    def sync(self, entities: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Make the index hold exactly these entities, touching only the changes.
+
+        Args:
+            entities: Name -> value
+
+        Returns:
+            (added, removed) counts
+        """
+        entities = {" ".join(name.lower().split()): value for name, value in entities.items()}
+        with self._lock:
+            removed = [name for name in self.entities if name not in entities]
+            for name in removed:
+                self._remove(name)
+
+            added = 0
+            for name, value in entities.items():
+                if name not in self.entities:
+                    self._add(name, value)
+                    added += 1
+                else:
+                    self.entities[name] = value
+        return added, len(removed)
+
+    def strip_fillers(self, text: str) -> str:
+        """Drop filler words from both ends of text ("the stack overflow website")"""
+        text = " ".join(text.lower().split())
+        changed = True
+        while changed:
+            changed = False
+            for filler in self.fillers:
+                if text.startswith(filler + " "):
+                    text, changed = text[len(filler) + 1:], True
+                elif text.endswith(" " + filler):
+                    text, changed = text[:-len(filler) - 1], True
+        return text
+
+    def search(self, text: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank the known names against what was said.
+
+        Args:
+            text: Name as recognized ("vs cold", "the stack overflow website")
+            limit: Most matches returned
+
+        Returns:
+            [(name, score), ...], best first; only names at or above
+            config.ENTITY_MIN_SCORE, with the usage bonus included
+        """
+        query = self.strip_fillers(text)
+        if not query:
+            return []
+
+        with self._lock:
+            exact = query if query in self.entities else self._compact.get(query.replace(" ", ""))
+            if exact is not None:
+                similarities = {exact: 1.0}
+            else:
+                similarities = self._similarities(query)
+
+        usage = get_usage()
+        ranked = [
+            (name, similarity + config.ENTITY_USAGE_WEIGHT * math.log1p(usage.count(self.kind, name)))
+            for name, similarity in similarities.items()
+            if similarity >= config.ENTITY_MIN_SCORE
+        ]
+        ranked.sort(key=lambda match: match[1], reverse=True)
+        return ranked[:limit]
+
+    def _similarities(self, query: str) -> Dict[str, float]:
+        """Spelling/sound similarity (0-1) of the likely names (lock held)"""
+        query_grams = _trigrams(query)
+        shared = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in query_grams))
+
+        dice = {name: 2 * count / (len(query_grams) + len(self._grams[name])) for name, count in shared.items()}
+        shortlist = heapq.nlargest(SHORTLIST_SIZE, dice, key=dice.get)
+
+        compact = query.replace(" ", "")
+        similarities: Dict[str, float] = {}
+        for name in shortlist:
+            name_compact = name.replace(" ", "")
+            longest = max(len(compact), len(name_compact))
+            # Few shared trigrams, or the length difference alone, rule out a close spelling
+            if (dice[name] < SPELLING_MIN_DICE
+                    or 1 - abs(len(compact) - len(name_compact)) / longest < config.ENTITY_MIN_SCORE):
+                similarities[name] = dice[name]
+                continue
+            spelling = 1 - edit_distance(compact, name_compact) / longest
+            similarities[name] = max(dice[name], spelling)
+
+        for name in self._phonetic.candidates(query):
+            name_compact = name.replace(" ", "")
+            if edit_distance(compact, name_compact) <= max_edit_distance(name_compact):
+                similarities[name] = max(similarities.get(name, 0.0), PHONETIC_SCORE)
+        return similarities
+
+    def best(self, text: str) -> Optional[Tuple[str, Any]]:
+        """
+        Resolve what was said to one entity.
+
+        Args:
+            text: Name as recognized
+
+        Returns:
+            (name, value) of the best match, or None
+        """
+        matches = self.search(text, limit=1)
+        if not matches:
+            return None
+        name = matches[0][0]
+        value = self.entities.get(name)
+        return (name, value) if value is not None else None
+
+
+# ==================== USAGE COUNTS ====================
+
+class EntityUsage:
+    """
+    How often each entity was used, persisted as JSON.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Load the counts.
+
+        Args:
+            path: JSON file ({"applications": {"chrome": 12}, ...})
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._counts: Dict[str, Dict[str, int]] = json.load(f)
+        except FileNotFoundError:
+            self._counts = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entity usage unreadable, starting over: {e}")
+            self._counts = {}
+
+    def count(self, kind: str, name: str) -> int:
+        """Times an entity was used"""
+        return self._counts.get(kind, {}).get(name, 0)
+
+    def record(self, kind: str, name: str) -> None:
+        """Count one use of an entity and save the counts"""
+        with self._lock:
+            counts = self._counts.setdefault(kind, {})
+            counts[name] = counts.get(name, 0) + 1
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_name(self.path.name + ".tmp")
+                with open(temporary, "w", encoding="utf-8") as f:
+                    json.dump(self._counts, f, indent=2)
+                os.replace(temporary, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save entity usage: {e}")
+
+
+_usage: Optional[EntityUsage] = None
+
+
+def get_usage() -> EntityUsage:
+    """Get the usage counts (loaded on first use)"""
+    global _usage
+    if _usage is None:
+        _usage = EntityUsage(config.ENTITY_USAGE_PATH)
+    return _usage
+
+
+# ==================== CATALOGS ====================
+
+def _list_folders() -> Dict[str, Path]:
+    """The folder directories themselves and the folders inside them"""
+    folders: Dict[str, Path] = {}
+    for directory in config.ENTITY_FOLDER_DIRS:
+        directory = Path(directory)
+        if not directory.is_dir():
+            continue
+        folders.setdefault(directory.name.lower(), directory)
+        try:
+            for child in directory.iterdir():
+                if child.is_dir() and not child.name.startswith("."):
+                    folders.setdefault(child.name.lower(), child)
+        except OSError as e:
+            logger.warning(f"Could not list {directory}: {e}")
+    return folders
+
+
+def _list_songs() -> Dict[str, Path]:
+    """Music files in the Music folder, by file name without extension"""
+    songs: Dict[str, Path] = {}
+    if not config.MUSIC_DIR.is_dir():
+        return songs
+    extensions = {ext.lower() for ext in config.AUDIO_EXTENSIONS}
+    try:
+        for path in config.MUSIC_DIR.iterdir():
+            if path.suffix.lower() in extensions and path.is_file():
+                songs.setdefault(path.stem.lower().replace("_", " "), path)
+    except OSError as e:
+        logger.warning(f"Could not list {config.MUSIC_DIR}: {e}")
+    return songs
+
+
+def _list_applications() -> Dict[str, Any]:
+    """Configured applications plus discovered ones (configured names win)"""
+    table: Dict[str, Any] = {}
+    if config.ENABLE_APP_DISCOVERY:
+        # PATH holds reboot, shutdown, kill...: keep them out of fuzzy matching
+        table.update((name, app) for name, app in get_app_discovery().apps.items() if app.source != "path")
+    table.update(config.APPLICATIONS)
+    return table
+
+
+def _applications_signature() -> Tuple[int, int]:
+    """Config table generation and discovery generation"""
+    discovered = get_app_discovery().generation if config.ENABLE_APP_DISCOVERY else 0
+    return _config_generation, discovered
+
+
+def _directory_signature(directories: Iterable[Path]) -> Tuple:
+    """Modification times of directories (changes when entries are added or removed)"""
+    signature = []
+    for directory in directories:
+        try:
+            signature.append(os.stat(directory).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class EntityCatalog:
+    """
+    Source of one entity index: what it contains and when that changed.
+    """
+
+    def __init__(self, kind: str, load: Callable[[], Dict[str, Any]], signature: Callable[[], Any]):
+        """
+        Initialize the catalog.
+
+        Args:
+            kind: Catalog name
+            load: Returns the current name -> value table
+            signature: Cheap value that changes whenever load() would
+        """
+        self.kind = kind
+        self.load = load
+        self.signature = signature
+        self.index = EntityIndex(kind, fillers=config.ENTITY_FILLER_WORDS.get(kind, ()))
+        self._synced_signature: Any = object()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self) -> EntityIndex:
+        """Sync the index if the catalog changed since the last lookup"""
+        signature = self.signature()
+        if signature != self._synced_signature:
+            with self._refresh_lock:
+                if signature != self._synced_signature:
+                    added, removed = self.index.sync(self.load())
+                    self._synced_signature = signature
+                    if added or removed:
+                        logger.info(f"Entity index '{self.kind}': +{added} -{removed} ({len(self.index)} names)")
+        return self.index
+
+
+_catalogs: Dict[str, EntityCatalog] = {}
+
+# Increases whenever config.APPLICATIONS or config.WEBSITES is replaced
+_config_generation = 0
+
+
+def config_tables_replaced() -> None:
+    """
+    Mark config.APPLICATIONS and config.WEBSITES as replaced, so their
+    indexes sync on the next lookup. Call after assigning new tables.
+    """
+    global _config_generation
+    _config_generation += 1
+
+
+def register_catalog(kind: str, load: Callable[[], Dict[str, Any]], signature: Callable[[], Any]) -> None:
+    """
+    Add (or replace) a catalog of entities.
+
+    Args:
+        kind: Catalog name used with get_entity_index() and resolve_entity()
+        load: Returns the current name -> value table
+        signature: Cheap value that changes whenever load() would
+    """
+    _catalogs[kind] = EntityCatalog(kind, load, signature)
+
+
+register_catalog("applications", _list_applications, _applications_signature)
+register_catalog("websites", lambda: config.WEBSITES, lambda: _config_generation)
+register_catalog("folders", _list_folders, lambda: _directory_signature(config.ENTITY_FOLDER_DIRS))
+register_catalog("songs", _list_songs, lambda: _directory_signature([config.MUSIC_DIR]))
+
+
+def get_entity_index(kind: str) -> EntityIndex:
+    """
+    Get the up-to-date index of a catalog.
+
+    Args:
+        kind: "applications", "websites", "folders", "songs" or a registered catalog
+
+    Returns:
+        EntityIndex
+    """
+    return _catalogs[kind].refresh()
+
+
+def resolve_entity(kind: str, text: str) -> Optional[Tuple[str, Any]]:
+    """
+    Resolve a spoken name to an entity of a catalog.
+
+    Args:
+        kind: Catalog name
+        text: Name as recognized ("vs cold")
+
+    Returns:
+        (name, value) such as ("vs code", "code"), or None
+    """
+    match = get_entity_index(kind).best(text)
+    if match is not None and match[0] != " ".join(text.lower().split()):
+        logger.info(f"Resolved '{text}' to {kind[:-1]} '{match[0]}'")
+    return match
+
+
+def resolve_best(kinds: Iterable[str], text: str) -> Optional[Tuple[str, str, Any]]:
+    """
+    Resolve a spoken name against several catalogs at once.
+
+    Args:
+        kinds: Catalog names; on equal scores the earlier catalog wins
+        text: Name as recognized ("stack overflow website")
+
+    Returns:
+        (kind, name, value) of the best match over all catalogs, or None
+    """
+    best: Optional[Tuple[float, str, str]] = None
+    for kind in kinds:
+        matches = get_entity_index(kind).search(text, limit=1)
+        if matches and (best is None or matches[0][1] > best[0]):
+            best = (matches[0][1], kind, matches[0][0])
+    if best is None:
+        return None
+
+    _, kind, name = best
+    value = get_entity_index(kind).entities.get(name)
+    return (kind, name, value) if value is not None else None
+
+
+def record_use(kind: str, name: str) -> None:
+    """Count a use of an entity so it ranks higher next time"""
+    get_usage().record(kind, name)
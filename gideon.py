@@ -14,6 +14,7 @@ Version: 1.0.0
 
 import logging
 import sys
+import time
 from typing import Optional
 
 # Fix Unicode encoding issues on Windows
@@ -27,10 +28,17 @@ if sys.platform == 'win32':
 
 import config
 import utils
+import app_discovery
 import commands
+import compound_commands
+import registry_loader
+import registry_artifact
 import scheduler
-import multilingual
-from audio_handler import VoskAudioHandler
+from audio_handler import VoskAudioHandler, set_audio_handler, get_slot_recognizer
+from audio_preprocessing import AudioPreprocessor
+from recognizer_worker import RecognizerWorker
+from command_executor import CommandExecutor, CommandJob
+from utterance import normalize_utterance
 
 # Initialize logger
 logger: Optional[logging.Logger] = None
@@ -38,6 +46,9 @@ logger: Optional[logging.Logger] = None
 # Global audio handler
 audio_handler: Optional[VoskAudioHandler] = None
 
+# Runs command handlers off the listen loop (None = run them inline)
+command_executor: Optional[CommandExecutor] = None
+
 
 def initialize_system() -> bool:
     """
@@ -46,7 +57,7 @@ def initialize_system() -> bool:
     Returns:
         True if initialization successful, False otherwise
     """
-    global logger, audio_handler
+    global logger, audio_handler, command_executor
 
     try:
         # Display startup banner
@@ -62,8 +73,44 @@ def initialize_system() -> bool:
             audio_handler = VoskAudioHandler(
                 model_path=config.VOSK_MODEL_PATH,
                 sample_rate=config.SAMPLE_RATE,
-                device=config.AUDIO_DEVICE_INDEX
+                device=config.AUDIO_DEVICE_INDEX,
+                max_alternatives=config.RECOGNITION_MAX_ALTERNATIVES,
+                native_rate=config.CAPTURE_AT_NATIVE_RATE,
+                out_of_process=config.RECOGNIZER_OUT_OF_PROCESS,
+                use_model_server=config.USE_MODEL_SERVER
             )
+            audio_handler.rescorer = commands.rescore_alternatives
+            if config.ENABLE_AUDIO_PREPROCESSING:
+                audio_handler.preprocessor = AudioPreprocessor(
+                    config.SAMPLE_RATE,
+                    noise_reduction=config.ENABLE_NOISE_REDUCTION,
+                    agc=config.ENABLE_AGC,
+                    target_rms=config.AGC_TARGET_RMS,
+                    cpu_budget=config.PREPROCESSING_CPU_BUDGET
+                )
+            set_audio_handler(audio_handler)  # Share one model with utils.listen_for_command
+            if config.ENABLE_TIERED_RECOGNITION:
+                audio_handler.slot_recognizer = get_slot_recognizer(
+                    config.SLOT_MODEL_PATH,
+                    sample_rate=config.SAMPLE_RATE,
+                    idle_timeout=config.SLOT_MODEL_IDLE_TIMEOUT
+                )
+                commands.set_slot_refiner(audio_handler.transcribe_slot)
+                print(f"✓ Tiered recognition: free-form slots use {config.SLOT_MODEL_PATH} (loaded on demand)")
+            if config.ENABLE_URDU_RECOGNITION:
+                try:
+                    urdu_worker = RecognizerWorker(
+                        config.URDU_MODEL_PATH, config.SAMPLE_RATE, name="ur",
+                        max_alternatives=audio_handler.max_alternatives  # Same confidence scale as English
+                    )
+                    urdu_worker.start()
+                    audio_handler.language_workers["ur"] = urdu_worker
+                    audio_handler.language_arbiter = commands.arbitrate_languages
+                    print(f"✓ Urdu recognizer running in parallel ({config.URDU_MODEL_PATH})")
+                except RuntimeError as e:
+                    # English-only recognition still works
+                    print(f"⚠ Urdu recognition unavailable: {e}")
+                    logger.warning(f"Urdu recognizer failed to start: {e}")
             print("✓ Vosk audio handler initialized (offline mode)")
             logger.info("Vosk audio handler loaded successfully")
         except FileNotFoundError as e:
@@ -91,6 +138,14 @@ def initialize_system() -> bool:
         print("✓ Microphone access confirmed")
         logger.info("Microphone validation successful")
 
+        if config.ENABLE_PERSISTENT_STREAM:
+            try:
+                audio_handler.start_input_stream(preroll_seconds=config.PREROLL_SECONDS)
+            except Exception as e:
+                # Fall back to opening a stream per listen
+                print(f"⚠ Persistent input stream unavailable: {e}")
+                logger.warning(f"Persistent input stream failed to start: {e}")
+
         # Initialize text-to-speech engine
         print("\n[3/5] Initializing text-to-speech engine...")
         try:
@@ -103,9 +158,36 @@ def initialize_system() -> bool:
 
         # Load command registry
         print("\n[4/5] Loading command registry...")
+        loaded = False
+        if registry_loader.list_sources():
+            try:
+                loaded, message = registry_loader.reload_registry()  # Also warms the index
+            except Exception as e:
+                message = str(e)
+                logger.error(f"Command data failed to load: {e}", exc_info=True)
+            if not loaded:
+                # A bad data file must not stop Gideon: keep the built-in commands
+                print(f"⚠ {message}")
+                print("⚠ Using the built-in commands")
+        if not loaded:
+            registry_artifact.load_or_build(commands.get_registry_index())
         total_commands = len(commands.COMMAND_REGISTRY)
         print(f"✓ Loaded {total_commands} command patterns")
         logger.info(f"Command registry loaded with {total_commands} patterns")
+        if config.ENABLE_REGISTRY_RELOAD:
+            registry_loader.start_watching()
+            print(f"✓ Watching {config.COMMAND_DATA_DIR} for command changes")
+        if config.ENABLE_APP_DISCOVERY:
+            discovery = app_discovery.start_discovery()
+            print(f"✓ {len(discovery.apps)} installed applications indexed (refreshing in the background)")
+        if config.ENABLE_ASYNC_EXECUTION:
+            command_executor = CommandExecutor(
+                workers=config.COMMAND_WORKERS,
+                latency_budget=config.COMMAND_LATENCY_BUDGET,
+                on_slow=announce_slow_command,
+                on_done=report_command_job
+            )
+            print(f"✓ Commands run in the background ({config.COMMAND_WORKERS} workers)")
 
         # Initialize task scheduler
         print("\n[5/5] Starting task scheduler...")
@@ -142,11 +224,35 @@ def startup_greeting() -> None:
     utils.speak(f"{time_greeting}!")
 
     print(f"\n💡 TIP: Say 'help' to see what I can do")
+    if config.ENABLE_WAKE_WORD:
+        print(f"👂 Wake word mode: say '{config.WAKE_WORDS[0]}' before each command")
     print(f"🛑 To stop me, say: 'shutdown gideon'\n")
     print("-" * 60)
     logger.info("Startup greeting completed")
 
 
+def report_command_result(success: bool, message: str) -> None:
+    """Log and print the outcome of a command"""
+    if success:
+        logger.info(f"Command executed successfully: {message}")
+        print(f"✓ {message}")
+    else:
+        logger.warning(f"Command failed: {message}")
+        print(f"⚠ {message}")
+
+
+def announce_slow_command(job: CommandJob) -> None:
+    """Tell the user a command is still running (latency budget exceeded)"""
+    utils.speak(config.RESPONSES["working_on_it"])
+
+
+def report_command_job(job: CommandJob) -> None:
+    """Report a command finished by the executor"""
+    if job.status == "timed_out":
+        utils.speak(config.RESPONSES["command_timed_out"].format(command=job.description.lower()))
+    report_command_result(*job.result)
+
+
 def main_loop() -> None:
     """
     Main infinite listening loop.
@@ -161,46 +267,74 @@ def main_loop() -> None:
 
     while True:  # ← INFINITE LOOP - Gideon always listens
         try:
+            # Let a running handler's question ("are you sure?") have the microphone
+            while utils.prompt_active():
+                time.sleep(0.1)
+            prompt_generation = utils.prompt_generation()
+
+            # Wake word gating: only the cheap spotter runs until "gideon" is heard
+            listen_timeout = config.RECOGNITION_TIMEOUT
+            if config.ENABLE_WAKE_WORD:
+                if not audio_handler.wait_for_wake_word():
+                    continue
+                print("👂 Yes? Listening for your command...")
+                listen_timeout = config.WAKE_WORD_COMMAND_WINDOW
+
             # Listen for voice command
-            command = utils.listen_with_retry()
+            early_commit = commands.is_early_commit_safe if config.ENABLE_EARLY_COMMIT else None
+            command = utils.listen_with_retry(timeout=listen_timeout, early_commit=early_commit)
 
             # Handle no input (timeout or silence)
             if command is None:
                 continue  # Keep listening
 
+            # The answer to a handler's prompt, not a new command
+            if utils.prompt_active() or utils.prompt_generation() != prompt_generation:
+                logger.info(f"Ignoring speech heard during a prompt: {command}")
+                continue
+
             command_count += 1
             logger.info(f"[Command #{command_count}] Received: {command}")
 
-            # Process multilingual command (translate if needed)
-            english_command, metadata = multilingual.process_multilingual_command(command)
+            # Normalize once: translation, wake word, aliases and shutdown check
+            utterance = normalize_utterance(command)
 
             # Display command
-            if metadata['was_translated'] == 'True':
-                print(f"\n🗣️  You said: \"{command}\" → \"{english_command}\"")
+            if utterance.was_translated:
+                print(f"\n🗣️  You said: \"{command}\" → \"{utterance.english}\"")
                 utils.speak("Samajh gaya")  # "I understood" in Urdu
             else:
                 print(f"\n🗣️  You said: \"{command}\"")
 
             # Check for shutdown command FIRST (highest priority)
-            # Check both original and translated command
-            if utils.check_for_shutdown(command) or utils.check_for_shutdown(english_command):
+            # (covers both the original and the translated command)
+            if utterance.is_shutdown:
                 logger.info("Shutdown command received")
                 print("\n" + "=" * 60)
                 print("SHUTDOWN INITIATED")
                 print("=" * 60)
+                if command_executor is not None:
+                    command_executor.shutdown()
                 commands.cmd_shutdown()
                 break  # ← ONLY exit point of the loop
 
-            # Execute the command (use translated English command)
-            success, message = commands.execute_command(english_command)
-
-            # Log result
-            if success:
-                logger.info(f"Command executed successfully: {message}")
-                print(f"✓ {message}")
+            # "Cancel that" stops the commands still running
+            if command_executor is not None and command_executor.running() and (
+                utils.check_for_cancel(utterance.canonical)
+            ):
+                cancelled = command_executor.cancel_all()
+                print(f"🛑 Cancelled {cancelled} running command(s)")
+                utils.speak(config.RESPONSES["cancelled"])
+                continue
+
+            # Execute the command (matching reuses the normalized utterance;
+            # "open chrome and notepad" resolves to a compound plan)
+            pattern, call = compound_commands.prepare(utterance)
+            if command_executor is None or pattern is None:
+                report_command_result(*call())
             else:
-                logger.warning(f"Command failed: {message}")
-                print(f"⚠ {message}")
+                # Matching ran here; the handler runs in the background
+                command_executor.submit(pattern.description, call, pattern.deadline)
 
             # Brief separator for readability
             print("-" * 60)
@@ -221,6 +355,7 @@ def main_loop() -> None:
             continue  # Keep the loop running even on errors
 
     # This point is only reached after shutdown command
+    audio_handler.close()
     logger.info(f"Gideon shutting down. Total commands processed: {command_count}")
     print(f"\n📊 Session Statistics:")
     print(f"   Commands processed: {command_count}")
@@ -11,9 +11,12 @@ from typing import Optional
 
 import config
 import utils
+import app_discovery
 import commands
+import compound_commands
+import registry_loader
 import scheduler
-import multilingual
+from utterance import normalize_utterance
 
 logger: Optional[logging.Logger] = None
 
@@ -40,6 +43,16 @@ def initialize_system_test_mode() -> bool:
             logger.warning(f"TTS initialization failed: {e}")
 
         print("\n[3/4] Loading command registry...")
+        if registry_loader.list_sources():
+            try:
+                loaded, message = registry_loader.reload_registry()
+            except Exception as e:
+                loaded, message = False, str(e)
+                logger.error(f"Command data failed to load: {e}", exc_info=True)
+            if not loaded:
+                print(f"⚠ {message} - using the built-in commands")
+        if config.ENABLE_APP_DISCOVERY:
+            app_discovery.start_discovery()
         total_commands = len(commands.COMMAND_REGISTRY)
         print(f"✓ Loaded {total_commands} command patterns")
         logger.info(f"Command registry loaded with {total_commands} patterns")
@@ -88,15 +101,15 @@ def test_mode_loop():
             command_count += 1
             logger.info(f"[Command #{command_count}] Text input: {command}")
 
-            # Process multilingual command
-            english_command, metadata = multilingual.process_multilingual_command(command)
+            # Normalize once (translation, wake word, aliases, shutdown check)
+            utterance = normalize_utterance(command)
 
             # Display translation if needed
-            if metadata['was_translated'] == 'True':
-                print(f"[Translation] '{command}' → '{english_command}'")
+            if utterance.was_translated:
+                print(f"[Translation] '{command}' → '{utterance.english}'")
 
             # Check for shutdown
-            if utils.check_for_shutdown(command) or utils.check_for_shutdown(english_command):
+            if utterance.is_shutdown:
                 logger.info("Shutdown command received")
                 print("\n" + "=" * 60)
                 print("SHUTDOWN INITIATED")
@@ -105,7 +118,8 @@ def test_mode_loop():
                 break
 
             # Execute command
-            success, message = commands.execute_command(english_command)
+            _, call = compound_commands.prepare(utterance)
+            success, message = call()
 
             # Display result
             if success:
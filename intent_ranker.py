@@ -0,0 +1,218 @@
+"""
+Gideon Intent Ranker
+====================
+Ranks every command pattern against an utterance and returns the best
+intents with a confidence score.
+
+Each registry keyword becomes a TF-IDF vector over three feature sets:
+- Word tokens ("w:open", "w:chrome")
+- Phonetic keys of each word ("p:KRN" for both "chrome" and "cron")
+- Character 2-3 grams of each word ("c: ch", "c:hro"), which tolerate
+  other recognizer slips
+
+A keyword's score combines two measures:
+- Coverage: the IDF-weighted share of the keyword's features present in the
+  utterance. It is 1.0 when the keyword occurs verbatim, however long the
+  utterance is.
+- Cosine similarity between the keyword and the whole utterance. This
+  favours the more specific keyword when several are fully covered.
+
+Both measures come from one matrix-vector product against a precomputed
+keyword matrix. A pattern's confidence is that of its best keyword. The
+pattern's priority is added as a small prior for ranking only.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import math
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from phonetic_index import phonetic_key
+
+logger = logging.getLogger("Gideon.IntentRanker")
+
+# Blend of the two similarity measures (sums to 1.0)
+COVERAGE_WEIGHT = 0.8
+COSINE_WEIGHT = 0.2
+
+# Character n-gram sizes taken from each padded word
+CHAR_NGRAM_SIZES = (2, 3)
+
+# Share of the feature weight given to word tokens and phonetic keys (the rest goes to character n-grams)
+TOKEN_WEIGHT = 0.5
+
+
+def extract_features(text: str) -> Counter:
+    """
+    Get token, phonetic key and character n-gram counts of a text.
+
+    Args:
+        text: Lowercased phrase
+
+    Returns:
+        Counter of feature name -> count
+    """
+    features: Counter = Counter()
+    for word in text.split():
+        features["w:" + word] += 1
+        key = phonetic_key(word)
+        if key:
+            features["p:" + key] += 1
+        padded = f" {word} "
+        for size in CHAR_NGRAM_SIZES:
+            for i in range(len(padded) - size + 1):
+                features["c:" + padded[i:i + size]] += 1
+    return features
+
+
+class IntentRanker:
+    """
+    TF-IDF intent ranking over all keywords of a set of command patterns.
+    """
+
+    def __init__(self, patterns: Sequence, prior_weight: float = 0.1):
+        """
+        Build the keyword matrix.
+
+        Args:
+            patterns: Objects with .keywords (list of phrases) and .priority (0-100)
+            prior_weight: Ranking bonus for a priority-100 pattern
+        """
+        self.patterns = list(patterns)
+        self.prior_weight = prior_weight
+
+        keyword_features: List[Counter] = []
+        keyword_owner: List[int] = []
+        for index, pattern in enumerate(self.patterns):
+            for keyword in pattern.keywords:
+                keyword_features.append(extract_features(keyword.lower()))
+                keyword_owner.append(index)
+
+        # Vocabulary and inverse document frequency over keywords
+        document_frequency: Counter = Counter()
+        for features in keyword_features:
+            document_frequency.update(features.keys())
+        self.vocabulary: Dict[str, int] = {feature: i for i, feature in enumerate(sorted(document_frequency))}
+        keyword_count = len(keyword_features)
+        self.idf = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for feature, count in document_frequency.items():
+            self.idf[self.vocabulary[feature]] = math.log((1 + keyword_count) / (1 + count)) + 1.0
+        self._token_columns = np.array([not f.startswith("c:") for f in sorted(document_frequency)])
+
+        # Per-keyword weighted TF-IDF rows: L1-normalized for coverage, L2 for cosine
+        vocabulary_size = len(self.vocabulary)
+        coverage = np.zeros((keyword_count, vocabulary_size), dtype=np.float32)
+        cosine = np.zeros((keyword_count, vocabulary_size), dtype=np.float32)
+        for row, features in enumerate(keyword_features):
+            weights = self._weigh(features)
+            coverage[row] = weights / max(weights.sum(), 1e-9)
+            cosine[row] = weights / max(np.linalg.norm(weights), 1e-9)
+
+        # One matrix for both measures: [coverage | cosine] @ [presence ; unit tf-idf]
+        self.matrix = np.hstack([COVERAGE_WEIGHT * coverage, COSINE_WEIGHT * cosine])
+
+        # Rows are grouped by pattern, so per-pattern maxima are a reduceat
+        self._keyword_owner = np.array(keyword_owner)
+        self._group_starts = np.flatnonzero(np.r_[True, self._keyword_owner[1:] != self._keyword_owner[:-1]]) \
+            if keyword_count else np.zeros(0, dtype=int)
+        self._group_patterns = self._keyword_owner[self._group_starts] if keyword_count else self._keyword_owner
+        self._priors = np.array(
+            [self.prior_weight * min(max(p.priority, 0), 100) / 100 for p in self.patterns],
+            dtype=np.float32
+        )
+
+        logger.info(f"Intent ranker built: {len(self.patterns)} intents, "
+                    f"{keyword_count} keywords, {vocabulary_size} features")
+
+    # Attributes that make up a built ranker (everything except the patterns)
+    _STATE_ATTRIBUTES = (
+        "prior_weight", "vocabulary", "idf", "_token_columns", "matrix",
+        "_keyword_owner", "_group_starts", "_group_patterns", "_priors",
+    )
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Get the built ranker as plain data (for registry_artifact).
+
+        Returns:
+            Picklable dict; patterns are not included
+        """
+        return {name: getattr(self, name) for name in self._STATE_ATTRIBUTES}
+
+    @classmethod
+    def from_state(cls, patterns: Sequence, state: Dict[str, Any]) -> "IntentRanker":
+        """
+        Restore a ranker from export_state() without rebuilding the matrix.
+
+        Args:
+            patterns: The same patterns, in the same order, the state was built from
+            state: Output of export_state()
+
+        Returns:
+            IntentRanker
+        """
+        ranker = cls.__new__(cls)
+        ranker.patterns = list(patterns)
+        for name in cls._STATE_ATTRIBUTES:
+            setattr(ranker, name, state[name])
+        return ranker
+
+    def _weigh(self, features: Counter) -> np.ndarray:
+        """TF-IDF vector of known features, split between token and character weight"""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for feature, count in features.items():
+            column = self.vocabulary.get(feature)
+            if column is not None:
+                vector[column] = (1 + math.log(count)) * self.idf[column]
+
+        token_mass = vector[self._token_columns].sum()
+        char_mass = vector[~self._token_columns].sum()
+        if token_mass > 0:
+            vector[self._token_columns] *= TOKEN_WEIGHT / token_mass
+        if char_mass > 0:
+            vector[~self._token_columns] *= (1 - TOKEN_WEIGHT) / char_mass
+        return vector
+
+    def score(self, utterance: str) -> np.ndarray:
+        """
+        Get the confidence of every pattern for an utterance.
+
+        Args:
+            utterance: Normalized command text
+
+        Returns:
+            Array of confidences in [0, 1], indexed like self.patterns
+        """
+        confidences = np.zeros(len(self.patterns), dtype=np.float32)
+        if not len(self._group_starts):
+            return confidences
+
+        features = extract_features(utterance.lower())
+        weights = self._weigh(features)
+        presence = (weights > 0).astype(np.float32)
+        unit = weights / max(np.linalg.norm(weights), 1e-9)
+
+        keyword_scores = self.matrix @ np.concatenate([presence, unit])
+        confidences[self._group_patterns] = np.maximum.reduceat(keyword_scores, self._group_starts)
+        return np.clip(confidences, 0.0, 1.0)
+
+    def rank(self, utterance: str, top_k: int = 3) -> List[Tuple[object, float]]:
+        """
+        Rank patterns for an utterance.
+
+        Args:
+            utterance: Normalized command text
+            top_k: Number of intents to return
+
+        Returns:
+            [(pattern, confidence), ...] best first; the priority prior affects
+            the order but not the reported confidence
+        """
+        confidences = self.score(utterance)
+        ranking = confidences + self._priors
+        order = np.argsort(-ranking, kind="stable")[:top_k]
+        return [(self.patterns[i], float(confidences[i])) for i in order]
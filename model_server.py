@@ -0,0 +1,455 @@
+"""
+Gideon Model Server
+===================
+Long-lived local process that loads Vosk models once and serves recognition
+sessions to any number of Gideon front-ends.
+
+Loading a model from disk is most of Gideon's startup time. With the server
+running, a front-end attaches in milliseconds and every front-end shares the
+same in-memory copy of each model. Each connection is a session with its own
+recognizers; sessions run on separate threads, and Vosk releases the GIL while
+decoding, so concurrent front-ends decode in parallel.
+
+Transport: Unix domain socket (TCP on localhost where AF_UNIX is unavailable,
+e.g. Windows). Each frame is two big-endian uint32 lengths (JSON header,
+binary payload) followed by the header and payload. Requests use the same
+messages as the out-of-process worker (see recognizer_worker.py), with audio
+sent as the payload of "accept":
+    ["create", rid, model_path, sample_rate, grammar, words, max_alternatives] -> null
+    ["accept", rid, nbytes] + audio -> bool
+    ["result" | "partial" | "final", rid] -> JSON string
+    ["reset" | "close", rid] -> null
+Errors are returned as {"error": "message"}.
+
+Usage:
+    python model_server.py                       # Serve config.VOSK_MODEL_PATH
+    python model_server.py --models small-en urdu --model-dir models/
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import logging
+import itertools
+import threading
+import socketserver
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fix Unicode encoding issues on Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8')
+
+import config
+
+logger = logging.getLogger("Gideon.ModelServer")
+
+# Frame header: JSON length, payload length
+_FRAME = struct.Struct(">II")
+
+# Seconds between reconnect attempts while the server is down (doubles per failure)
+RECONNECT_MIN_BACKOFF = 0.5
+RECONNECT_MAX_BACKOFF = 10.0
+
+
+# ==================== FRAMING ====================
+
+def default_address() -> str:
+    """
+    Get the configured server address.
+
+    Returns:
+        Unix socket path, or "127.0.0.1:port" where AF_UNIX is unavailable
+    """
+    if hasattr(socket, "AF_UNIX"):
+        return config.MODEL_SERVER_SOCKET
+    return f"127.0.0.1:{config.MODEL_SERVER_PORT}"
+
+
+def _is_tcp(address: str) -> bool:
+    """True for "host:port" addresses, False for socket paths"""
+    host, _, port = address.rpartition(":")
+    return bool(host) and port.isdigit()
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes, raising ConnectionError if the peer closes"""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, header: Any, payload: bytes = b"") -> None:
+    """Send one JSON header with an optional binary payload"""
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(encoded), len(payload)) + encoded + payload)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Any, bytes]:
+    """Receive one frame as (header, payload)"""
+    header_size, payload_size = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, header_size).decode("utf-8"))
+    payload = _recv_exact(sock, payload_size) if payload_size else b""
+    return header, payload
+
+
+# ==================== SERVER ====================
+
+class _SessionHandler(socketserver.BaseRequestHandler):
+    """One front-end connection: owns its recognizers, shares the server's models"""
+
+    def handle(self) -> None:
+        server: "ModelServer" = self.server.model_server
+        recognizers: Dict[int, Any] = {}
+        server.session_opened()
+
+        try:
+            while True:
+                try:
+                    message, payload = recv_frame(self.request)
+                except (ConnectionError, OSError):
+                    break
+
+                try:
+                    reply = self._dispatch(message, payload, recognizers)
+                except Exception as e:
+                    logger.error(f"Request {message[0]!r} failed: {e}")
+                    reply = {"error": str(e)}
+
+                send_frame(self.request, reply)
+        finally:
+            server.session_closed()
+
+    def _dispatch(self, message: List, payload: bytes, recognizers: Dict[int, Any]) -> Any:
+        """Run one request against this session's recognizers"""
+        import vosk
+
+        command, recognizer_id = message[0], message[1]
+
+        if command == "create":
+            _, _, model_path, sample_rate, grammar, words, max_alternatives = message
+            model = self.server.model_server.get_model(model_path)
+            if grammar:
+                recognizer = vosk.KaldiRecognizer(model, sample_rate, grammar)
+            else:
+                recognizer = vosk.KaldiRecognizer(model, sample_rate)
+            recognizer.SetWords(words)
+            if max_alternatives > 0:
+                recognizer.SetMaxAlternatives(max_alternatives)
+            recognizers[recognizer_id] = recognizer
+            return None
+
+        if command == "close":
+            recognizers.pop(recognizer_id, None)
+            return None
+
+        recognizer = recognizers[recognizer_id]
+        if command == "accept":
+            return recognizer.AcceptWaveform(payload)
+        if command == "result":
+            return recognizer.Result()
+        if command == "partial":
+            return recognizer.PartialResult()
+        if command == "final":
+            return recognizer.FinalResult()
+        if command == "reset":
+            recognizer.Reset()
+            return None
+
+        raise ValueError(f"unknown command: {command}")
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    _UnixServerBase = socketserver.ThreadingUnixStreamServer
+else:
+    _UnixServerBase = socketserver.ThreadingTCPServer
+
+
+class ModelServer:
+    """
+    Model cache plus a threaded socket server, one thread per front-end session.
+    """
+
+    def __init__(self, address: Optional[str] = None):
+        """
+        Initialize the server (call preload() and serve_forever()).
+
+        Args:
+            address: Unix socket path or "host:port" (default: default_address())
+        """
+        self.address = address or default_address()
+        self._models: Dict[str, Any] = {}
+        self._models_lock = threading.Lock()
+        self._sessions = 0
+        self._sessions_lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+
+    def get_model(self, model_path: str):
+        """
+        Get a loaded model, loading it on first request.
+
+        Args:
+            model_path: Absolute path to the model directory
+
+        Returns:
+            Shared vosk.Model instance
+        """
+        import vosk
+
+        key = str(Path(model_path).resolve())
+        with self._models_lock:
+            if key not in self._models:
+                if not Path(key).exists():
+                    raise FileNotFoundError(f"Vosk model not found at: {key}")
+                load_start = time.perf_counter()
+                self._models[key] = vosk.Model(key)
+                print(f"✓ Loaded {Path(key).name} in {time.perf_counter() - load_start:.1f} s")
+            return self._models[key]
+
+    def preload(self, model_paths: List[Path]) -> None:
+        """Load models before accepting connections"""
+        for model_path in model_paths:
+            self.get_model(str(model_path))
+
+    def session_opened(self) -> None:
+        with self._sessions_lock:
+            self._sessions += 1
+            logger.info(f"Front-end attached ({self._sessions} active)")
+
+    def session_closed(self) -> None:
+        with self._sessions_lock:
+            self._sessions -= 1
+            logger.info(f"Front-end detached ({self._sessions} active)")
+
+    def serve_forever(self) -> None:
+        """Accept front-end sessions until interrupted"""
+        self._server = self._create_server()
+        self._server.model_server = self  # Reached by session handlers via self.server
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if not _is_tcp(self.address) and os.path.exists(self.address):
+                os.unlink(self.address)
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() from another thread"""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _create_server(self) -> socketserver.BaseServer:
+        """Bind the Unix socket (or localhost TCP port)"""
+        if _is_tcp(self.address):
+            host, _, port = self.address.rpartition(":")
+            server = socketserver.ThreadingTCPServer((host, int(port)), _SessionHandler)
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)  # Stale socket from a previous run
+            server = _UnixServerBase(self.address, _SessionHandler)
+            os.chmod(self.address, 0o600)  # Only this user's front-ends may attach
+        server.daemon_threads = True
+        return server
+
+
+# ==================== CLIENT (FRONT-END SIDE) ====================
+
+class ServerModel:
+    """
+    A model hosted by a running ModelServer.
+
+    Used in place of vosk.Model; recognizers are created with
+    recognizer_worker.RemoteRecognizer. If the server restarts, the session
+    reconnects and recreates its recognizers on the next request.
+    """
+
+    def __init__(self, model_path: str, address: Optional[str] = None, timeout: float = 5.0):
+        """
+        Attach to the model server.
+
+        Args:
+            model_path: Model directory (resolved to an absolute path for the server)
+            address: Server address (default: default_address())
+            timeout: Seconds to wait when connecting
+
+        Raises:
+            ConnectionError: If no server is listening
+        """
+        self.model_path = str(Path(model_path).resolve())
+        self.address = address or default_address()
+        self.timeout = timeout
+        self.reconnects = 0
+        self._lock = threading.Lock()
+        self._recognizers: Dict[int, Any] = {}
+        self._ids = itertools.count(1)
+        self._sock: Optional[socket.socket] = None
+        self._backoff = RECONNECT_MIN_BACKOFF
+        self._retry_at = 0.0  # time.monotonic() before which no reconnect is attempted
+        self._connect()
+
+    def close(self) -> None:
+        """Detach from the server (the model stays loaded there)"""
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+    def _connect(self) -> None:
+        """Open the session socket"""
+        try:
+            if _is_tcp(self.address):
+                host, _, port = self.address.rpartition(":")
+                sock = socket.create_connection((host, int(port)), timeout=self.timeout)
+            else:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                sock.connect(self.address)
+        except OSError as e:
+            raise ConnectionError(f"No model server at {self.address}: {e}")
+
+        sock.settimeout(None)
+        self._sock = sock
+        logger.info(f"Attached to model server at {self.address}")
+
+    def _reconnect(self) -> bool:
+        """
+        Reconnect after the server went away and recreate open recognizers.
+
+        A failed attempt is not retried until the backoff has passed
+        (doubling up to RECONNECT_MAX_BACKOFF), so a stopped server costs the
+        listen loop nothing.
+
+        Returns:
+            True if the session is connected again
+        """
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if time.monotonic() < self._retry_at:
+            return False
+
+        self.reconnects += 1
+        logger.warning(f"Model server connection lost, reconnecting (#{self.reconnects})")
+        try:
+            self._connect()
+            for recognizer in self._recognizers.values():
+                self._request(recognizer._create_message())
+        except (ConnectionError, OSError, RuntimeError) as e:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+            self._retry_at = time.monotonic() + self._backoff
+            logger.warning(f"Model server reconnect failed, retrying in {self._backoff:.1f} s: {e}")
+            self._backoff = min(self._backoff * 2, RECONNECT_MAX_BACKOFF)
+            return False
+
+        self._backoff = RECONNECT_MIN_BACKOFF
+        return True
+
+    def _register(self, recognizer) -> int:
+        """Assign a session-local id to a new recognizer"""
+        recognizer_id = next(self._ids)
+        self._recognizers[recognizer_id] = recognizer
+        return recognizer_id
+
+    def _request(self, message: tuple, audio: Optional[bytes] = None) -> Any:
+        """Send one request and return the reply (raises on connection loss)"""
+        if message[0] == "create":
+            # The server needs to know which model the recognizer belongs to
+            message = message[:2] + (self.model_path,) + message[2:]
+        send_frame(self._sock, list(message), audio or b"")
+        reply, _ = recv_frame(self._sock)
+        if isinstance(reply, dict) and "error" in reply:
+            raise RuntimeError(f"Model server error: {reply['error']}")
+        return reply
+
+    def _call(self, message: tuple, audio: Optional[bytes] = None, default: Any = None) -> Any:
+        """
+        Send one request, reconnecting once if the server went away.
+
+        Returns:
+            The server's reply, or default if the request was lost
+        """
+        with self._lock:
+            if self._sock is None and not self._reconnect():
+                return default
+            try:
+                return self._request(message, audio)
+            except (ConnectionError, OSError):
+                self._reconnect()
+                return default
+            except RuntimeError as e:
+                # The server answered with an error; the session is still fine
+                logger.warning(str(e))
+                return default
+
+
+# ==================== COMMAND LINE ====================
+
+def main():
+    """Main entry point"""
+    import argparse
+    from vosk_setup import MODELS, resolve_model_path
+
+    parser = argparse.ArgumentParser(
+        description="Serve preloaded Vosk models to Gideon front-ends",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python model_server.py
+  python model_server.py --models small-en urdu
+  python model_server.py --address /tmp/gideon-model.sock --model-dir models/
+
+Then set USE_MODEL_SERVER = True in config.py and start gideon.py.
+        """
+    )
+
+    parser.add_argument(
+        '--models',
+        nargs='+',
+        default=[config.VOSK_MODEL_PATH],
+        help=f"Model keys ({', '.join(MODELS.keys())}) or model directories to preload"
+    )
+    parser.add_argument('--model-dir', default='.', help='Directory containing downloaded models')
+    parser.add_argument('--address', help=f'Socket path or host:port (default: {default_address()})')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=config.LOG_FORMAT)
+
+    import vosk
+    vosk.SetLogLevel(-1)
+
+    server = ModelServer(args.address)
+    try:
+        server.preload([resolve_model_path(model, args.model_dir) for model in args.models])
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        print("   Run: python vosk_setup.py")
+        sys.exit(1)
+
+    print(f"\n🚀 Model server listening on {server.address}")
+    print("   Press Ctrl+C to stop\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Model server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -147,6 +147,120 @@ ALL_URDU_COMMANDS = {
 }
 
 
+# ==================== URDU SCRIPT TRANSLITERATION ====================
+# The Vosk Urdu model outputs Urdu (Perso-Arabic) script, while the command
+# tables above are Roman Urdu. This maps the command vocabulary word by word
+# (multi-word spellings first) so Urdu-model results can be resolved too.
+
+# Phrase-level translation order (longer phrases first), sorted once at import
+URDU_PHRASES_LONGEST_FIRST = sorted(ALL_URDU_COMMANDS.items(), key=lambda x: len(x[0]), reverse=True)
+
+URDU_SCRIPT_TO_ROMAN = {
+    # Multi-word spellings
+    "نوٹ پیڈ": "notepad",
+    "ڈاؤن لوڈز": "downloads",
+    "ڈاؤن لوڈ": "downloads",
+    "یو ٹیوب": "youtube",
+    "السلام علیکم": "assalam o alaikum",
+
+    # Verbs
+    "کھولو": "kholo",
+    "کھولیں": "kholo",
+    "چلاؤ": "chalao",
+    "چلاو": "chalao",
+    "چلائیں": "chalao",
+    "بجاؤ": "bajao",
+    "بجاو": "bajao",
+    "بناؤ": "banao",
+    "بناو": "banao",
+    "بتاؤ": "batao",
+    "بتاو": "batao",
+    "بتائیں": "batao",
+    "دکھاؤ": "dikhaao",
+    "کرو": "karo",
+    "کریں": "karo",
+    "جاؤ": "jao",
+    "ہو": "ho",
+    "ہے": "hai",
+    "چاہیے": "chahiye",
+    "گیا": "gaya",
+    "تھک": "thak",
+
+    # Nouns and other words
+    "بند": "band",
+    "وقت": "waqt",
+    "ٹائم": "time",
+    "تاریخ": "tarikh",
+    "ڈیٹ": "date",
+    "آج": "aaj",
+    "کیا": "kya",
+    "کی": "ki",
+    "کا": "ka",
+    "پر": "par",
+    "مدد": "madad",
+    "کام": "kaam",
+    "شروع": "shuru",
+    "ختم": "khatam",
+    "دن": "din",
+    "نیا": "naya",
+    "فولڈر": "folder",
+    "گانا": "gaana",
+    "میوزک": "music",
+    "ویڈیو": "video",
+    "یوٹیوب": "youtube",
+    "کروم": "chrome",
+    "گوگل": "google",
+    "کیلکولیٹر": "calculator",
+    "صاف": "saaf",
+    "آرام": "aaram",
+    "بریک": "break",
+    "ہاں": "haan",
+    "نہیں": "nahi",
+    "ٹھیک": "theek",
+    "سلام": "salam",
+    "شکریہ": "shukriya",
+    "خدا": "khuda",
+    "اللہ": "allah",
+    "حافظ": "hafiz",
+    "گیڈین": "gideon",
+    "گیڈیون": "gideon",
+}
+
+# Unicode block of the Arabic script (used by Urdu)
+_ARABIC_SCRIPT = re.compile(r"[\u0600-\u06FF]")
+
+
+def romanize_urdu(text: str) -> str:
+    """
+    Transliterate Urdu-script command text to Roman Urdu.
+
+    Args:
+        text: Recognizer output (Urdu script, Roman Urdu or English)
+
+    Returns:
+        Roman Urdu text; unknown Urdu-script words are kept unchanged
+    """
+    if not _ARABIC_SCRIPT.search(text):
+        return text
+
+    words = text.split()
+    romanized = []
+    i = 0
+    while i < len(words):
+        # Longest spelling first ("نوٹ پیڈ" before "نوٹ")
+        for length in (2, 1):
+            phrase = " ".join(words[i:i + length])
+            if phrase in URDU_SCRIPT_TO_ROMAN:
+                romanized.append(URDU_SCRIPT_TO_ROMAN[phrase])
+                i += length
+                break
+        else:
+            romanized.append(words[i])
+            i += 1
+
+    return " ".join(romanized)
+
+
 # ==================== URDU RESPONSE TEMPLATES ====================
 
 RESPONSES_URDU = {
@@ -250,9 +364,7 @@ def translate_urdu_to_english(command: str) -> Tuple[str, bool]:
         return translated_command, was_translated
 
     # Check for phrase-level matches (longer phrases first)
-    sorted_phrases = sorted(ALL_URDU_COMMANDS.items(), key=lambda x: len(x[0]), reverse=True)
-
-    for urdu_phrase, english_phrase in sorted_phrases:
+    for urdu_phrase, english_phrase in URDU_PHRASES_LONGEST_FIRST:
         if urdu_phrase in translated_command:
             translated_command = translated_command.replace(urdu_phrase, english_phrase)
             was_translated = True
@@ -370,6 +482,24 @@ def process_multilingual_command(command: str) -> Tuple[str, Dict[str, str]]:
 
 # ==================== UTILITY FUNCTIONS ====================
 
+def set_urdu_commands(commands: Dict[str, str]) -> None:
+    """
+    Replace the Roman Urdu command dictionary (used by registry reloads).
+
+    The phrase order is computed before anything is replaced, so a
+    translation running at the same time sees either the old or the new table.
+
+    Args:
+        commands: Roman Urdu phrase -> English command
+    """
+    global ALL_URDU_COMMANDS, URDU_PHRASES_LONGEST_FIRST
+
+    phrases = sorted(commands.items(), key=lambda x: len(x[0]), reverse=True)
+    ALL_URDU_COMMANDS = commands
+    URDU_PHRASES_LONGEST_FIRST = phrases
+    logger.info(f"Roman Urdu commands updated: {len(commands)} phrases")
+
+
 def get_supported_languages() -> List[str]:
     """Get list of supported languages"""
     return ["English", "Roman Urdu"]
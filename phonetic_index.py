@@ -0,0 +1,200 @@
+"""
+Gideon Phonetic Index
+=====================
+Sound-alike lookup for recognizer misspellings.
+
+Vosk mistakes are phonetic ("chrome" -> "cron", "notepad" -> "note pad"),
+which plain edit distance scores poorly. This module provides:
+
+- phonetic_key(): a compact key tuned to those confusions (voiced and
+  unvoiced consonants merge, m/n merge, vowels drop after the first letter)
+- PhoneticIndex: key -> known names, so candidates are found with one dict
+  lookup and edit distance only ranks the handful that share the key
+- merge_compounds(): joins tokens the recognizer split ("you tube",
+  "get hub") back into known words
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Multi-letter spellings rewritten before letters are mapped (order matters)
+_DIGRAPHS = [
+    ("tch", "x"), ("sch", "sk"), ("chr", "kr"), ("ch", "x"), ("sh", "x"),
+    ("ph", "f"), ("gh", ""), ("ck", "k"), ("th", "t"), ("wh", "w"),
+    ("qu", "kw"), ("dg", "j"), ("x", "ks"),
+]
+_SILENT_START = [("kn", "n"), ("wr", "r"), ("ps", "s")]
+
+# Letter -> key symbol; voiced/unvoiced pairs and nasals share a symbol
+_LETTER_KEYS = {
+    "b": "P", "p": "P", "d": "T", "t": "T", "g": "K", "k": "K", "q": "K",
+    "v": "F", "f": "F", "z": "S", "s": "S", "m": "N", "n": "N",
+    "l": "L", "r": "R", "j": "J", "x": "X",
+}
+_VOWELS = set("aeiouy")
+
+_NON_LETTERS = re.compile(r"[^a-z]")
+
+
+@lru_cache(maxsize=4096)
+def phonetic_key(text: str) -> str:
+    """
+    Compute the phonetic key of a word or phrase (spaces are ignored).
+
+    Args:
+        text: Word or phrase
+
+    Returns:
+        Key such as "KRN" for both "chrome" and "cron" ("" for no letters)
+    """
+    word = _NON_LETTERS.sub("", text.lower())
+    if not word:
+        return ""
+
+    for start, replacement in _SILENT_START:
+        if word.startswith(start):
+            word = replacement + word[len(start):]
+    for digraph, replacement in _DIGRAPHS:
+        word = word.replace(digraph, replacement)
+    if not word:
+        return ""
+
+    symbols = []
+    for i, letter in enumerate(word):
+        if letter == "c":
+            symbol = "S" if i + 1 < len(word) and word[i + 1] in "eiy" else "K"
+        elif letter in _VOWELS or letter in "hw":
+            symbol = ("A" if letter in _VOWELS else letter.upper()) if i == 0 else ""
+        else:
+            symbol = _LETTER_KEYS.get(letter, "")
+        if symbol and (not symbols or symbols[-1] != symbol):
+            symbols.append(symbol)
+
+    return "".join(symbols)
+
+
+def edit_distance(first: str, second: str) -> int:
+    """Levenshtein distance between two strings"""
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, a in enumerate(first):
+        current = [i + 1]
+        for j, b in enumerate(second):
+            current.append(min(previous[j + 1] + 1, current[j] + 1, previous[j] + (a != b)))
+        previous = current
+    return previous[-1]
+
+
+def max_edit_distance(word: str) -> int:
+    """Largest spelling difference accepted between sound-alike words"""
+    return max(2, len(word) // 2)
+
+
+class PhoneticIndex:
+    """
+    Known names bucketed by phonetic key.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Build the index.
+
+        Args:
+            names: Known words or phrases (e.g. keywords, application names)
+        """
+        self._buckets: Dict[str, List[str]] = {}
+        self.names: Set[str] = set()
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        """Add a known word or phrase"""
+        name = " ".join(name.lower().split())
+        key = phonetic_key(name)
+        if not key or name in self.names:
+            return
+        self.names.add(name)
+        self._buckets.setdefault(key, []).append(name)
+
+    def remove(self, name: str) -> None:
+        """Forget a known word or phrase"""
+        name = " ".join(name.lower().split())
+        if name not in self.names:
+            return
+        self.names.discard(name)
+        key = phonetic_key(name)
+        bucket = self._buckets[key]
+        bucket.remove(name)
+        if not bucket:
+            del self._buckets[key]
+
+    def candidates(self, text: str) -> List[str]:
+        """Known names sharing the phonetic key of text (one dict lookup)"""
+        return self._buckets.get(phonetic_key(text), [])
+
+    def best_match(self, text: str) -> Optional[Tuple[str, int]]:
+        """
+        Find the known name that text most likely is.
+
+        Candidates come from the phonetic key; edit distance (spaces ignored)
+        only ranks them and rejects ones spelled too differently.
+
+        Args:
+            text: Word or phrase as recognized
+
+        Returns:
+            (name, distance) or None if nothing sounds alike
+        """
+        text = " ".join(text.lower().split())
+        if text in self.names:
+            return text, 0
+
+        compact = text.replace(" ", "")
+        best: Optional[Tuple[str, int]] = None
+        for name in self.candidates(text):
+            distance = edit_distance(compact, name.replace(" ", ""))
+            if distance <= max_edit_distance(name.replace(" ", "")) and (best is None or distance < best[1]):
+                best = (name, distance)
+        return best
+
+
+def merge_compounds(tokens: List[str], index: PhoneticIndex, max_parts: int = 3) -> List[str]:
+    """
+    Join runs of tokens that together form one known word.
+
+    "note pad" -> "notepad", "you tube" -> "youtube", "get hub" -> "github".
+    Runs that are already a known phrase ("vs code") or made only of known
+    words ("recycle bin", even though "recyclebin" is known) are left alone. Merges
+    are stricter than best_match() (known words of 5+ letters, nearly the
+    same spelling) so pairs of short words like "go to" never merge.
+
+    Args:
+        tokens: Recognized words
+        index: Known names
+        max_parts: Longest run of tokens considered
+
+    Returns:
+        Token list with compounds merged
+    """
+    merged: List[str] = []
+    i = 0
+    while i < len(tokens):
+        for size in range(min(max_parts, len(tokens) - i), 1, -1):
+            window = tokens[i:i + size]
+            if " ".join(window) in index.names or all(token in index.names for token in window):
+                continue
+            match = index.best_match("".join(window))
+            if match is None or " " in match[0] or len(match[0]) < 5:
+                continue
+            if match[1] <= max(1, len(match[0]) // 4):
+                merged.append(match[0])
+                i += size
+                break
+        else:
+            merged.append(tokens[i])
+            i += 1
+    return merged
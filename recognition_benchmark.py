@@ -0,0 +1,350 @@
+"""
+Gideon Recognition Benchmark
+============================
+Measures recognition speed and accuracy by replaying labeled WAV files
+through VoskAudioHandler - the same code path as the live microphone.
+
+Reports per model:
+- Real-time factor (decode time / audio duration)
+- Decode latency per utterance (mean, p50, p95)
+- Word error rate against the reference transcript
+- Command-resolution accuracy against the command registry
+
+Corpus format (JSONL manifest, one utterance per line, paths relative to it):
+    {"audio": "time_01.wav", "text": "what time is it", "command": "Tell current time"}
+
+"command" is the expected CommandPattern description and is optional; when
+omitted, the command the reference text resolves to is expected.
+
+Usage:
+    python recognition_benchmark.py --corpus fixtures/manifest.jsonl
+    python recognition_benchmark.py --corpus fixtures/manifest.jsonl --models small-en large-en urdu
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Fix Unicode encoding issues on Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8')
+
+import config
+import commands
+import multilingual
+from audio_handler import VoskAudioHandler, read_wav_int16
+from audio_preprocessing import AudioPreprocessor
+from vosk_setup import MODELS, resolve_model_path
+
+logger = logging.getLogger("Gideon.Benchmark")
+
+
+# ==================== METRICS ====================
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Calculate word error rate (substitutions + deletions + insertions) / reference words.
+
+    Args:
+        reference: Ground-truth transcript
+        hypothesis: Recognized text
+
+    Returns:
+        WER (0.0 = perfect; can exceed 1.0 with many insertions)
+    """
+    ref_words = reference.lower().split()
+    hyp_words = hypothesis.lower().split()
+
+    if not ref_words:
+        return 0.0 if not hyp_words else 1.0
+
+    previous_row = list(range(len(hyp_words) + 1))
+    for i, ref_word in enumerate(ref_words, 1):
+        current_row = [i]
+        for j, hyp_word in enumerate(hyp_words, 1):
+            current_row.append(min(
+                previous_row[j] + 1,  # Deletion
+                current_row[j - 1] + 1,  # Insertion
+                previous_row[j - 1] + (ref_word != hyp_word)  # Substitution
+            ))
+        previous_row = current_row
+
+    return previous_row[-1] / len(ref_words)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def resolve_command(text: str) -> Optional[str]:
+    """
+    Resolve text to the description of the command Gideon would run.
+
+    Args:
+        text: Recognized or reference text (English or Roman Urdu)
+
+    Returns:
+        CommandPattern description, or None if nothing matches
+    """
+    if not text:
+        return None
+    english_command, _ = multilingual.process_multilingual_command(text)
+    pattern = commands.find_matching_pattern(english_command)
+    return pattern.description if pattern else None
+
+
+# ==================== CORPUS ====================
+
+def load_corpus(manifest_path: Path) -> List[Dict]:
+    """
+    Load a labeled fixture corpus.
+
+    Args:
+        manifest_path: JSONL manifest file
+
+    Returns:
+        List of utterance dicts with absolute "audio" paths
+    """
+    manifest_path = Path(manifest_path)
+    corpus = []
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            if "audio" not in entry or "text" not in entry:
+                raise ValueError(f"{manifest_path}:{line_number}: 'audio' and 'text' are required")
+            entry["audio"] = str((manifest_path.parent / entry["audio"]).resolve())
+            corpus.append(entry)
+
+    return corpus
+
+
+# ==================== BENCHMARK ====================
+
+def benchmark_model(
+    model_path: Path,
+    corpus: List[Dict],
+    early_commit: bool = False,
+    rescore: bool = True,
+    phrase_limit: float = config.RECOGNITION_PHRASE_LIMIT,
+    preprocess: bool = False
+) -> Dict:
+    """
+    Replay the corpus through one model and collect metrics.
+
+    Args:
+        model_path: Vosk model directory
+        corpus: Utterances from load_corpus()
+        early_commit: Enable early dispatch on stable partials (as in gideon.py)
+        rescore: Enable N-best rescoring against the command registry
+        phrase_limit: Maximum seconds per utterance
+        preprocess: Enable noise reduction + AGC (as configured in config.py)
+
+    Returns:
+        Report dict with "summary" and per-utterance "utterances"
+    """
+    load_start = time.perf_counter()
+    handler = VoskAudioHandler(
+        model_path=str(model_path),
+        sample_rate=config.SAMPLE_RATE,
+        max_alternatives=config.RECOGNITION_MAX_ALTERNATIVES if rescore else 0
+    )
+    load_seconds = time.perf_counter() - load_start
+
+    if rescore:
+        handler.rescorer = commands.rescore_alternatives
+    if preprocess:
+        handler.preprocessor = AudioPreprocessor(
+            handler.sample_rate,
+            noise_reduction=config.ENABLE_NOISE_REDUCTION,
+            agc=config.ENABLE_AGC,
+            target_rms=config.AGC_TARGET_RMS,
+            cpu_budget=config.PREPROCESSING_CPU_BUDGET
+        )
+
+    utterances = []
+    for entry in corpus:
+        audio_seconds = len(read_wav_int16(Path(entry["audio"]), handler.sample_rate)) / handler.sample_rate
+        handler.set_wav_input(entry["audio"], realtime=False)
+
+        decode_start = time.perf_counter()
+        hypothesis = handler.listen_once(
+            duration=config.RECOGNITION_TIMEOUT,
+            phrase_time_limit=phrase_limit,
+            silence_threshold=config.SILENCE_THRESHOLD,
+            early_commit=commands.is_early_commit_safe if early_commit else None,
+            stable_blocks=config.EARLY_COMMIT_STABLE_BLOCKS
+        ) or ""
+        decode_seconds = time.perf_counter() - decode_start
+
+        expected_command = entry.get("command", resolve_command(entry["text"]))
+        resolved_command = resolve_command(hypothesis)
+
+        utterances.append({
+            "audio": entry["audio"],
+            "reference": entry["text"],
+            "hypothesis": hypothesis,
+            "audio_seconds": round(audio_seconds, 3),
+            "decode_ms": round(decode_seconds * 1000, 1),
+            "rtf": round(decode_seconds / audio_seconds, 4) if audio_seconds else 0.0,
+            "wer": round(word_error_rate(entry["text"], hypothesis), 4),
+            "expected_command": expected_command,
+            "resolved_command": resolved_command,
+            "command_correct": resolved_command == expected_command,
+        })
+
+    handler.set_wav_input(None)
+
+    total_audio = sum(u["audio_seconds"] for u in utterances)
+    total_decode = sum(u["decode_ms"] for u in utterances) / 1000
+    latencies = [u["decode_ms"] for u in utterances]
+    total_ref_words = sum(len(u["reference"].split()) for u in utterances) or 1
+
+    summary = {
+        "model": str(model_path),
+        "utterances": len(utterances),
+        "load_seconds": round(load_seconds, 2),
+        "rtf": round(total_decode / total_audio, 4) if total_audio else 0.0,
+        "latency_mean_ms": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+        "latency_p50_ms": percentile(latencies, 0.50),
+        "latency_p95_ms": percentile(latencies, 0.95),
+        # Corpus-level WER weights each utterance by its reference length
+        "wer": round(sum(u["wer"] * len(u["reference"].split()) for u in utterances) / total_ref_words, 4),
+        "command_accuracy": round(
+            sum(u["command_correct"] for u in utterances) / len(utterances), 4
+        ) if utterances else 0.0,
+        "preprocessing": handler.preprocessor.stats() if handler.preprocessor else None,
+    }
+
+    return {"summary": summary, "utterances": utterances}
+
+
+def print_report(reports: List[Dict]) -> None:
+    """Print a side-by-side comparison of model summaries"""
+    print("\n" + "=" * 90)
+    print("GIDEON RECOGNITION BENCHMARK")
+    print("=" * 90)
+    print(f"{'Model':32} {'Load s':>7} {'RTF':>7} {'Mean ms':>9} {'p95 ms':>8} {'WER':>7} {'Cmd acc':>8}")
+    print("-" * 90)
+
+    for report in reports:
+        s = report["summary"]
+        print(
+            f"{Path(s['model']).name:32} {s['load_seconds']:7.2f} {s['rtf']:7.3f} "
+            f"{s['latency_mean_ms']:9.1f} {s['latency_p95_ms']:8.1f} "
+            f"{s['wer']:7.3f} {s['command_accuracy']:8.1%}"
+        )
+
+    print("=" * 90)
+
+    for report in reports:
+        stats = report["summary"]["preprocessing"]
+        if stats:
+            print(f"🔧 Preprocessing ({Path(report['summary']['model']).name}): "
+                  f"{stats['mean_ms']:.2f} ms/block mean, {stats['max_ms']:.2f} ms max, "
+                  f"{stats['overruns']} over budget{' (noise reduction bypassed)' if stats['bypassed'] else ''}")
+
+    # Show command resolution errors to help tune keywords
+    for report in reports:
+        errors = [u for u in report["utterances"] if not u["command_correct"]]
+        if errors:
+            print(f"\n⚠ Command errors for {Path(report['summary']['model']).name}:")
+            for u in errors:
+                print(f"   '{u['reference']}' -> '{u['hypothesis']}' "
+                      f"(expected: {u['expected_command']}, got: {u['resolved_command']})")
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark Vosk recognition speed and accuracy on labeled WAV files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python recognition_benchmark.py --corpus fixtures/manifest.jsonl
+  python recognition_benchmark.py --corpus fixtures/manifest.jsonl --models small-en large-en
+  python recognition_benchmark.py --corpus fixtures/manifest.jsonl --early-commit --output report.json
+  python recognition_benchmark.py --corpus fixtures/noisy.jsonl --preprocess
+        """
+    )
+
+    parser.add_argument('--corpus', required=True, help='JSONL manifest of labeled WAV files')
+    parser.add_argument(
+        '--models',
+        nargs='+',
+        default=[config.VOSK_MODEL_PATH],
+        help=f"Model keys ({', '.join(MODELS.keys())}) or model directories"
+    )
+    parser.add_argument('--model-dir', default='.', help='Directory containing downloaded models')
+    parser.add_argument('--early-commit', action='store_true', help='Enable early commit on stable partials')
+    parser.add_argument('--no-rescore', action='store_true', help='Disable N-best rescoring')
+    parser.add_argument('--preprocess', action='store_true', help='Enable noise reduction + AGC')
+    parser.add_argument(
+        '--phrase-limit',
+        type=float,
+        default=config.RECOGNITION_PHRASE_LIMIT,
+        help='Maximum seconds per utterance'
+    )
+    parser.add_argument('--output', help='Write the full JSON report to this file')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format=config.LOG_FORMAT)
+
+    corpus = load_corpus(Path(args.corpus))
+    if not corpus:
+        print(f"❌ No utterances found in {args.corpus}")
+        sys.exit(1)
+
+    print(f"\n📂 Loaded {len(corpus)} utterances from {args.corpus}")
+
+    reports = []
+    for model in args.models:
+        model_path = resolve_model_path(model, args.model_dir)
+        print(f"\n🔄 Benchmarking {model_path.name}...")
+        try:
+            reports.append(benchmark_model(
+                model_path,
+                corpus,
+                early_commit=args.early_commit,
+                rescore=not args.no_rescore,
+                phrase_limit=args.phrase_limit,
+                preprocess=args.preprocess
+            ))
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"❌ Skipping {model}: {e}")
+
+    if not reports:
+        sys.exit(1)
+
+    print_report(reports)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\n💾 Full report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+"""
+Gideon Multi-Stream Recognition Service
+=======================================
+Recognizes many audio streams (microphones, rooms) on one machine with a
+single shared Vosk model.
+
+- One vosk.Model shared by all streams, one KaldiRecognizer per stream
+- A fixed pool of decoder threads (Vosk releases the GIL while decoding)
+- Fair scheduling: streams with pending audio take turns round-robin, a
+  few blocks at a time, so a busy stream cannot starve the others
+- Backpressure: each stream buffers at most max_pending blocks; further
+  blocks are rejected (and counted) instead of growing memory and latency
+- Per-stream metrics: queue depth, dropped blocks, decode latency p50/p95
+
+The command line runs a synthetic-load benchmark: N streams replay a WAV
+file (or synthetic audio) in real time and the service reports the largest
+N it sustains without drops or excessive latency.
+
+Usage:
+    python recognition_service.py --wav samples/command.wav --workers 1
+    python recognition_service.py --model small-en --max-streams 64 --duration 20
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import wave
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Fix Unicode encoding issues on Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8')
+
+try:
+    import vosk
+    import numpy as np
+except ImportError as e:
+    print(f"❌ Missing required package: {e}")
+    print("\n📦 Install required packages:")
+    print("   pip install vosk numpy")
+    sys.exit(1)
+
+import config
+
+logger = logging.getLogger("Gideon.RecognitionService")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+# ==================== STREAM ====================
+
+class RecognitionStream:
+    """
+    One audio source: its recognizer, pending blocks and metrics.
+    Only one decoder thread works on a stream at a time.
+    """
+
+    def __init__(
+        self,
+        stream_id: str,
+        recognizer: "vosk.KaldiRecognizer",
+        max_pending: int,
+        on_result: Optional[Callable[[str, str], None]] = None
+    ):
+        self.stream_id = stream_id
+        self.recognizer = recognizer
+        self.max_pending = max_pending
+        self.on_result = on_result
+
+        self.pending: deque = deque()  # (submit_time, audio_bytes)
+        self.scheduled = False  # In the ready queue or being decoded
+        self.closed = False
+
+        # Metrics
+        self.blocks = 0
+        self.dropped = 0
+        self.results = 0
+        self.decode_seconds = 0.0
+        self.latencies_ms: deque = deque(maxlen=1000)  # Submit -> decoded, recent blocks
+
+    def metrics(self) -> Dict:
+        """Get this stream's metrics"""
+        latencies = list(self.latencies_ms)
+        return {
+            "stream": self.stream_id,
+            "blocks": self.blocks,
+            "dropped": self.dropped,
+            "queued": len(self.pending),
+            "results": self.results,
+            "decode_seconds": round(self.decode_seconds, 3),
+            "latency_p50_ms": round(percentile(latencies, 0.50), 1),
+            "latency_p95_ms": round(percentile(latencies, 0.95), 1),
+        }
+
+
+# ==================== SERVICE ====================
+
+class RecognitionService:
+    """
+    Shared-model recognition for many concurrent streams on a fixed worker pool.
+    """
+
+    def __init__(
+        self,
+        model: "vosk.Model",
+        sample_rate: int = 16000,
+        workers: int = 1,
+        max_pending: int = 20,
+        quantum: int = 2
+    ):
+        """
+        Initialize the service and start its decoder threads.
+
+        Args:
+            model: Loaded vosk.Model shared by every stream
+            sample_rate: Sample rate of submitted audio
+            workers: Number of decoder threads
+            max_pending: Blocks a stream may buffer before new ones are rejected
+            quantum: Blocks decoded per turn before the stream goes to the back of the queue
+        """
+        self.model = model
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.quantum = quantum
+
+        self._streams: Dict[str, RecognitionStream] = {}
+        self._ready: deque = deque()  # Streams with pending audio, in turn order
+        self._condition = threading.Condition()
+        self._running = True
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"Gideon-decoder-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def open_stream(self, stream_id: str, on_result: Optional[Callable[[str, str], None]] = None) -> RecognitionStream:
+        """
+        Register a new audio stream.
+
+        Args:
+            stream_id: Unique stream name (e.g. "kitchen-mic")
+            on_result: Called as on_result(stream_id, text) for each final result,
+                on a decoder thread
+
+        Returns:
+            The RecognitionStream
+
+        Raises:
+            ValueError: If the stream id is already open
+        """
+        recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
+        with self._condition:
+            if stream_id in self._streams:
+                raise ValueError(f"Stream already open: {stream_id}")
+            stream = RecognitionStream(stream_id, recognizer, self.max_pending, on_result)
+            self._streams[stream_id] = stream
+        logger.info(f"Stream opened: {stream_id}")
+        return stream
+
+    def close_stream(self, stream_id: str) -> None:
+        """Stop accepting audio for a stream and drop its pending blocks"""
+        with self._condition:
+            stream = self._streams.pop(stream_id, None)
+            if stream is not None:
+                stream.closed = True
+                stream.pending.clear()
+        logger.info(f"Stream closed: {stream_id}")
+
+    def submit(self, stream_id: str, data: bytes) -> bool:
+        """
+        Queue one audio block for a stream (never blocks).
+
+        Args:
+            stream_id: Target stream
+            data: Raw int16 mono audio at sample_rate
+
+        Returns:
+            True if queued, False if rejected by backpressure (or unknown stream)
+        """
+        with self._condition:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                return False
+            if len(stream.pending) >= stream.max_pending:
+                stream.dropped += 1
+                return False
+
+            stream.pending.append((time.perf_counter(), data))
+            if not stream.scheduled:
+                stream.scheduled = True
+                self._ready.append(stream)
+                self._condition.notify()
+        return True
+
+    def metrics(self) -> List[Dict]:
+        """Get metrics for every open stream"""
+        with self._condition:
+            streams = list(self._streams.values())
+        return [stream.metrics() for stream in streams]
+
+    def shutdown(self) -> None:
+        """Stop the decoder threads"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=2.0)
+
+    def _worker_loop(self) -> None:
+        """Decoder thread: take the next stream in turn, decode a quantum, requeue"""
+        while True:
+            with self._condition:
+                while self._running and not self._ready:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                stream = self._ready.popleft()
+                batch = [stream.pending.popleft() for _ in range(min(self.quantum, len(stream.pending)))]
+
+            # Decode outside the lock; no other thread touches this stream meanwhile
+            for submitted, data in batch:
+                decode_start = time.perf_counter()
+                if stream.recognizer.AcceptWaveform(data):
+                    text = json.loads(stream.recognizer.Result()).get("text", "")
+                    if text:
+                        stream.results += 1
+                        if stream.on_result is not None:
+                            try:
+                                stream.on_result(stream.stream_id, text)
+                            except Exception as e:
+                                logger.error(f"Result callback failed for {stream.stream_id}: {e}")
+                done = time.perf_counter()
+                stream.blocks += 1
+                stream.decode_seconds += done - decode_start
+                stream.latencies_ms.append((done - submitted) * 1000)
+
+            with self._condition:
+                if stream.pending and not stream.closed:
+                    self._ready.append(stream)  # Back of the line: round-robin fairness
+                    self._condition.notify()
+                else:
+                    stream.scheduled = False
+
+
+# ==================== SYNTHETIC-LOAD BENCHMARK ====================
+
+def load_benchmark_audio(wav_path: Optional[Path], sample_rate: int, seconds: float = 10.0) -> "np.ndarray":
+    """
+    Load the audio each benchmark stream replays.
+
+    Args:
+        wav_path: 16-bit PCM WAV at sample_rate (None = synthetic speech-like noise)
+        sample_rate: Service sample rate
+        seconds: Length of synthetic audio
+
+    Returns:
+        1-D int16 array
+    """
+    if wav_path is None:
+        # Amplitude-modulated noise keeps the decoder busy like speech would
+        rng = np.random.default_rng(0)
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+        return (rng.standard_normal(len(t)) * 3000 * envelope).astype(np.int16)
+
+    with wave.open(str(wav_path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2 or wav_file.getframerate() != sample_rate:
+            raise ValueError(f"{wav_path}: expected 16-bit PCM at {sample_rate} Hz")
+        channels = wav_file.getnchannels()
+        samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples
+
+
+def run_load(
+    model: "vosk.Model",
+    audio: "np.ndarray",
+    stream_count: int,
+    workers: int,
+    duration: float,
+    sample_rate: int,
+    block_seconds: float = 0.1
+) -> Dict:
+    """
+    Feed stream_count real-time streams into a fresh service for duration seconds.
+
+    Returns:
+        Summary dict (streams, dropped, latency_p50_ms, latency_p95_ms, cpu_load)
+    """
+    service = RecognitionService(model, sample_rate, workers=workers)
+    stream_ids = [f"stream-{i}" for i in range(stream_count)]
+    for stream_id in stream_ids:
+        service.open_stream(stream_id)
+
+    block_frames = int(block_seconds * sample_rate)
+    blocks = [audio[i:i + block_frames].tobytes() for i in range(0, len(audio) - block_frames + 1, block_frames)]
+
+    start = time.perf_counter()
+    tick = 0
+    while tick * block_seconds < duration:
+        # Stagger streams across the file so they are not decoding identical audio in lockstep
+        for index, stream_id in enumerate(stream_ids):
+            service.submit(stream_id, blocks[(tick + index * 7) % len(blocks)])
+        tick += 1
+        time.sleep(max(0.0, start + tick * block_seconds - time.perf_counter()))
+
+    # Let the queues drain before reading metrics
+    drain_deadline = time.perf_counter() + 5.0
+    while any(m["queued"] for m in service.metrics()) and time.perf_counter() < drain_deadline:
+        time.sleep(0.05)
+
+    metrics = service.metrics()
+    service.shutdown()
+
+    latencies = [m["latency_p95_ms"] for m in metrics]
+    decode_seconds = sum(m["decode_seconds"] for m in metrics)
+    return {
+        "streams": stream_count,
+        "dropped": sum(m["dropped"] for m in metrics),
+        "latency_p50_ms": round(percentile([m["latency_p50_ms"] for m in metrics], 0.50), 1),
+        "latency_p95_ms": round(max(latencies) if latencies else 0.0, 1),
+        # Decode time per wall-clock second per worker (1.0 = workers fully busy)
+        "cpu_load": round(decode_seconds / (duration * workers), 2),
+    }
+
+
+def benchmark(
+    model_path: Path,
+    wav_path: Optional[Path] = None,
+    workers: int = 1,
+    duration: float = 10.0,
+    max_streams: int = 64,
+    latency_budget_ms: float = 300.0
+) -> List[Dict]:
+    """
+    Double the stream count until the service can no longer keep up.
+
+    A load level is sustained when no block is dropped and the worst
+    stream's p95 decode latency stays within latency_budget_ms.
+
+    Returns:
+        One summary dict per load level tried
+    """
+    vosk.SetLogLevel(-1)
+    model = vosk.Model(str(model_path))
+    audio = load_benchmark_audio(wav_path, config.SAMPLE_RATE)
+
+    reports = []
+    stream_count = 1
+    while stream_count <= max_streams:
+        report = run_load(model, audio, stream_count, workers, duration, config.SAMPLE_RATE)
+        report["sustained"] = report["dropped"] == 0 and report["latency_p95_ms"] <= latency_budget_ms
+        reports.append(report)
+
+        status = "✓" if report["sustained"] else "✗"
+        print(f"   {status} {stream_count:3d} streams | p50 {report['latency_p50_ms']:7.1f} ms "
+              f"| p95 {report['latency_p95_ms']:7.1f} ms | dropped {report['dropped']:5d} "
+              f"| load {report['cpu_load']:.2f}")
+
+        if not report["sustained"]:
+            break
+        stream_count *= 2
+
+    return reports
+
+
+def main():
+    """Main entry point"""
+    import argparse
+    from vosk_setup import MODELS, resolve_model_path
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark how many concurrent real-time streams the recognition service sustains",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python recognition_service.py
+  python recognition_service.py --wav samples/command.wav --workers 1
+  python recognition_service.py --model large-en --workers 4 --duration 20
+        """
+    )
+
+    parser.add_argument(
+        '--model',
+        default=config.VOSK_MODEL_PATH,
+        help=f"Model key ({', '.join(MODELS.keys())}) or model directory"
+    )
+    parser.add_argument('--model-dir', default='.', help='Directory containing downloaded models')
+    parser.add_argument('--wav', help='16-bit PCM WAV to replay (default: synthetic audio)')
+    parser.add_argument('--workers', type=int, default=1, help='Decoder threads (1 = one CPU core)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per level')
+    parser.add_argument('--max-streams', type=int, default=64, help='Stop doubling at this many streams')
+    parser.add_argument('--latency-budget', type=float, default=300.0, help='Max p95 decode latency (ms)')
+
+    args = parser.parse_args()
+
+    model_path = resolve_model_path(args.model, args.model_dir)
+    if not model_path.exists():
+        print(f"❌ Vosk model not found at: {model_path}")
+        print("   Run: python vosk_setup.py")
+        sys.exit(1)
+
+    print(f"\n📊 Synthetic load: {model_path.name}, {args.workers} worker(s), "
+          f"{args.duration:.0f} s per level, {args.latency_budget:.0f} ms p95 budget\n")
+
+    reports = benchmark(
+        model_path,
+        Path(args.wav) if args.wav else None,
+        workers=args.workers,
+        duration=args.duration,
+        max_streams=args.max_streams,
+        latency_budget_ms=args.latency_budget
+    )
+
+    sustained = [r["streams"] for r in reports if r["sustained"]]
+    if sustained:
+        print(f"\n✅ Sustained {max(sustained)} concurrent real-time streams "
+              f"on {args.workers} worker(s)")
+    else:
+        print("\n⚠️  Could not sustain even one real-time stream")
+
+
+if __name__ == "__main__":
+    main()
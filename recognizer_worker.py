@@ -0,0 +1,630 @@
+"""
+Gideon Recognizer Worker
+========================
+Runs Vosk models in separate processes.
+
+RecognizerWorker - parallel decoding in another language
+    Decodes the same utterance with a second model (e.g. Urdu while English
+    runs in the capture process). Because the worker receives every block
+    while the user is still speaking, its decode runs in parallel on another
+    core and only the final flush is waited for at the end of the utterance.
+
+    Protocol (multiprocessing queues):
+        requests: ("reset",) | ("audio", bytes) | ("final", utterance_id) | ("stop",)
+        results:  ("ready", None) | ("error", message) | (utterance_id, (text, confidence))
+
+RemoteModel / RemoteRecognizer - out-of-process recognition
+    Drop-in stand-ins for vosk.Model / vosk.KaldiRecognizer. The model lives
+    in a dedicated worker process, so decoding gets its own core and never
+    contends with TTS or command execution for the GIL. Audio is passed
+    through a multiprocessing.shared_memory ring buffer; only small control
+    messages and results travel over a Pipe. If the worker dies it is
+    restarted and its recognizers are recreated automatically.
+
+    Protocol (Pipe, one reply per request):
+        ("create", rid, sample_rate, grammar, words, max_alternatives) -> None
+        ("accept", rid, nbytes) -> bool    (audio is read from the ring buffer)
+        ("result" | "partial" | "final", rid) -> JSON string
+        ("reset" | "close", rid) -> None
+        ("stop",)
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import json
+import math
+import time
+import queue
+import struct
+import logging
+import threading
+import itertools
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional, Tuple, Dict, Any, List
+
+logger = logging.getLogger("Gideon.RecognizerWorker")
+
+# Seconds the RemoteModel worker may take to answer one request before it is
+# treated as hung and restarted
+REQUEST_TIMEOUT = 10.0
+
+# Seconds to wait after a failed worker restart before trying again
+RESTART_BACKOFF = 5.0
+
+
+# ==================== CONFIDENCE ====================
+
+def result_confidence(result: Dict[str, Any], chosen: int = 0) -> Optional[float]:
+    """
+    Confidence (0-1) of one Vosk result, comparable between recognizers.
+
+    Recognizers with the same max_alternatives setting produce the same
+    measure, so transcripts of different languages can be arbitrated:
+    - Single best: mean word confidence (needs SetWords)
+    - N-best: posterior of the chosen alternative, i.e. the alternatives'
+      lattice scores normalized with a softmax (N-best words carry no "conf")
+
+    Args:
+        result: Parsed Result()/FinalResult() JSON
+        chosen: Index of the alternative used (N-best only)
+
+    Returns:
+        Confidence, or None if the result has no words
+    """
+    alternatives = result.get("alternatives")
+    if alternatives is None:
+        confidences = [word["conf"] for word in result.get("result", []) if "conf" in word]
+        return sum(confidences) / len(confidences) if confidences else None
+
+    if not alternatives or not alternatives[chosen].get("text", "").strip():
+        return None
+    scores = [float(alt.get("confidence", 0.0)) for alt in alternatives]
+    top = max(scores)
+    weights = [math.exp(score - top) for score in scores]
+    return weights[chosen] / sum(weights)
+
+
+def _result_text(result: Dict[str, Any]) -> str:
+    """Best text of a parsed result, with or without N-best"""
+    alternatives = result.get("alternatives")
+    if alternatives is None:
+        return result.get("text", "").strip()
+    return alternatives[0].get("text", "").strip() if alternatives else ""
+
+
+# ==================== WORKER PROCESS ====================
+
+def _worker_main(model_path: str, sample_rate: int, max_alternatives: int, requests, results) -> None:
+    """Worker process entry point: load the model once, then serve requests."""
+    import vosk
+
+    vosk.SetLogLevel(-1)
+    try:
+        model = vosk.Model(model_path)
+    except Exception as e:
+        results.put(("error", str(e)))
+        return
+
+    recognizer = vosk.KaldiRecognizer(model, sample_rate)
+    recognizer.SetWords(True)  # Word confidences for arbitration
+    if max_alternatives > 0:
+        # Same confidence measure as the capture process recognizer (see result_confidence)
+        recognizer.SetMaxAlternatives(max_alternatives)
+    segments: List[Dict[str, Any]] = []
+    results.put(("ready", None))
+
+    while True:
+        message = requests.get()
+        kind = message[0]
+
+        if kind == "audio":
+            if recognizer.AcceptWaveform(message[1]):
+                segments.append(json.loads(recognizer.Result()))
+
+        elif kind == "final":
+            segments.append(json.loads(recognizer.FinalResult()))
+            texts = [_result_text(segment) for segment in segments]
+            confidences = [c for c in map(result_confidence, segments) if c is not None]
+            text = " ".join(t for t in texts if t)
+            confidence = sum(confidences) / len(confidences) if confidences else 0.0
+            results.put((message[1], (text, confidence)))
+            recognizer.Reset()
+            segments = []
+
+        elif kind == "reset":
+            recognizer.Reset()
+            segments = []
+
+        elif kind == "stop":
+            break
+
+
+# ==================== MAIN PROCESS PROXY ====================
+
+class RecognizerWorker:
+    """
+    Handle to a Vosk recognizer running in its own process.
+
+    Call reset() at the start of an utterance, feed() every audio block and
+    finish() at the end to collect the worker's transcript.
+    """
+
+    def __init__(self, model_path: str, sample_rate: int = 16000, name: str = "worker", max_alternatives: int = 0):
+        """
+        Initialize the worker handle (call start() to launch the process).
+
+        Args:
+            model_path: Path to the Vosk model directory
+            sample_rate: Sample rate of the audio fed to the worker
+            name: Short name used in logs (e.g. "ur")
+            max_alternatives: N-best setting of the recognizer its transcripts
+                are compared with, so both report the same confidence measure
+        """
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.name = name
+        self.max_alternatives = max_alternatives
+        self._process: Optional[multiprocessing.Process] = None
+        self._requests = None
+        self._results = None
+        self._utterance_id = 0
+
+    @property
+    def alive(self) -> bool:
+        """True while the worker process is running"""
+        return self._process is not None and self._process.is_alive()
+
+    def start(self, timeout: float = 60.0) -> None:
+        """
+        Launch the worker process and wait for its model to load.
+
+        Args:
+            timeout: Seconds to wait for the model to load
+
+        Raises:
+            RuntimeError: If the worker fails to load the model in time
+        """
+        self._requests = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_worker_main,
+            args=(self.model_path, self.sample_rate, self.max_alternatives, self._requests, self._results),
+            name=f"Gideon-{self.name}-recognizer",
+            daemon=True
+        )
+        self._process.start()
+
+        try:
+            kind, detail = self._results.get(timeout=timeout)
+        except queue.Empty:
+            self.stop()
+            raise RuntimeError(f"{self.name} recognizer did not load within {timeout:.0f} s")
+
+        if kind != "ready":
+            self.stop()
+            raise RuntimeError(f"{self.name} recognizer failed to load: {detail}")
+
+        logger.info(f"{self.name} recognizer worker ready (pid {self._process.pid})")
+
+    def stop(self) -> None:
+        """Stop the worker process"""
+        if self._process is None:
+            return
+
+        if self._process.is_alive():
+            self._requests.put(("stop",))
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
+
+    def reset(self) -> None:
+        """Start a new utterance"""
+        if self.alive:
+            self._requests.put(("reset",))
+
+    def feed(self, data: bytes) -> None:
+        """Send one audio block (non-blocking)"""
+        if self.alive:
+            self._requests.put(("audio", data))
+
+    def finish(self, timeout: float = 2.0) -> Optional[Tuple[str, float]]:
+        """
+        End the utterance and collect the worker's transcript.
+
+        Args:
+            timeout: Seconds to wait for the final result
+
+        Returns:
+            (text, confidence) tuple (see result_confidence), or None if the
+            worker is down or too slow
+        """
+        if not self.alive:
+            return None
+
+        self._utterance_id += 1
+        utterance_id = self._utterance_id
+        self._requests.put(("final", utterance_id))
+
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                logger.warning(f"{self.name} recognizer timed out")
+                return None
+            try:
+                result_id, result = self._results.get(timeout=remaining)
+            except queue.Empty:
+                logger.warning(f"{self.name} recognizer timed out")
+                return None
+            # Skip late results of utterances that already timed out
+            if result_id == utterance_id:
+                return result
+
+
+# ==================== SHARED MEMORY RING BUFFER ====================
+
+# Header: total bytes written, total bytes read (monotonic counters)
+_WRITE_POSITION = struct.Struct("<Q")
+_READ_POSITION = struct.Struct("<Q")
+_RING_HEADER_SIZE = _WRITE_POSITION.size + _READ_POSITION.size
+
+
+class SharedAudioRing:
+    """
+    Single-producer, single-consumer byte ring in shared memory.
+
+    The capture process writes audio, the worker process reads it. Each side
+    only ever updates its own counter, so no lock is needed between them.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        """
+        Create a new ring buffer, or attach to an existing one by name.
+
+        Args:
+            capacity: Data capacity in bytes
+            name: Shared memory block to attach to (None = create a new one)
+        """
+        self.capacity = capacity
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=_RING_HEADER_SIZE + capacity)
+            self.reset()
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            _untrack(self._shm)
+
+    @property
+    def name(self) -> str:
+        """Shared memory block name (pass to the worker process)"""
+        return self._shm.name
+
+    def reset(self) -> None:
+        """Discard all buffered data"""
+        _WRITE_POSITION.pack_into(self._shm.buf, 0, 0)
+        _READ_POSITION.pack_into(self._shm.buf, _WRITE_POSITION.size, 0)
+
+    def write(self, data: bytes) -> None:
+        """
+        Append data to the ring.
+
+        Raises:
+            BufferError: If the unread data plus data would exceed the capacity
+        """
+        write_position = _WRITE_POSITION.unpack_from(self._shm.buf, 0)[0]
+        read_position = _READ_POSITION.unpack_from(self._shm.buf, _WRITE_POSITION.size)[0]
+        if len(data) > self.capacity - (write_position - read_position):
+            raise BufferError("audio ring buffer full")
+
+        offset = write_position % self.capacity
+        first = min(len(data), self.capacity - offset)
+        start = _RING_HEADER_SIZE + offset
+        self._shm.buf[start:start + first] = data[:first]
+        self._shm.buf[_RING_HEADER_SIZE:_RING_HEADER_SIZE + len(data) - first] = data[first:]
+
+        _WRITE_POSITION.pack_into(self._shm.buf, 0, write_position + len(data))
+
+    def read(self, size: int) -> bytes:
+        """Consume up to size bytes from the ring"""
+        write_position = _WRITE_POSITION.unpack_from(self._shm.buf, 0)[0]
+        read_position = _READ_POSITION.unpack_from(self._shm.buf, _WRITE_POSITION.size)[0]
+        size = min(size, write_position - read_position)
+
+        offset = read_position % self.capacity
+        first = min(size, self.capacity - offset)
+        start = _RING_HEADER_SIZE + offset
+        data = bytes(self._shm.buf[start:start + first]) + \
+            bytes(self._shm.buf[_RING_HEADER_SIZE:_RING_HEADER_SIZE + size - first])
+
+        _READ_POSITION.pack_into(self._shm.buf, _WRITE_POSITION.size, read_position + size)
+        return data
+
+    def close(self, unlink: bool = False) -> None:
+        """Detach from the block (and free it when unlink is True)"""
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """
+    Stop the resource tracker from unlinking a block this process only attached to.
+    The creating process owns (and unlinks) the block.
+    """
+    if os.name != "posix":
+        return
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+
+# ==================== REMOTE RECOGNIZER WORKER PROCESS ====================
+
+def _remote_worker_main(model_path: str, ring_name: str, ring_capacity: int, conn) -> None:
+    """Worker process entry point: serve recognizers over one loaded model."""
+    import vosk
+
+    vosk.SetLogLevel(-1)
+    ring = SharedAudioRing(ring_capacity, name=ring_name)
+
+    try:
+        model = vosk.Model(model_path)
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+
+    recognizers: Dict[int, Any] = {}
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break  # Main process went away
+
+        command = message[0]
+        if command == "stop":
+            break
+
+        recognizer_id = message[1]
+        if command == "create":
+            _, _, sample_rate, grammar, words, max_alternatives = message
+            if grammar:
+                recognizer = vosk.KaldiRecognizer(model, sample_rate, grammar)
+            else:
+                recognizer = vosk.KaldiRecognizer(model, sample_rate)
+            recognizer.SetWords(words)
+            if max_alternatives > 0:
+                recognizer.SetMaxAlternatives(max_alternatives)
+            recognizers[recognizer_id] = recognizer
+            conn.send(None)
+        elif command == "accept":
+            conn.send(recognizers[recognizer_id].AcceptWaveform(ring.read(message[2])))
+        elif command == "result":
+            conn.send(recognizers[recognizer_id].Result())
+        elif command == "partial":
+            conn.send(recognizers[recognizer_id].PartialResult())
+        elif command == "final":
+            conn.send(recognizers[recognizer_id].FinalResult())
+        elif command == "reset":
+            recognizers[recognizer_id].Reset()
+            conn.send(None)
+        elif command == "close":
+            recognizers.pop(recognizer_id, None)
+            conn.send(None)
+
+    ring.close()
+
+
+# ==================== REMOTE MODEL (MAIN PROCESS) ====================
+
+class RemoteModel:
+    """
+    A Vosk model loaded in a dedicated worker process.
+
+    Used in place of vosk.Model: recognizers created with RemoteRecognizer
+    run inside the worker. Calls are serialized over one Pipe; audio goes
+    through a shared memory ring buffer.
+    """
+
+    def __init__(self, model_path: str, ring_seconds: float = 10.0, sample_rate: int = 16000):
+        """
+        Start the worker process and load the model in it.
+
+        Args:
+            model_path: Path to the Vosk model directory
+            ring_seconds: Audio capacity of the shared ring buffer
+            sample_rate: Sample rate used to size the ring buffer
+
+        Raises:
+            RuntimeError: If the worker fails to load the model
+        """
+        self.model_path = str(model_path)
+        self.restarts = 0
+        self._ring = SharedAudioRing(int(ring_seconds * sample_rate * 2))
+        self._lock = threading.Lock()
+        self._recognizers: Dict[int, "RemoteRecognizer"] = {}
+        self._ids = itertools.count(1)
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn = None
+        self._retry_at = 0.0  # time.monotonic() before which no restart is attempted
+        self._start_worker()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Worker process id"""
+        return self._process.pid if self._process is not None else None
+
+    def close(self) -> None:
+        """Stop the worker and free the ring buffer"""
+        with self._lock:
+            self._stop_worker()
+            self._ring.close(unlink=True)
+
+    def _start_worker(self, timeout: float = 120.0) -> None:
+        """Launch the worker and wait until its model is loaded"""
+        self._ring.reset()
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_remote_worker_main,
+            args=(self.model_path, self._ring.name, self._ring.capacity, child_conn),
+            name="Gideon-recognizer",
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()  # So recv() sees EOF if the worker dies
+        self._conn = parent_conn
+
+        if not self._conn.poll(timeout):
+            self._stop_worker()
+            raise RuntimeError(f"Recognizer worker did not load the model within {timeout:.0f} s")
+        try:
+            kind, detail = self._conn.recv()
+        except EOFError:
+            kind, detail = "error", "worker exited during startup"
+        if kind != "ready":
+            self._stop_worker()
+            raise RuntimeError(f"Recognizer worker failed to load model: {detail}")
+
+        logger.info(f"Recognizer worker ready (pid {detail})")
+
+    def _stop_worker(self) -> None:
+        """Stop the worker process"""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(("stop",))
+        except (OSError, EOFError):
+            pass
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self._process = None
+
+    def _restart_worker(self) -> bool:
+        """
+        Replace a crashed or hung worker and recreate every open recognizer in it.
+
+        Returns:
+            True if a worker is running again; on failure the next attempt
+            waits RESTART_BACKOFF seconds
+        """
+        self._stop_worker()
+        if time.monotonic() < self._retry_at:
+            return False
+
+        self.restarts += 1
+        logger.warning(f"Recognizer worker crashed or hung, restarting (restart #{self.restarts})")
+        try:
+            self._start_worker()
+            for recognizer in self._recognizers.values():
+                self._conn.send(recognizer._create_message())
+                if not self._conn.poll(REQUEST_TIMEOUT):
+                    raise RuntimeError("worker did not recreate its recognizers")
+                self._conn.recv()
+        except (RuntimeError, EOFError, OSError) as e:
+            logger.error(f"Recognizer worker restart failed, retrying in {RESTART_BACKOFF:.0f} s: {e}")
+            self._stop_worker()
+            self._retry_at = time.monotonic() + RESTART_BACKOFF
+            return False
+        return True
+
+    def _register(self, recognizer: "RemoteRecognizer") -> int:
+        """Create a recognizer in the worker and return its id"""
+        recognizer_id = next(self._ids)
+        self._recognizers[recognizer_id] = recognizer
+        return recognizer_id
+
+    def _call(self, message: tuple, audio: Optional[bytes] = None, default: Any = None) -> Any:
+        """
+        Send one request and wait for its reply, restarting the worker on a crash.
+
+        Args:
+            message: Request tuple
+            audio: Audio to place in the ring buffer before sending
+            default: Returned when the worker crashed or hung during this
+                request, or could not be restarted
+
+        Returns:
+            The worker's reply, or default
+        """
+        with self._lock:
+            if self._process is None and not self._restart_worker():
+                return default
+            try:
+                if audio is not None:
+                    self._ring.write(audio)
+                self._conn.send(message)
+                if not self._conn.poll(REQUEST_TIMEOUT):
+                    # Alive but stuck: recover the same way as from a crash
+                    logger.warning(f"Recognizer worker did not answer within {REQUEST_TIMEOUT:.0f} s")
+                    self._restart_worker()
+                    return default
+                return self._conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                self._restart_worker()
+                return default
+
+
+class RemoteRecognizer:
+    """
+    Stand-in for vosk.KaldiRecognizer that runs inside a RemoteModel's worker.
+    Supports the recognizer methods Gideon uses.
+    """
+
+    def __init__(self, model: RemoteModel, sample_rate: int, grammar: Optional[str] = None):
+        """
+        Create a recognizer in the worker process.
+
+        Args:
+            model: RemoteModel hosting the recognizer
+            sample_rate: Sample rate of the audio passed to AcceptWaveform
+            grammar: Optional JSON grammar (as for vosk.KaldiRecognizer)
+        """
+        self.model = model
+        self.sample_rate = sample_rate
+        self.grammar = grammar
+        self.words = False
+        self.max_alternatives = 0
+        self.recognizer_id = model._register(self)
+        self._recreate()
+
+    def _create_message(self) -> tuple:
+        """Request that (re)creates this recognizer with its current settings"""
+        return ("create", self.recognizer_id, self.sample_rate, self.grammar, self.words, self.max_alternatives)
+
+    def _recreate(self) -> None:
+        self.model._call(self._create_message())
+
+    def SetWords(self, words: bool) -> None:
+        self.words = bool(words)
+        self._recreate()
+
+    def SetMaxAlternatives(self, max_alternatives: int) -> None:
+        self.max_alternatives = max_alternatives
+        self._recreate()
+
+    def AcceptWaveform(self, data: bytes) -> bool:
+        return self.model._call(("accept", self.recognizer_id, len(data)), audio=bytes(data), default=False)
+
+    def Result(self) -> str:
+        return self.model._call(("result", self.recognizer_id), default='{"text": ""}')
+
+    def PartialResult(self) -> str:
+        return self.model._call(("partial", self.recognizer_id), default='{"partial": ""}')
+
+    def FinalResult(self) -> str:
+        return self.model._call(("final", self.recognizer_id), default='{"text": ""}')
+
+    def Reset(self) -> None:
+        self.model._call(("reset", self.recognizer_id))
+
+    def close(self) -> None:
+        """Release the recognizer in the worker"""
+        self.model._recognizers.pop(self.recognizer_id, None)
+        self.model._call(("close", self.recognizer_id))
@@ -0,0 +1,263 @@
+"""
+Gideon Registry Artifact
+========================
+Precompiled registry index loaded at startup instead of being rebuilt.
+
+A RegistryIndex (intent ranker matrix, phonetic index, early commit index)
+is derived entirely from the registry definitions. This module saves the
+built structures to a versioned pickle keyed by a content hash of everything
+they depend on:
+
+- The patterns (description, keywords, priority, parameters, slot templates)
+- Aliases, application/website names and Roman Urdu commands
+- The matching settings in config
+- The source code of the modules that build and use the index
+- The artifact format and numpy version
+
+Startup computes the key (hashing a few source files, well under the cost of
+a build) and loads the artifact when the key matches. Otherwise it builds the
+index as before and writes a fresh artifact, so a changed keyword or data
+file never serves stale structures.
+
+Usage:
+    python registry_artifact.py              # Build the artifact
+    python registry_artifact.py --check      # Report whether it is current
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import os
+import sys
+import time
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Fix Unicode encoding issues on Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8')
+
+import config
+import commands
+import intent_ranker
+import multilingual
+import phonetic_index
+import slot_grammar
+import utterance
+from commands import RegistryIndex
+
+logger = logging.getLogger("Gideon.RegistryArtifact")
+
+# Bump when the artifact layout changes
+ARTIFACT_FORMAT = 1
+
+# Modules whose code shapes the index; editing one invalidates the artifact
+SOURCE_MODULES = (config, commands, intent_ranker, multilingual, phonetic_index, slot_grammar, utterance)
+
+# Settings that change what the index contains
+CONFIG_KEYS = (
+    "ENABLE_INTENT_RANKER", "INTENT_MIN_CONFIDENCE", "INTENT_PRIOR_WEIGHT", "INTENT_TOP_K",
+    "WAKE_WORDS", "SHUTDOWN_TRIGGERS",
+)
+
+
+# ==================== CONTENT KEY ====================
+
+def _source_digest() -> str:
+    """Hash of the source files of SOURCE_MODULES"""
+    digest = hashlib.sha256()
+    for module in SOURCE_MODULES:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def artifact_key(index: RegistryIndex) -> str:
+    """
+    Compute the content hash an artifact for this index must carry.
+
+    Args:
+        index: Registry index (not necessarily built)
+
+    Returns:
+        Hex digest
+    """
+    definition = {
+        "format": ARTIFACT_FORMAT,
+        "numpy": np.__version__,
+        "source": _source_digest(),
+        "config": [repr(getattr(config, key)) for key in CONFIG_KEYS],
+        "patterns": [
+            (
+                p.description, p.keywords, p.priority, p.requires_param, p.free_form_param,
+                p.slot_grammar.templates if p.slot_grammar else None,
+            )
+            for p in index.patterns
+        ],
+        "aliases": sorted((base, sorted(aliases)) for base, aliases in index.aliases.items()),
+        "known_names": sorted(index.known_names),
+        "urdu_commands": sorted(index.urdu_commands.items()),
+    }
+    return hashlib.sha256(repr(definition).encode("utf-8")).hexdigest()
+
+
+# ==================== SAVE / LOAD ====================
+
+def save_artifact(index: RegistryIndex, path: Optional[Path] = None, key: Optional[str] = None) -> Path:
+    """
+    Build (if needed) and save the structures of an index.
+
+    The file is written next to its destination and renamed into place, so a
+    reader never sees a partial artifact.
+
+    Args:
+        index: Registry index
+        path: Artifact file (default: config.REGISTRY_ARTIFACT_PATH)
+        key: Precomputed artifact_key(index)
+
+    Returns:
+        Path of the artifact
+    """
+    path = Path(path or config.REGISTRY_ARTIFACT_PATH)
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "key": key or artifact_key(index),
+        "created": time.time(),
+        "state": index.export_state(),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+    logger.info(f"Registry artifact saved: {path} ({path.stat().st_size / 1024:.0f} KB)")
+    return path
+
+
+def _read_artifact(path: Path) -> Optional[Dict[str, Any]]:
+    """Unpickle an artifact, or None if it is missing or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            artifact = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Registry artifact unreadable, rebuilding: {e}")
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get("format") != ARTIFACT_FORMAT:
+        return None
+    return artifact
+
+
+def load_artifact(index: RegistryIndex, path: Optional[Path] = None, key: Optional[str] = None) -> bool:
+    """
+    Restore an index from its artifact if the artifact is current.
+
+    Args:
+        index: Registry index to restore into
+        path: Artifact file (default: config.REGISTRY_ARTIFACT_PATH)
+        key: Precomputed artifact_key(index)
+
+    Returns:
+        True if the index was restored, False if it still needs building
+    """
+    artifact = _read_artifact(Path(path or config.REGISTRY_ARTIFACT_PATH))
+    if artifact is None or artifact["key"] != (key or artifact_key(index)):
+        return False
+
+    index.restore_state(artifact["state"])
+    return True
+
+
+def load_or_build(index: RegistryIndex, path: Optional[Path] = None) -> bool:
+    """
+    Make every structure of an index ready, from the artifact when possible.
+
+    Args:
+        index: Registry index
+        path: Artifact file (default: config.REGISTRY_ARTIFACT_PATH)
+
+    Returns:
+        True if loaded from the artifact, False if built (and saved)
+    """
+    if not config.ENABLE_REGISTRY_ARTIFACT:
+        index.warm()
+        return False
+
+    start = time.perf_counter()
+    key = artifact_key(index)
+    if load_artifact(index, path, key):
+        logger.info(f"Registry index loaded from artifact in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return True
+
+    index.warm()
+    logger.info(f"Registry index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    try:
+        save_artifact(index, path, key)
+    except OSError as e:
+        logger.warning(f"Could not save registry artifact: {e}")
+    return False
+
+
+# ==================== COMMAND LINE ====================
+
+def main():
+    """Main entry point"""
+    import argparse
+    import registry_loader
+
+    parser = argparse.ArgumentParser(
+        description="Build the precompiled registry index loaded at startup",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python registry_artifact.py
+  python registry_artifact.py --check
+  python registry_artifact.py --output build/registry_index.pickle
+        """
+    )
+
+    parser.add_argument('--output', type=Path, default=config.REGISTRY_ARTIFACT_PATH, help='Artifact file')
+    parser.add_argument('--check', action='store_true', help='Only report whether the artifact is current')
+
+    args = parser.parse_args()
+
+    try:
+        index = registry_loader.build_index(registry_loader.build_registry(registry_loader.read_sources()))
+    except registry_loader.RegistryDataError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    key = artifact_key(index)
+    if args.check:
+        current = load_artifact(index, args.output, key)
+        print(f"{'✅ Artifact is current' if current else '⚠ Artifact is missing or stale'}: {args.output}")
+        sys.exit(0 if current else 1)
+
+    start = time.perf_counter()
+    index.warm()
+    build_ms = (time.perf_counter() - start) * 1000
+    save_artifact(index, args.output, key)
+
+    start = time.perf_counter()
+    load_artifact(RegistryIndex(index.patterns, index.aliases, index.known_names, index.urdu_commands), args.output, key)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"✅ Registry artifact written: {args.output}")
+    print(f"   {len(index.patterns)} patterns | key {key[:12]}")
+    print(f"   Build: {build_ms:.0f} ms | Load: {load_ms:.0f} ms")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
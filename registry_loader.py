@@ -0,0 +1,456 @@
+"""
+Gideon Registry Loader
+======================
+Loads commands, aliases, applications, websites and Roman Urdu commands
+from JSON data files and reloads them while Gideon runs, so a new keyword
+does not cost a restart (and a speech model load).
+
+Command pack manifests (see command_plugins.py) and then every *.json file
+in config.COMMAND_DATA_DIR are merged, in file name order, on top of the
+built-in definitions. Any section may be left out:
+
+    {
+      "commands": [
+        {"extends": "Open Chrome", "keywords": ["fire up chrome"]},
+        {"description": "Open Spotify", "keywords": ["open spotify"],
+         "handler": "cmd_open_app", "argument": "spotify", "priority": 60},
+        {"description": "Open a repository", "keywords": ["open repo"],
+         "handler": "cmd_open_website", "slots": ["open repo {name}"]}
+      ],
+      "aliases": {"time": ["time please"]},
+      "applications": {"spotify": "spotify.exe"},
+      "websites": {"hacker news": "https://news.ycombinator.com"},
+      "urdu_commands": {"spotify kholo": "open spotify"}
+    }
+
+- "extends" adds keywords to a built-in command (and may override its
+  priority or deadline)
+- "handler" names a cmd_* function in commands.py, or "module:function"
+  for a handler imported on first use; "argument" binds a fixed parameter,
+  "slots" extracts one from the command (see slot_grammar)
+
+A reload builds the new registry and warms its RegistryIndex (intent ranker,
+phonetic and early commit indexes, loaded from the registry artifact when
+it is current) on the calling thread, which is never the
+listen thread, then swaps everything in. Dispatches in flight keep the index
+they started with. An invalid file is reported and the current registry stays.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+import commands
+import multilingual
+from commands import CommandPattern, RegistryIndex
+from command_plugins import MANIFEST_NAME, LazyHandler, discover_manifests, installed_manifests
+from entity_index import config_tables_replaced
+from registry_artifact import load_or_build
+from slot_grammar import SlotGrammarError
+from utterance import reset_normalization
+
+logger = logging.getLogger("Gideon.RegistryLoader")
+
+# Built-in definitions, captured before any data file is applied, so a reload
+# always starts from them (removing a line from a file removes its effect)
+_BUILTIN_PATTERNS: List[CommandPattern] = list(commands.COMMAND_REGISTRY)
+_BUILTIN_ALIASES: Dict[str, List[str]] = {base: list(aliases) for base, aliases in config.COMMAND_ALIASES.items()}
+_BUILTIN_APPLICATIONS: Dict[str, str] = dict(config.APPLICATIONS)
+_BUILTIN_WEBSITES: Dict[str, str] = dict(config.WEBSITES)
+_BUILTIN_URDU_COMMANDS: Dict[str, str] = dict(multilingual.ALL_URDU_COMMANDS)
+
+DATA_SECTIONS = ("commands", "aliases", "applications", "websites", "urdu_commands")
+METADATA_KEYS = ("name", "version", "description")  # Descriptive only (command pack manifests)
+
+# JSON type of each command entry field: (Python types, wording for errors)
+COMMAND_FIELDS = {
+    "extends": (str, "a string"),
+    "description": (str, "a string"),
+    "handler": (str, "a string"),
+    "argument": (str, "a string"),
+    "keywords": (list, "a list of strings"),
+    "slots": (list, "a list of strings"),
+    "priority": ((int, float), "a number"),
+    "deadline": ((int, float), "a number"),
+    "requires_param": (bool, "true or false"),
+    "free_form_param": (bool, "true or false"),
+}
+
+# One reload at a time (the watcher and the voice command may both trigger one)
+_reload_lock = threading.Lock()
+
+
+class RegistryDataError(ValueError):
+    """Raised when a data file cannot be applied"""
+
+
+# ==================== DATA FILES ====================
+
+def list_data_files(data_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Get the data files in merge order.
+
+    Args:
+        data_dir: Directory to scan (default: config.COMMAND_DATA_DIR)
+
+    Returns:
+        Sorted list of *.json files (empty if the directory does not exist)
+    """
+    data_dir = Path(data_dir or config.COMMAND_DATA_DIR)
+    if not data_dir.is_dir():
+        return []
+    return sorted(data_dir.glob("*.json"))
+
+
+def list_sources(data_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Get every file that extends the registry, in merge order.
+
+    Args:
+        data_dir: Data file directory (default: config.COMMAND_DATA_DIR)
+
+    Returns:
+        Command pack manifests followed by data files
+    """
+    return discover_manifests() + list_data_files(data_dir)
+
+
+def sources_signature(data_dir: Optional[Path] = None) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Get a cheap fingerprint of the source files (path, mtime, size).
+
+    Args:
+        data_dir: Data file directory (default: config.COMMAND_DATA_DIR)
+
+    Returns:
+        Tuple that changes whenever a file is added, removed or modified
+    """
+    signature = []
+    for path in list_sources(data_dir):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed between listing and stat
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _source_name(path: Path) -> str:
+    """Short name of a source file for messages ("git_tools/gideon_commands.json")"""
+    return f"{path.parent.name}/{path.name}" if path.name == MANIFEST_NAME else path.name
+
+
+def _is_string_list(value: Any) -> bool:
+    """True for a JSON array of strings"""
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _check_document(data: Dict[str, Any], name: str) -> None:
+    """
+    Check the type of every section and command field of a parsed file.
+
+    Args:
+        data: Parsed JSON object
+        name: File name for messages
+
+    Raises:
+        RegistryDataError: If a section or field has the wrong type
+    """
+    entries = data.get("commands", [])
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise RegistryDataError(f"{name}: 'commands' must be a list of objects")
+    for number, entry in enumerate(entries, 1):
+        for field, (types, wording) in COMMAND_FIELDS.items():
+            value = entry.get(field)
+            if value is None:
+                continue
+            if not isinstance(value, types) or (types is list and not _is_string_list(value)):
+                raise RegistryDataError(f"{name} command #{number}: '{field}' must be {wording}")
+
+    aliases = data.get("aliases", {})
+    if not isinstance(aliases, dict) or not all(
+        isinstance(base, str) and _is_string_list(values) for base, values in aliases.items()
+    ):
+        raise RegistryDataError(f"{name}: 'aliases' must map commands to lists of strings")
+
+    for section in ("applications", "websites", "urdu_commands"):
+        table = data.get(section, {})
+        if not isinstance(table, dict) or not all(
+            isinstance(key, str) and isinstance(value, str) for key, value in table.items()
+        ):
+            raise RegistryDataError(f"{name}: '{section}' must map strings to strings")
+
+
+def read_sources(data_dir: Optional[Path] = None) -> List[Tuple[Path, Dict[str, Any]]]:
+    """
+    Parse every command pack manifest and data file.
+
+    Args:
+        data_dir: Data file directory (default: config.COMMAND_DATA_DIR)
+
+    Returns:
+        [(path, data), ...] in merge order
+
+    Raises:
+        RegistryDataError: If a file is not valid JSON, has an unknown section
+            or a section of the wrong type
+    """
+    documents = []
+    for path in list_sources(data_dir):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise RegistryDataError(f"{_source_name(path)}: {e}") from e
+
+        if not isinstance(data, dict):
+            raise RegistryDataError(f"{_source_name(path)}: expected a JSON object")
+        unknown = set(data) - set(DATA_SECTIONS) - set(METADATA_KEYS)
+        if unknown:
+            raise RegistryDataError(f"{_source_name(path)}: unknown section(s) {', '.join(sorted(unknown))}")
+        _check_document(data, _source_name(path))
+        documents.append((path, data))
+    return documents
+
+
+# ==================== BUILDING ====================
+
+def _resolve_handler(name: str, argument: Optional[str], source: str) -> Callable:
+    """Look up a cmd_* handler in commands.py (or defer a "module:function" one), binding a fixed argument if given"""
+    if ":" in name:
+        try:
+            return LazyHandler(name, argument)
+        except ValueError as e:
+            raise RegistryDataError(f"{source}: {e}") from e
+
+    handler = getattr(commands, name, None) if name.startswith("cmd_") else None
+    if not callable(handler):
+        raise RegistryDataError(f"{source}: unknown handler '{name}'")
+    if argument is None:
+        return handler
+    return lambda: handler(argument)
+
+
+def _extend_pattern(pattern: CommandPattern, entry: Dict[str, Any]) -> CommandPattern:
+    """Copy a built-in pattern with extra keywords (patterns in use are never modified)"""
+    extended = CommandPattern(
+        keywords=pattern.keywords + [k for k in entry.get("keywords", []) if k.lower() not in pattern.keywords],
+        handler=pattern.handler,
+        description=pattern.description,
+        requires_param=pattern.requires_param,
+        param_extractor=pattern.param_extractor,
+        priority=entry.get("priority", pattern.priority),
+        free_form_param=pattern.free_form_param,
+        deadline=entry.get("deadline", pattern.deadline)
+    )
+    extended.slot_grammar = pattern.slot_grammar  # Compiled once, shared read-only
+    return extended
+
+
+def _new_pattern(entry: Dict[str, Any], source: str) -> CommandPattern:
+    """Create a pattern defined entirely by a data file entry"""
+    for field in ("description", "keywords", "handler"):
+        if not entry.get(field):
+            raise RegistryDataError(f"{source}: command is missing '{field}'")
+
+    slots = entry.get("slots")
+    try:
+        return CommandPattern(
+            keywords=entry["keywords"],
+            handler=_resolve_handler(entry["handler"], entry.get("argument"), source),
+            description=entry["description"],
+            requires_param=entry.get("requires_param", bool(slots)),
+            priority=entry.get("priority", 50),
+            free_form_param=entry.get("free_form_param", False),
+            deadline=entry.get("deadline"),
+            slots=slots
+        )
+    except SlotGrammarError as e:
+        raise RegistryDataError(f"{source}: {e}") from e
+
+
+def build_registry(documents: List[Tuple[Path, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Merge data files onto the built-in definitions.
+
+    Args:
+        documents: Output of read_sources()
+
+    Returns:
+        Dict with "patterns", "aliases", "applications", "websites" and
+        "urdu_commands" (new objects; nothing current is modified)
+
+    Raises:
+        RegistryDataError: If an entry is invalid
+    """
+    patterns = list(_BUILTIN_PATTERNS)
+    aliases = {base: list(values) for base, values in _BUILTIN_ALIASES.items()}
+    applications = dict(_BUILTIN_APPLICATIONS)
+    websites = dict(_BUILTIN_WEBSITES)
+    urdu_commands = dict(_BUILTIN_URDU_COMMANDS)
+
+    for path, data in documents:
+        for number, entry in enumerate(data.get("commands", []), 1):
+            source = f"{_source_name(path)} command #{number}"
+            if "extends" in entry:
+                position = next((i for i, p in enumerate(patterns) if p.description == entry["extends"]), None)
+                if position is None:
+                    raise RegistryDataError(f"{source}: no command described '{entry['extends']}'")
+                patterns[position] = _extend_pattern(patterns[position], entry)
+            else:
+                patterns.append(_new_pattern(entry, source))
+
+        for base, values in data.get("aliases", {}).items():
+            aliases.setdefault(base.lower(), []).extend(v.lower() for v in values)
+        applications.update({k.lower(): v for k, v in data.get("applications", {}).items()})
+        websites.update({k.lower(): v for k, v in data.get("websites", {}).items()})
+        urdu_commands.update({k.lower(): v.lower() for k, v in data.get("urdu_commands", {}).items()})
+
+    return {
+        "patterns": patterns,
+        "aliases": aliases,
+        "applications": applications,
+        "websites": websites,
+        "urdu_commands": urdu_commands,
+    }
+
+
+def build_index(registry: Dict[str, Any]) -> RegistryIndex:
+    """
+    Create the registry index of a merged registry (structures not built yet).
+
+    Args:
+        registry: Output of build_registry()
+
+    Returns:
+        RegistryIndex
+    """
+    return RegistryIndex(
+        registry["patterns"],
+        aliases=registry["aliases"],
+        known_names=list(registry["applications"]) + list(registry["websites"]),
+        urdu_commands=registry["urdu_commands"]
+    )
+
+
+# ==================== RELOADING ====================
+
+def reload_registry(data_dir: Optional[Path] = None, rescan_packages: bool = False) -> Tuple[bool, str]:
+    """
+    Rebuild the registry from the pack manifests and data files and swap it in.
+
+    Must not run on the listen thread: building the index takes a while,
+    and dispatch continues on the old index until the swap.
+
+    Args:
+        data_dir: Data file directory (default: config.COMMAND_DATA_DIR)
+        rescan_packages: Look for newly installed command packs as well
+
+    Returns:
+        (success, message) tuple; the message includes the reload duration
+    """
+    with _reload_lock:
+        start = time.perf_counter()
+        if rescan_packages:
+            installed_manifests.cache_clear()
+        try:
+            documents = read_sources(data_dir)
+            registry = build_registry(documents)
+        except RegistryDataError as e:
+            message = f"Command data not reloaded: {e}"
+            logger.error(message)
+            return False, message
+
+        index = build_index(registry)
+        from_artifact = load_or_build(index)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Publish: every table is complete before it is assigned
+        config.APPLICATIONS = registry["applications"]
+        config.WEBSITES = registry["websites"]
+        config.COMMAND_ALIASES = registry["aliases"]
+        config_tables_replaced()
+        multilingual.set_urdu_commands(registry["urdu_commands"])
+        reset_normalization()
+        commands.swap_registry_index(index)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        message = (f"Reloaded {len(index.patterns)} commands from {len(documents)} file(s) "
+                   f"in {total_ms:.0f} ms (index {'loaded' if from_artifact else 'built'} in {build_ms:.0f} ms)")
+        logger.info(message)
+        print(f"🔄 {message}")
+        return True, message
+
+
+class RegistryWatcher:
+    """
+    Background thread that reloads the registry when a data file or local
+    command pack manifest changes.
+    """
+
+    def __init__(self, data_dir: Optional[Path] = None, interval: float = config.REGISTRY_RELOAD_INTERVAL):
+        """
+        Initialize the watcher.
+
+        Args:
+            data_dir: Directory to watch (default: config.COMMAND_DATA_DIR)
+            interval: Seconds between checks (one stat() per file)
+        """
+        self.data_dir = data_dir
+        self.interval = interval
+        self._signature = sources_signature(data_dir)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start watching"""
+        if self._thread is not None:
+            logger.warning("Registry watcher already running")
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="GideonRegistryWatcher")
+        self._thread.start()
+        logger.info(f"Watching {self.data_dir or config.COMMAND_DATA_DIR} for command data changes")
+
+    def stop(self) -> None:
+        """Stop watching"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Poll the data files and reload on change"""
+        while not self._stop_event.wait(self.interval):
+            try:
+                signature = sources_signature(self.data_dir)
+                if signature != self._signature:
+                    self._signature = signature
+                    reload_registry(self.data_dir)
+            except Exception as e:
+                logger.error(f"Error in registry watcher: {e}")
+
+
+# Global watcher instance
+_watcher: Optional[RegistryWatcher] = None
+
+
+def start_watching() -> RegistryWatcher:
+    """
+    Start the global registry watcher (singleton pattern).
+
+    Returns:
+        Running RegistryWatcher
+    """
+    global _watcher
+
+    if _watcher is None:
+        _watcher = RegistryWatcher()
+        _watcher.start()
+    return _watcher
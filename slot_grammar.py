@@ -0,0 +1,177 @@
+"""
+Gideon Slot Grammar
+===================
+Declarative parameter extraction for command patterns.
+
+A command declares templates such as:
+
+    "(create|make) [a] folder [(named|called)] {name} [on [the] desktop]"
+
+- word             literal word
+- {slot}           one or more words captured as "slot" (text)
+- {slot:int}       typed slot (see SLOT_TYPES)
+- [ ... ]          optional part
+- ( a | b c )      alternatives ("|" also works inside [ ]); longer
+                   alternatives are tried first, so "(search|search for)"
+                   never leaves "for" at the start of the next slot
+
+All templates of a command are compiled once into a single regular
+expression, so extraction is one regex search over the utterance. Templates
+are tried in order at the leftmost position where any of them matches;
+slots are lazy, so optional trailing words ("on desktop") are not
+swallowed into the slot.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("Gideon.SlotGrammar")
+
+# Slot type -> (regex for the value, converter)
+SLOT_TYPES: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "text": (r"\S.*?", str),
+    "word": (r"\S+", str),
+    "int": (r"\d+", int),
+}
+
+_TOKEN_RE = re.compile(r"\{[^{}]*\}|[{}\[\]()|]|[^\s\[\]()|{}]+")
+
+
+class SlotGrammarError(ValueError):
+    """Raised when a template cannot be compiled"""
+
+
+class SlotGrammar:
+    """
+    Compiled slot templates for one command.
+    """
+
+    def __init__(self, templates: List[str]):
+        """
+        Compile the templates.
+
+        Args:
+            templates: Slot templates, most specific first
+
+        Raises:
+            SlotGrammarError: If a template is malformed
+        """
+        self.templates = list(templates)
+        self.slot_names: List[str] = []  # In order of first appearance
+        self._group_slots: Dict[str, Tuple[str, Callable[[str], Any]]] = {}  # Regex group -> (slot, converter)
+
+        alternatives = [self._compile_template(index, template) for index, template in enumerate(self.templates)]
+        self.regex = re.compile("(?:" + "|".join(alternatives) + r")\s*$")
+
+    @property
+    def primary_slot(self) -> Optional[str]:
+        """Name of the first slot (the value passed to single-parameter handlers)"""
+        return self.slot_names[0] if self.slot_names else None
+
+    def match(self, command: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract slots from an utterance.
+
+        Args:
+            command: Voice command (any case; extra whitespace is ignored)
+
+        Returns:
+            Dict of slot name -> typed value, or None if no template matches
+        """
+        text = " " + " ".join(command.lower().split())
+        match = self.regex.search(text)
+        if match is None:
+            return None
+
+        slots: Dict[str, Any] = {}
+        for group, value in match.groupdict().items():
+            if value is not None:
+                slot, convert = self._group_slots[group]
+                slots[slot] = convert(value.strip())
+        return slots
+
+    # ==================== COMPILATION ====================
+
+    def _compile_template(self, index: int, template: str) -> str:
+        """Compile one template into a regex fragment"""
+        tokens = _TOKEN_RE.findall(template.lower())
+        self._index = index
+        self._slots_in_template: set = set()
+
+        pattern, position = self._parse_alternatives(tokens, 0, template, top_level=True)
+        if position != len(tokens):
+            raise SlotGrammarError(f"Unbalanced '{tokens[position]}' in template: {template}")
+        return pattern
+
+    def _parse_alternatives(
+        self,
+        tokens: List[str],
+        position: int,
+        template: str,
+        top_level: bool = False
+    ) -> Tuple[str, int]:
+        """alternatives := sequence ('|' sequence)*"""
+        branches = []
+        while True:
+            start = position
+            branch, position = self._parse_sequence(tokens, position, template)
+            branches.append((position - start, branch))
+            if position < len(tokens) and tokens[position] == "|":
+                position += 1
+                continue
+            break
+
+        if not top_level:
+            branches.sort(key=lambda item: -item[0])  # Longest first (stable for equal lengths)
+        branches = [branch for _, branch in branches]
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return pattern, position
+
+    def _parse_sequence(self, tokens: List[str], position: int, template: str) -> Tuple[str, int]:
+        """sequence := (word | slot | '[' alternatives ']' | '(' alternatives ')')*"""
+        parts = []
+        while position < len(tokens) and tokens[position] not in ("|", "]", ")"):
+            token = tokens[position]
+
+            if token in ("[", "("):
+                closing = "]" if token == "[" else ")"
+                inner, position = self._parse_alternatives(tokens, position + 1, template)
+                if position >= len(tokens) or tokens[position] != closing:
+                    raise SlotGrammarError(f"Missing '{closing}' in template: {template}")
+                parts.append(f"(?:{inner})?" if token == "[" else f"(?:{inner})")
+
+            elif token in ("{", "}"):
+                raise SlotGrammarError(f"Unbalanced '{token}' in template: {template}")
+
+            elif token.startswith("{"):
+                parts.append(self._compile_slot(token[1:-1], template))
+
+            else:
+                # Every word carries its leading whitespace, so words only match whole words
+                parts.append(r"\s+" + re.escape(token) + r"(?=\s|$)")
+
+            position += 1
+        return "".join(parts), position
+
+    def _compile_slot(self, spec: str, template: str) -> str:
+        """Compile a {name} or {name:type} slot into a named group"""
+        name, _, slot_type = spec.partition(":")
+        name, slot_type = name.strip(), (slot_type.strip() or "text")
+        if not name.isidentifier():
+            raise SlotGrammarError(f"Invalid slot name '{name}' in template: {template}")
+        if slot_type not in SLOT_TYPES:
+            raise SlotGrammarError(f"Unknown slot type '{slot_type}' in template: {template}")
+        if name in self._slots_in_template:
+            raise SlotGrammarError(f"Slot '{name}' used twice in template: {template}")
+        self._slots_in_template.add(name)
+
+        if name not in self.slot_names:
+            self.slot_names.append(name)
+
+        value_regex, convert = SLOT_TYPES[slot_type]
+        group = f"t{self._index}_{name}"
+        self._group_slots[group] = (name, convert)
+        return rf"\s+(?P<{group}>{value_regex})(?=\s|$)"
@@ -0,0 +1,12 @@
+"""
+Gideon Test Configuration
+=========================
+Makes the top-level modules importable from the tests folder.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
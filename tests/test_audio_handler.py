@@ -0,0 +1,110 @@
+"""
+Tests for audio_handler.py (tiered slot re-decoding)
+
+The recognizer and the large model are replaced by stand-ins that decode
+synthetic audio: every loud 100 ms block is one word, named by its amplitude.
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import json
+import wave
+
+import pytest
+
+pytest.importorskip("vosk")
+pytest.importorskip("sounddevice")
+np = pytest.importorskip("numpy")
+
+import audio_handler
+
+SAMPLE_RATE = 16000
+BLOCK = SAMPLE_RATE // 10
+WORDS = {1000: "play", 2000: "lo", 3000: "fi", 4000: "jazz", 5000: "search"}
+AMPLITUDES = {word: amplitude for amplitude, word in WORDS.items()}
+
+
+def decode_blocks(audio: bytes) -> list:
+    """Words of the loud 100 ms blocks in audio"""
+    samples = np.frombuffer(audio, dtype=np.int16)
+    return [WORDS[int(samples[i])] for i in range(0, len(samples) - BLOCK + 1, BLOCK) if samples[i]]
+
+
+class ClockRecognizer:
+    """Vosk-like recognizer whose word times run on from creation, across Reset()"""
+
+    def __init__(self, model, sample_rate, grammar=None):
+        self.clock = 0
+        self.words = []
+
+    def SetWords(self, enabled):
+        pass
+
+    def SetMaxAlternatives(self, count):
+        pass
+
+    def AcceptWaveform(self, data):
+        samples = np.frombuffer(data, dtype=np.int16)
+        if samples.any():
+            self.words.append({"word": WORDS[int(samples[0])], "conf": 1.0,
+                               "start": self.clock / SAMPLE_RATE,
+                               "end": (self.clock + len(samples)) / SAMPLE_RATE})
+        self.clock += len(samples)
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(w["word"] for w in self.words)})
+
+    def FinalResult(self):
+        result = {"text": " ".join(w["word"] for w in self.words), "result": self.words}
+        self.words = []
+        return json.dumps(result)
+
+    def Reset(self):
+        self.words = []
+
+
+class BlockSlotRecognizer:
+    """Large-model stand-in that decodes the blocks it is given"""
+
+    def transcribe(self, audio: bytes) -> str:
+        return " ".join(decode_blocks(audio))
+
+
+def write_utterance(path, words, lead_blocks):
+    """WAV of lead_blocks of silence followed by one block per word"""
+    blocks = [np.zeros(BLOCK, dtype=np.int16)] * lead_blocks
+    blocks += [np.full(BLOCK, AMPLITUDES[word], dtype=np.int16) for word in words]
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(np.concatenate(blocks).tobytes())
+    return path
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_handler.vosk, "Model", lambda path: object())
+    monkeypatch.setattr(audio_handler, "create_recognizer", ClockRecognizer)
+    handler = audio_handler.VoskAudioHandler(model_path=str(tmp_path))
+    handler.slot_recognizer = BlockSlotRecognizer()
+    return handler
+
+
+def test_slot_found_in_two_consecutive_utterances(handler, tmp_path):
+    handler.set_wav_input(str(write_utterance(tmp_path / "first.wav", ["play", "lo", "fi"], 3)))
+    assert handler.listen_once(duration=5, phrase_time_limit=10, silence_threshold=500) == "play lo fi"
+    assert handler.transcribe_slot("lo fi", padding=0.0) == "lo fi"
+
+    # The recognizer's clock is now past the second utterance's buffer
+    handler.set_wav_input(str(write_utterance(tmp_path / "second.wav", ["search", "jazz"], 5)))
+    assert handler.listen_once(duration=5, phrase_time_limit=10, silence_threshold=500) == "search jazz"
+    assert handler.transcribe_slot("jazz", padding=0.0) == "jazz"
+
+
+def test_slot_outside_buffer_is_not_decoded(handler, tmp_path):
+    handler.set_wav_input(str(write_utterance(tmp_path / "first.wav", ["play", "jazz"], 2)))
+    handler.listen_once(duration=5, phrase_time_limit=10, silence_threshold=500)
+    handler.last_utterance_offset += 60.0
+    assert handler.transcribe_slot("jazz", padding=0.0) is None
@@ -0,0 +1,41 @@
+"""
+Tests for audio_preprocessing.py (CPU budget)
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_preprocessing import MAX_CONSECUTIVE_OVERRUNS, AudioPreprocessor
+
+SAMPLE_RATE = 16000
+BLOCK = np.zeros(SAMPLE_RATE // 10, dtype=np.int16)
+
+
+def test_overruns_bypass_noise_reduction_until_reset():
+    # A zero budget makes every block overrun
+    preprocessor = AudioPreprocessor(SAMPLE_RATE, cpu_budget=0.0)
+    for _ in range(MAX_CONSECUTIVE_OVERRUNS - 1):
+        preprocessor.process(BLOCK)
+    assert not preprocessor.bypassed
+
+    preprocessor.process(BLOCK)
+    assert preprocessor.bypassed
+
+    preprocessor.reset()
+    assert not preprocessor.bypassed
+    assert preprocessor.stats()["overruns"] == MAX_CONSECUTIVE_OVERRUNS
+
+    # The overrun count starts again too
+    preprocessor.process(BLOCK)
+    assert not preprocessor.bypassed
+
+
+def test_blocks_within_budget_keep_noise_reduction():
+    preprocessor = AudioPreprocessor(SAMPLE_RATE, cpu_budget=1000.0)
+    for _ in range(MAX_CONSECUTIVE_OVERRUNS * 2):
+        preprocessor.process(BLOCK)
+    assert not preprocessor.bypassed
+    assert preprocessor.stats()["overruns"] == 0
@@ -0,0 +1,94 @@
+"""
+Tests for commands.py matching and compound_commands.py planning
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+pytest.importorskip("vosk")
+pytest.importorskip("sounddevice")
+pytest.importorskip("pyttsx3")
+pytest.importorskip("pywhatkit")
+
+import config
+import commands
+import compound_commands
+import entity_index
+from entity_index import EntityUsage
+from utterance import normalize_utterance
+
+
+@pytest.fixture(autouse=True)
+def usage(tmp_path, monkeypatch):
+    """Usage counts in a temporary file instead of the user's cache"""
+    monkeypatch.setattr(entity_index, "_usage", EntityUsage(tmp_path / "entity_usage.json"))
+
+
+@pytest.mark.parametrize("heard, known, similar", [
+    ("cron", "chrome", True),
+    ("excell", "excel", True),
+    ("lock", "leg", False),
+    # Same phonetic key (KRN) but a different first letter
+    ("kroam", "chrome", False),
+])
+def test_is_similar(heard, known, similar):
+    pattern = commands.get_registry_index().patterns[0]
+    assert pattern._is_similar(heard, known) is similar
+
+
+@pytest.mark.parametrize("command, description", [
+    ("open cron", "Open Chrome"),
+    ("open note pad", "Open Notepad"),
+    ("youtube despacito", "Play video on YouTube"),
+    ("play music", "Play random music from Music folder"),
+    ("asdkj qwe", None),
+])
+def test_find_matching_pattern(command, description):
+    pattern = commands.find_matching_pattern(command)
+    assert (pattern.description if pattern else None) == description
+
+
+@pytest.mark.parametrize("text, parts", [
+    ("open chrome", [("open chrome", False)]),
+    ("open chrome and notepad then play music",
+     [("open chrome", False), ("notepad", False), ("play music", True)]),
+    ("start coding and then play music", [("start coding", False), ("play music", True)]),
+])
+def test_split_parts(text, parts):
+    assert compound_commands.split_parts(text) == parts
+
+
+@pytest.mark.parametrize("command, stages", [
+    # The verb is borrowed from the neighbouring part
+    ("open chrome and notepad", [["Open Chrome", "Open Notepad"]]),
+    ("chrome aur notepad kholo", [["Open Chrome", "Open Notepad"]]),
+    ("start coding then play music", 2),
+    ("open chrome and then play music", 2),
+    ("play despacito on youtube and open notepad", 1),
+])
+def test_compound_plan(monkeypatch, command, stages):
+    monkeypatch.setattr(config, "ENABLE_COMPOUND_COMMANDS", True)
+    plan = compound_commands.plan_compound(normalize_utterance(command))
+    assert plan is not None
+    if isinstance(stages, int):
+        assert len(plan.stages) == stages
+    else:
+        assert [[action.pattern.description for action in stage] for stage in plan.stages] == stages
+
+
+@pytest.mark.parametrize("command", [
+    # A free-form parameter keeps its conjunction
+    "play tom and jerry on youtube",
+    "search cats and dogs",
+    "open task manager",
+    "date batao",
+])
+def test_single_commands_are_not_split(monkeypatch, command):
+    monkeypatch.setattr(config, "ENABLE_COMPOUND_COMMANDS", True)
+    assert compound_commands.plan_compound(normalize_utterance(command)) is None
+
+
+def test_compound_commands_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_COMPOUND_COMMANDS", False)
+    assert compound_commands.plan_compound(normalize_utterance("open chrome and notepad")) is None
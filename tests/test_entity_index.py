@@ -0,0 +1,107 @@
+"""
+Tests for entity_index.py
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+import config
+import entity_index
+from entity_index import EntityIndex, EntityUsage
+
+APPLICATIONS = {"vs code": "code", "chrome": "chrome.exe", "notepad": "notepad.exe",
+                "file explorer": "explorer.exe", "excel": "excel.exe"}
+WEBSITES = {"stack overflow": "https://stackoverflow.com", "github": "https://github.com",
+            "youtube": "https://youtube.com"}
+
+
+@pytest.fixture(autouse=True)
+def usage(tmp_path, monkeypatch):
+    """Usage counts in a temporary file instead of the user's cache"""
+    usage = EntityUsage(tmp_path / "entity_usage.json")
+    monkeypatch.setattr(entity_index, "_usage", usage)
+    return usage
+
+
+def applications():
+    return EntityIndex("applications", APPLICATIONS, fillers=config.ENTITY_FILLER_WORDS["applications"])
+
+
+def websites():
+    return EntityIndex("websites", WEBSITES, fillers=config.ENTITY_FILLER_WORDS["websites"])
+
+
+@pytest.mark.parametrize("text, name", [
+    ("vs cold", "vs code"),
+    ("cron", "chrome"),
+    ("note pad", "notepad"),
+    ("the chrome app", "chrome"),
+    ("excell", "excel"),
+    ("banana", None),
+])
+def test_application_names(text, name):
+    match = applications().best(text)
+    assert (match[0] if match else None) == name
+
+
+@pytest.mark.parametrize("text, name", [
+    ("stackoverflow", "stack overflow"),
+    ("the stack overflow website", "stack overflow"),
+    ("git hub", "github"),
+    ("you tube", "youtube"),
+])
+def test_website_names(text, name):
+    assert websites().best(text)[0] == name
+
+
+def test_sync_touches_only_changes():
+    index = applications()
+    assert index.sync({"vs code": "code", "slack": "slack"}) == (1, 4)
+    assert sorted(index.entities) == ["slack", "vs code"]
+    assert index.search("notepad") == []
+    assert index.best("slak")[0] == "slack"
+
+
+def test_usage_wins_close_calls(usage):
+    index = EntityIndex("applications", {"code": "code", "cody": "cody"})
+    first = index.search("coda", limit=2)
+    loser = first[1][0]
+    for _ in range(5):
+        usage.record("applications", loser)
+    assert index.search("coda", limit=1)[0][0] == loser
+
+
+@pytest.fixture
+def restored_catalogs():
+    """Resync the catalogs with the real tables after the test"""
+    yield
+    entity_index.config_tables_replaced()
+
+
+def test_catalog_syncs_when_config_tables_are_replaced(monkeypatch, restored_catalogs):
+    monkeypatch.setattr(config, "ENABLE_APP_DISCOVERY", False)
+    monkeypatch.setattr(config, "APPLICATIONS", {"notepad": "notepad.exe"})
+    entity_index.config_tables_replaced()
+    assert sorted(entity_index.get_entity_index("applications").entities) == ["notepad"]
+
+    # A new table is picked up even if it reuses the old one's memory
+    monkeypatch.setattr(config, "APPLICATIONS", {"slack": "slack"})
+    entity_index.config_tables_replaced()
+    assert sorted(entity_index.get_entity_index("applications").entities) == ["slack"]
+
+
+def test_applications_include_discovered_apps(monkeypatch, restored_catalogs):
+    from app_discovery import DiscoveredApp, get_app_discovery
+
+    discovery = get_app_discovery()
+    monkeypatch.setattr(config, "ENABLE_APP_DISCOVERY", True)
+    monkeypatch.setattr(config, "APPLICATIONS", {"notepad": "notepad.exe"})
+    monkeypatch.setattr(discovery, "apps", {
+        "gimp": DiscoveredApp("gimp", ["gimp"], "desktop_entries"),
+        "reboot": DiscoveredApp("reboot", ["reboot"], "path"),
+    })
+    monkeypatch.setattr(discovery, "generation", discovery.generation + 1)
+
+    # PATH programs stay out of fuzzy matching
+    assert sorted(entity_index.get_entity_index("applications").entities) == ["gimp", "notepad"]
@@ -0,0 +1,85 @@
+"""
+Tests for intent_ranker.py
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from intent_ranker import IntentRanker, extract_features
+
+
+class Pattern:
+    """Minimal stand-in for commands.CommandPattern"""
+
+    def __init__(self, description, keywords, priority=50):
+        self.description = description
+        self.keywords = keywords
+        self.priority = priority
+
+
+PATTERNS = [
+    Pattern("chrome", ["open chrome", "chrome", "launch chrome"], 60),
+    Pattern("notepad", ["open notepad", "notepad"], 60),
+    Pattern("no keywords", []),
+    Pattern("time", ["what time is it", "time"]),
+    Pattern("open", ["open"], 10),
+]
+
+
+@pytest.fixture(scope="module")
+def ranker():
+    return IntentRanker(PATTERNS)
+
+
+@pytest.mark.parametrize("utterance, best", [
+    ("open chrome", "chrome"),
+    ("launch chrome now", "chrome"),
+    ("what time is it please", "time"),
+    ("open notepad", "notepad"),
+    ("open", "open"),
+])
+def test_best_intent(ranker, utterance, best):
+    assert ranker.rank(utterance, top_k=1)[0][0].description == best
+
+
+@pytest.mark.parametrize("utterance", [
+    "open chrome please",
+    "what time is it",
+    "note pad",
+    "banana split",
+])
+def test_pattern_score_is_its_best_keyword(ranker, utterance):
+    # The reduceat over keyword rows must equal the maximum over each pattern's own rows
+    weights = ranker._weigh(extract_features(utterance))
+    presence = (weights > 0).astype(np.float32)
+    unit = weights / max(np.linalg.norm(weights), 1e-9)
+    keyword_scores = ranker.matrix @ np.concatenate([presence, unit])
+
+    scores = ranker.score(utterance)
+    row = 0
+    for position, pattern in enumerate(PATTERNS):
+        rows = keyword_scores[row:row + len(pattern.keywords)]
+        expected = min(float(rows.max()), 1.0) if len(rows) else 0.0
+        assert scores[position] == pytest.approx(max(expected, 0.0), abs=1e-6)
+        row += len(pattern.keywords)
+
+
+def test_verbatim_keyword_is_fully_confident(ranker):
+    assert ranker.score("please open notepad for me")[1] == pytest.approx(1.0, abs=0.05)
+
+
+def test_gibberish_scores_low(ranker):
+    assert ranker.score("banana split").max() < 0.2
+
+
+def test_priority_orders_but_is_not_reported(ranker):
+    confidences = dict((p.description, c) for p, c in ranker.rank("open chrome", top_k=5))
+    assert confidences["chrome"] == pytest.approx(float(ranker.score("open chrome")[0]))
+
+
+def test_state_round_trip(ranker):
+    restored = IntentRanker.from_state(PATTERNS, ranker.export_state())
+    assert np.array_equal(restored.score("open cron"), ranker.score("open cron"))
@@ -0,0 +1,80 @@
+"""
+Tests for phonetic_index.py
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+from phonetic_index import PhoneticIndex, edit_distance, merge_compounds, phonetic_key
+
+KNOWN = ["chrome", "notepad", "youtube", "github", "excel", "vs code",
+         "recycle bin", "recyclebin", "recycle", "bin", "go", "to"]
+
+
+@pytest.mark.parametrize("first, second", [
+    ("chrome", "cron"),
+    ("notepad", "note pad"),
+    ("github", "get hub"),
+    ("excel", "excell"),
+    ("phone", "fone"),
+    ("knife", "nife"),
+])
+def test_sound_alikes_share_a_key(first, second):
+    assert phonetic_key(first) == phonetic_key(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("chrome", "notepad"),
+    ("time", "open"),
+])
+def test_different_words_have_different_keys(first, second):
+    assert phonetic_key(first) != phonetic_key(second)
+
+
+def test_no_letters_no_key():
+    assert phonetic_key("123") == ""
+    assert phonetic_key("") == ""
+
+
+@pytest.mark.parametrize("first, second, distance", [
+    ("chrome", "chrome", 0),
+    ("chrome", "cron", 3),
+    ("excel", "excell", 1),
+    ("", "abc", 3),
+])
+def test_edit_distance(first, second, distance):
+    assert edit_distance(first, second) == distance
+    assert edit_distance(second, first) == distance
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("cron", ("chrome", 3)),
+    ("excell", ("excel", 1)),
+    ("note pad", ("notepad", 0)),
+    ("chrome", ("chrome", 0)),
+    ("xyz", None),
+])
+def test_best_match(text, expected):
+    assert PhoneticIndex(KNOWN).best_match(text) == expected
+
+
+def test_remove_forgets_a_name():
+    index = PhoneticIndex(KNOWN)
+    index.remove("chrome")
+    index.remove("not known")
+    assert "chrome" not in index.names
+    assert index.best_match("cron") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("open note pad", "open notepad"),
+    ("play you tube", "play youtube"),
+    ("open get hub", "open github"),
+    # Short words and runs of known words are never merged
+    ("go to", "go to"),
+    ("open recycle bin", "open recycle bin"),
+    ("open vs code", "open vs code"),
+])
+def test_merge_compounds(text, expected):
+    assert merge_compounds(text.split(), PhoneticIndex(KNOWN)) == expected.split()
@@ -0,0 +1,34 @@
+"""
+Tests for recognizer_worker.py (confidence used for language arbitration)
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+from recognizer_worker import result_confidence
+
+WORDS = [{"word": "open", "conf": 0.9}, {"word": "chrome", "conf": 0.7}]
+ALTERNATIVES = [
+    {"text": "open chrome", "confidence": 210.0, "result": [{"word": "open"}, {"word": "chrome"}]},
+    {"text": "open crime", "confidence": 210.0, "result": [{"word": "open"}, {"word": "crime"}]},
+    {"text": "often chrome", "confidence": 200.0, "result": [{"word": "often"}, {"word": "chrome"}]},
+]
+
+
+def test_single_best_uses_mean_word_confidence():
+    assert result_confidence({"text": "open chrome", "result": WORDS}) == pytest.approx(0.8)
+
+
+def test_result_without_words_has_no_confidence():
+    assert result_confidence({"text": ""}) is None
+    assert result_confidence({"alternatives": [{"text": "", "confidence": 5.0}]}) is None
+
+
+def test_n_best_uses_posterior_of_chosen_alternative():
+    # Words of N-best alternatives carry no "conf"; lattice scores are normalized instead
+    first = result_confidence({"alternatives": ALTERNATIVES}, 0)
+    assert 0.0 < first < 1.0
+    assert result_confidence({"alternatives": ALTERNATIVES}, 1) == pytest.approx(first)
+    assert result_confidence({"alternatives": ALTERNATIVES}, 2) < 0.001
+    assert sum(result_confidence({"alternatives": ALTERNATIVES}, i) for i in range(3)) == pytest.approx(1.0)
@@ -0,0 +1,43 @@
+"""
+Tests for registry_loader.py (data file validation)
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("vosk")
+pytest.importorskip("pyttsx3")
+
+import registry_loader
+from registry_loader import RegistryDataError
+
+
+@pytest.mark.parametrize("document, message", [
+    ({"commands": [{"description": "Open Spotify", "keywords": "open spotify", "handler": "cmd_open_app"}]},
+     "'keywords' must be a list of strings"),
+    ({"commands": ["open spotify"]}, "'commands' must be a list of objects"),
+    ({"commands": {"open spotify": "cmd_open_app"}}, "'commands' must be a list of objects"),
+    ({"commands": [{"extends": "Open Chrome", "priority": "high"}]}, "'priority' must be a number"),
+    ({"commands": [{"extends": "Open Chrome", "slots": [1]}]}, "'slots' must be a list of strings"),
+    ({"aliases": {"time": "time please"}}, "'aliases' must map commands to lists of strings"),
+    ({"applications": ["spotify"]}, "'applications' must map strings to strings"),
+    ({"websites": {"hacker news": None}}, "'websites' must map strings to strings"),
+])
+def test_wrong_types_are_rejected(tmp_path, document, message):
+    (tmp_path / "bad.json").write_text(json.dumps(document), encoding="utf-8")
+    with pytest.raises(RegistryDataError, match=message):
+        registry_loader.read_sources(tmp_path)
+
+
+def test_valid_file_is_read(tmp_path):
+    document = {
+        "commands": [{"description": "Open Spotify", "keywords": ["open spotify"],
+                      "handler": "cmd_open_app", "argument": "spotify", "priority": 60}],
+        "aliases": {"time": ["time please"]},
+        "applications": {"spotify": "spotify.exe"},
+    }
+    (tmp_path / "good.json").write_text(json.dumps(document), encoding="utf-8")
+    assert (tmp_path / "good.json", document) in registry_loader.read_sources(tmp_path)
@@ -0,0 +1,68 @@
+"""
+Tests for slot_grammar.py
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import pytest
+
+from slot_grammar import SlotGrammar, SlotGrammarError
+
+FOLDER = [
+    "(create|make) [a|the] [new] folder (on|in) [the] desktop [(named|called)] {name}",
+    "(create|make) [a|the] [new] folder [(named|called)] {name} [(on|in) [the] desktop]",
+]
+YOUTUBE = [
+    "(play|search|search for|find) {query} (on|in) (youtube|yt)",
+    "(youtube|yt) (play|search|search for) {query}",
+    "(play|search|search for) (on|in) (youtube|yt) [for] {query}",
+    "[open] (youtube|yt) [and] [play] {query}",
+]
+
+
+@pytest.mark.parametrize("templates, utterance, expected", [
+    # Lazy slots leave optional trailing words to the template
+    (FOLDER, "create folder reports", {"name": "reports"}),
+    (FOLDER, "make a folder called my notes on the desktop", {"name": "my notes"}),
+    (FOLDER, "create a new folder on the desktop called reports", {"name": "reports"}),
+    (FOLDER, "make folder taxes in desktop", {"name": "taxes"}),
+    (FOLDER, "delete folder taxes", None),
+    # Longest alternative first: "search for" never leaves "for" in the slot
+    (["(search|search for) {query}"], "search for cats", {"query": "cats"}),
+    (YOUTUBE, "search for cats on youtube", {"query": "cats"}),
+    (YOUTUBE, "play tom and jerry on youtube", {"query": "tom and jerry"}),
+    (YOUTUBE, "youtube despacito", {"query": "despacito"}),
+    (YOUTUBE, "search on youtube for lo fi beats", {"query": "lo fi beats"}),
+    (YOUTUBE, "open youtube and play coldplay", {"query": "coldplay"}),
+    # Optional words match whole words only ("theatre" is not "the atre")
+    (["open [the] {app} [app|application]"], "open the vs code app", {"app": "vs code"}),
+    (["open [the] {app} [app|application]"], "open theatre", {"app": "theatre"}),
+    (["open [the] {app} [app|application]"], "Open   VS   Code", {"app": "vs code"}),
+    # Typed slots
+    (["set [a] timer for {minutes:int} minutes [and {seconds:int} seconds]"],
+     "set a timer for 5 minutes and 30 seconds", {"minutes": 5, "seconds": 30}),
+    (["set [a] timer for {minutes:int} minutes"], "set a timer for five minutes", None),
+])
+def test_match(templates, utterance, expected):
+    assert SlotGrammar(templates).match(utterance) == expected
+
+
+@pytest.mark.parametrize("template", [
+    "[open {app}",
+    "(a|b {x}",
+    "open )",
+    "open {app",
+    "open app}",
+    "open {}",
+    "open {app:float}",
+    "open {app} and {app}",
+])
+def test_malformed_template_is_rejected(template):
+    with pytest.raises(SlotGrammarError):
+        SlotGrammar([template])
+
+
+def test_slot_names_in_order_of_appearance():
+    grammar = SlotGrammar(["remind me to {task} in {minutes:int} minutes", "in {minutes:int} minutes {task}"])
+    assert grammar.slot_names == ["task", "minutes"]
+    assert grammar.primary_slot == "task"
@@ -8,7 +8,7 @@ Author: Muhammad Ali (CodeCelix Internship)
 """
 
 # Vosk Audio Handler - Offline speech recognition (replaces speech_recognition)
-from audio_handler import get_audio_handler, VoskAudioHandler
+from audio_handler import get_audio_handler, VoskAudioHandler, discard_preroll, playback
 import pyttsx3
 import logging
 import subprocess
@@ -16,9 +16,15 @@ import webbrowser
 import pywhatkit
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Callable
 import sys
+import threading
+from contextlib import contextmanager
 import config
+from command_executor import CommandCancelled, check_cancelled
+from entity_index import resolve_entity, resolve_best, record_use
+from app_discovery import DiscoveredApp, chrome_path, path_program
+from utterance import clean_text, is_shutdown_text, resolve_alias
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -27,6 +33,9 @@ logger = logging.getLogger(__name__)
 # Global TTS engine instance
 _tts_engine: Optional[pyttsx3.Engine] = None
 
+# Handlers on the command executor speak from worker threads; pyttsx3 is not thread-safe
+_tts_lock = threading.RLock()
+
 
 def initialize_tts() -> pyttsx3.Engine:
     """
@@ -61,6 +70,28 @@ def initialize_tts() -> pyttsx3.Engine:
     return _tts_engine
 
 
+# Per-thread list collecting what a compound command's parts would say
+_speech = threading.local()
+
+
+@contextmanager
+def collect_speech(sink: List[str]):
+    """
+    Collect speak() calls on this thread instead of speaking them.
+
+    Questions asked during a user prompt are still spoken.
+
+    Args:
+        sink: List that receives the text
+    """
+    previous = getattr(_speech, "sink", None)
+    _speech.sink = sink
+    try:
+        yield sink
+    finally:
+        _speech.sink = previous
+
+
 def speak(text: str, log: bool = True) -> bool:
     """
     Convert text to speech using pyttsx3.
@@ -73,13 +104,23 @@ def speak(text: str, log: bool = True) -> bool:
     Returns:
         True if speech was successful, False otherwise
     """
+    sink = getattr(_speech, "sink", None)
+    if sink is not None and not prompt_active():
+        sink.append(text)
+        return True
+
     try:
         if log:
             logger.info(f"Gideon speaking: {text}")
 
-        engine = initialize_tts()
-        engine.say(text)
-        engine.runAndWait()
+        # Listens drop what the microphone captures meanwhile (own-voice gate)
+        with _tts_lock, playback():
+            engine = initialize_tts()
+            engine.say(text)
+            engine.runAndWait()
+
+        # Don't let Gideon's own voice leak into the next listen's pre-roll
+        discard_preroll()
         return True
 
     except Exception as e:
@@ -89,13 +130,18 @@ def speak(text: str, log: bool = True) -> bool:
 
 
 # ==================== SPEECH RECOGNITION (VOSK - OFFLINE) ====================
-def listen_for_command(timeout: int = config.RECOGNITION_TIMEOUT) -> Optional[str]:
+def listen_for_command(
+    timeout: int = config.RECOGNITION_TIMEOUT,
+    early_commit: Optional[Callable[[str], bool]] = None
+) -> Optional[str]:
     """
     Listen for voice input and convert to text using Vosk offline recognition.
     Replaces Google Speech Recognition API with 100% offline solution.
 
     Args:
         timeout: Maximum seconds to wait for speech
+        early_commit: Optional predicate that lets a stable partial hypothesis
+            end listening early (see commands.is_early_commit_safe)
 
     Returns:
         Recognized text in lowercase, or None if recognition failed
@@ -110,7 +156,9 @@ def listen_for_command(timeout: int = config.RECOGNITION_TIMEOUT) -> Optional[st
         command = handler.listen_once(
             duration=timeout,
             phrase_time_limit=config.RECOGNITION_PHRASE_LIMIT,
-            silence_threshold=config.SILENCE_THRESHOLD
+            silence_threshold=config.SILENCE_THRESHOLD,
+            early_commit=early_commit,
+            stable_blocks=config.EARLY_COMMIT_STABLE_BLOCKS
         )
 
         if command is None:
@@ -135,18 +183,24 @@ def listen_for_command(timeout: int = config.RECOGNITION_TIMEOUT) -> Optional[st
         return None
 
 
-def listen_with_retry(max_attempts: int = config.MAX_RETRY_ATTEMPTS) -> Optional[str]:
+def listen_with_retry(
+    max_attempts: int = config.MAX_RETRY_ATTEMPTS,
+    timeout: int = config.RECOGNITION_TIMEOUT,
+    early_commit: Optional[Callable[[str], bool]] = None
+) -> Optional[str]:
     """
     Listen for command with automatic retry on failure.
 
     Args:
         max_attempts: Maximum number of retry attempts
+        timeout: Maximum seconds to wait for speech on each attempt
+        early_commit: Optional predicate for early dispatch of stable partials
 
     Returns:
         Recognized command or None if all attempts failed
     """
     for attempt in range(max_attempts):
-        command = listen_for_command()
+        command = listen_for_command(timeout=timeout, early_commit=early_commit)
 
         if command is not None and command != "unknown":
             return command
@@ -170,19 +224,36 @@ def open_application(app_name: str) -> Tuple[bool, str]:
         (success: bool, message: str) tuple
     """
     try:
-        # Get application executable from config
-        app_key = app_name.lower()
-        app_executable = config.APPLICATIONS.get(app_key)
+        # Configured or installed application ("vs cold" -> "vs code"), or
+        # a website / folder ("open stack overflow website", "open downloads")
+        match = resolve_best(("applications", "websites", "folders"), app_name)
+
+        if match is None:
+            # A program on PATH runs only by its exact name, and only if confirmed
+            program = path_program(app_name)
+            if program is None:
+                message = f"Application '{app_name}' not found"
+                logger.warning(message)
+                return False, message
+            if not ask_confirmation(f"run the program {program.name}"):
+                return False, "Operation cancelled by user"
+            program.launch()
+            message = f"Started {program.name}"
+            logger.info(message)
+            return True, message
 
-        if not app_executable:
-            message = f"Application '{app_name}' not found in configuration"
-            logger.warning(message)
-            return False, message
+        kind, app_key, app_executable = match
+        if kind == "websites":
+            return open_website(app_name)
+        if kind == "folders":
+            return open_folder(app_name)
+        record_use("applications", app_key)
 
         # Special handling for Chrome - use detected path
         if app_key in ["chrome", "google chrome"]:
-            if config.CHROME_PATH:
-                subprocess.Popen([config.CHROME_PATH])
+            chrome = chrome_path()
+            if chrome:
+                subprocess.Popen([chrome])
                 message = f"Opened {app_name}"
                 logger.info(message)
                 return True, message
@@ -193,6 +264,10 @@ def open_application(app_name: str) -> Tuple[bool, str]:
                 logger.warning(message)
                 return True, message
 
+        # Installed application found by discovery
+        elif isinstance(app_executable, DiscoveredApp):
+            app_executable.launch()
+
         # Special handling for Windows settings
         elif app_executable.startswith("ms-"):
             subprocess.Popen(["start", app_executable], shell=True)
@@ -227,8 +302,12 @@ def open_website(website_name: str) -> Tuple[bool, str]:
     """
     try:
         # Check if it's a known website
-        website_key = website_name.lower()
-        url = config.WEBSITES.get(website_key, website_name)
+        match = resolve_entity("websites", website_name)
+        if match is not None:
+            website_key, url = match
+            record_use("websites", website_key)
+        else:
+            url = website_name
 
         # Add https:// if not present
         if not url.startswith(('http://', 'https://')):
@@ -246,6 +325,37 @@ def open_website(website_name: str) -> Tuple[bool, str]:
         return False, message
 
 
+def open_folder(folder_name: str) -> Tuple[bool, str]:
+    """
+    Open a folder (Desktop, Documents, Downloads, Music or one inside them).
+
+    Args:
+        folder_name: Name of the folder
+
+    Returns:
+        (success: bool, message: str) tuple
+    """
+    try:
+        match = resolve_entity("folders", folder_name)
+        if match is None:
+            message = f"Folder '{folder_name}' not found"
+            logger.warning(message)
+            return False, message
+
+        folder_key, folder_path = match
+        subprocess.Popen(["explorer", str(folder_path)])
+        record_use("folders", folder_key)
+
+        message = f"Opened folder {folder_path.name}"
+        logger.info(message)
+        return True, message
+
+    except Exception as e:
+        message = f"Error opening folder: {str(e)}"
+        logger.error(message)
+        return False, message
+
+
 def open_chrome_with_url(url: str) -> Tuple[bool, str]:
     """
     Open Chrome browser with a specific URL.
@@ -262,8 +372,9 @@ def open_chrome_with_url(url: str) -> Tuple[bool, str]:
             url = f"https://{url}"
 
         # Try to open in Chrome
-        if config.CHROME_PATH:
-            subprocess.Popen([config.CHROME_PATH, url])
+        chrome = chrome_path()
+        if chrome:
+            subprocess.Popen([chrome, url])
             message = f"Opened {url} in Chrome"
             logger.info(message)
             return True, message
@@ -317,44 +428,6 @@ def play_on_youtube(query: str) -> Tuple[bool, str]:
         return False, message
 
 
-def extract_youtube_query(command: str) -> str:
-    """
-    Extract video/song name from various YouTube command formats.
-
-    Handles variations like:
-    - "play coldplay on youtube" -> "coldplay"
-    - "search for python tutorial on youtube" -> "python tutorial"
-    - "youtube despacito" -> "despacito"
-    - "play some coldplay music" -> "coldplay music"
-
-    Args:
-        command: The voice command string
-
-    Returns:
-        Extracted query string
-    """
-    command = command.lower().strip()
-
-    # Remove common trigger phrases
-    patterns_to_remove = [
-        "play ",
-        "search ",
-        "search for ",
-        "on youtube",
-        "in youtube",
-        "youtube ",
-        "on yt",
-        "play on youtube ",
-        "some ",
-        "music",
-    ]
-
-    for pattern in patterns_to_remove:
-        command = command.replace(pattern, "")
-
-    return command.strip()
-
-
 # ==================== SYSTEM INFORMATION ====================
 def get_current_time() -> str:
     """
@@ -529,6 +602,7 @@ def clean_downloads_folder() -> Tuple[bool, str]:
         # Move files
         moved_count = 0
         for file_path in files:
+            check_cancelled()  # Stop between files if the command was cancelled
             extension = file_path.suffix.lower()
             moved = False
 
@@ -557,6 +631,9 @@ def clean_downloads_folder() -> Tuple[bool, str]:
         logger.info(message)
         return True, message
 
+    except CommandCancelled:
+        raise
+
     except Exception as e:
         message = f"Error cleaning downloads: {str(e)}"
         logger.error(message)
@@ -629,43 +706,65 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
-# ==================== COMMAND PARSING ====================
-def extract_youtube_query(command: str) -> Optional[str]:
+# ==================== USER PROMPTS ====================
+# Handlers running on the command executor may ask the user a question while
+# the listen loop is also listening. Prompts take turns, the loop waits for
+# them to finish and discards anything it heard while one was active.
+_prompt_lock = threading.Lock()
+_prompt_generation = 0
+
+
+@contextmanager
+def user_prompt():
+    """Context manager held by a handler while it asks the user something"""
+    global _prompt_generation
+    with _prompt_lock:
+        _prompt_generation += 1
+        yield
+
+
+def prompt_active() -> bool:
+    """True while a handler is prompting the user"""
+    return _prompt_lock.locked()
+
+
+def prompt_generation() -> int:
+    """Number of prompts started so far (changes when a prompt begins)"""
+    return _prompt_generation
+
+
+def match_confirmation(response: str) -> Optional[bool]:
     """
-    Extract the search query from a YouTube command.
-    Handles variations like "play X on youtube", "search X youtube", etc.
+    Map a spoken answer to yes/no using config.CONFIRMATION_PHRASES.
+
+    Phrases match on whole words; if both a yes and a no phrase are heard
+    ("no, don't do it"), the answer is no.
 
     Args:
-        command: Raw voice command
+        response: Recognized answer text
 
     Returns:
-        Extracted search query or None
-    """
-    command_lower = command.lower()
-
-    # Try different patterns
-    patterns = [
-        ("play ", " on youtube"),
-        ("play ", " youtube"),
-        ("search ", " on youtube"),
-        ("search ", " youtube"),
-        ("play ", ""),
-    ]
-
-    for start, end in patterns:
-        if start in command_lower:
-            query = command_lower.split(start, 1)[1]
-            if end and end in query:
-                query = query.split(end)[0]
-            return query.strip()
-
-    return None
+        True for yes, False for no, None if no phrase matched
+    """
+    words = f" {response.lower().strip()} "
+    answers = {
+        confirmed for phrase, confirmed in config.CONFIRMATION_PHRASES.items()
+        if f" {phrase} " in words
+    }
+    if False in answers:
+        return False
+    return True if answers else None
 
 
 def ask_confirmation(action: str, timeout: int = 10) -> bool:
     """
     Ask user for confirmation before critical action.
 
+    With ENABLE_FAST_CONFIRMATION the answer is decoded by a grammar-restricted
+    recognizer that only knows the confirmation phrases and stops on a short
+    trailing silence, so prompts resolve well under a second after the user
+    answers.
+
     Args:
         action: Description of action (e.g., "delete files")
         timeout: Seconds to wait for response (default: 10)
@@ -674,34 +773,37 @@ def ask_confirmation(action: str, timeout: int = 10) -> bool:
         True if user confirms, False otherwise
     """
     try:
-        speak(f"Are you sure you want to {action}? Say yes or no.")
-        logger.info(f"Asking confirmation for: {action}")
-
-        # Listen for response
-        response = listen_for_command(timeout=timeout)
+        with user_prompt():
+            speak(f"Are you sure you want to {action}? Say yes or no.")
+            logger.info(f"Asking confirmation for: {action}")
+
+            # Listen for response
+            if config.ENABLE_FAST_CONFIRMATION:
+                response = get_audio_handler().listen_for_phrase(
+                    list(config.CONFIRMATION_PHRASES),
+                    timeout=timeout,
+                    trailing_silence=config.CONFIRMATION_TRAILING_SILENCE,
+                    silence_threshold=config.SILENCE_THRESHOLD
+                )
+            else:
+                response = listen_for_command(timeout=timeout)
 
         if not response:
             speak("I didn't hear a response. Cancelling for safety.")
             logger.warning("No confirmation response received")
             return False
 
-        response_lower = response.lower().strip()
-
-        # Check for confirmation
-        yes_phrases = ["yes", "yeah", "sure", "confirm", "do it", "go ahead", "proceed", "ok", "okay", "affirmative"]
-        no_phrases = ["no", "nope", "cancel", "don't", "stop", "nevermind", "never mind", "negative"]
+        confirmed = match_confirmation(response)
 
-        for phrase in yes_phrases:
-            if phrase in response_lower:
-                speak("Confirmed. Proceeding.")
-                logger.info(f"Action confirmed: {action}")
-                return True
+        if confirmed:
+            speak("Confirmed. Proceeding.")
+            logger.info(f"Action confirmed: {action}")
+            return True
 
-        for phrase in no_phrases:
-            if phrase in response_lower:
-                speak("Cancelled.")
-                logger.info(f"Action cancelled: {action}")
-                return False
+        if confirmed is False:
+            speak("Cancelled.")
+            logger.info(f"Action cancelled: {action}")
+            return False
 
         # Unclear response
         speak("I didn't understand. Cancelling for safety.")
@@ -726,6 +828,9 @@ def check_for_shutdown(command: str) -> bool:
     - "stop gideon" / "gideon stop"
     - Simple: "quit", "exit", "goodbye" (as fallbacks)
 
+    Phrases match whole words only, so "quite" never triggers "quit".
+    The listen loop gets the same answer from Utterance.is_shutdown.
+
     Args:
         command: Voice command to check
 
@@ -735,49 +840,28 @@ def check_for_shutdown(command: str) -> bool:
     if not command:
         return False
 
-    command_lower = command.lower().strip()
-
-    # Remove common filler words for better matching
-    filler_words = ["please", "can you", "could you", "would you", "now", "the", "application"]
-    for filler in filler_words:
-        command_lower = command_lower.replace(filler, "").strip()
-
-    # Priority exit phrases (most reliable)
-    priority_exits = [
-        "quit gideon",
-        "gideon quit",
-        "exit gideon",
-        "gideon exit",
-        "goodbye gideon",
-        "gideon goodbye",
-        "stop gideon",
-        "gideon stop",
-        "close gideon",
-        "gideon close"
-    ]
-
-    # Check priority exits first
-    for trigger in priority_exits:
-        if trigger in command_lower:
-            logger.info(f"Shutdown triggered by priority command: {command}")
-            return True
-
-    # Check for standalone exit words (only if they're the complete command)
-    # This prevents false positives like "exit vim" or "quit chrome"
-    standalone_exits = ["quit", "exit", "goodbye", "bye"]
-    if command_lower in standalone_exits:
-        logger.info(f"Shutdown triggered by standalone command: {command}")
+    if is_shutdown_text(clean_text(command)):
+        logger.info(f"Shutdown triggered by command: {command}")
         return True
 
-    # Check all other triggers from config
-    for trigger in config.SHUTDOWN_TRIGGERS:
-        if trigger in command_lower:
-            logger.info(f"Shutdown triggered by config trigger: {command}")
-            return True
-
     return False
 
 
+def check_for_cancel(command: str) -> bool:
+    """
+    Check if the command asks to cancel the running command(s).
+
+    Args:
+        command: Voice command to check
+
+    Returns:
+        True if the whole command is a cancel phrase (e.g. "cancel that")
+    """
+    if not command:
+        return False
+    return clean_text(command) in config.CANCEL_PHRASES
+
+
 def normalize_command(command: str) -> str:
     """
     Normalize a command by applying aliases and cleaning.
@@ -788,14 +872,7 @@ def normalize_command(command: str) -> str:
     Returns:
         Normalized command string
     """
-    command_lower = command.lower().strip()
-
-    # Check aliases
-    for base_command, aliases in config.COMMAND_ALIASES.items():
-        if command_lower in aliases:
-            return base_command
-
-    return command_lower
+    return resolve_alias(clean_text(command))
 
 
 # ==================== VALIDATION ====================
@@ -0,0 +1,200 @@
+"""
+Gideon Utterance Normalization
+==============================
+Turns a recognized command into one canonical Utterance, computed once and
+used by the shutdown check, cancellation, dispatch and parameter extraction.
+
+The stage runs the following steps:
+- Lowercase the text and collapse whitespace
+- Detect the language and translate Roman Urdu to English
+- Strip a leading wake word ("hey gideon open chrome" -> "open chrome")
+- Resolve command aliases with a dict lookup ("what's the time" -> "time")
+- Check for shutdown with one precompiled regex over both the original
+  and the translated text
+
+The compiled rules are built from config on first use. Call
+reset_normalization() after changing config.WAKE_WORDS,
+config.SHUTDOWN_TRIGGERS or config.COMMAND_ALIASES (registry_loader does
+this on every reload).
+
+Author: Muhammad Ali (CodeCelix Internship)
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional, Pattern
+
+import config
+import multilingual
+
+logger = logging.getLogger("Gideon.Utterance")
+
+# Shutdown phrases recognized on top of config.SHUTDOWN_TRIGGERS
+PRIORITY_EXITS = [
+    "quit gideon", "gideon quit", "exit gideon", "gideon exit",
+    "goodbye gideon", "gideon goodbye", "stop gideon", "gideon stop",
+    "close gideon", "gideon close",
+]
+
+# Exit words that only count as the complete command
+STANDALONE_EXITS = {"quit", "exit", "goodbye", "bye"}
+
+# Politeness words ignored by the shutdown check
+FILLER_WORDS = ["please", "can you", "could you", "would you", "now", "the", "application"]
+
+
+class Utterance:
+    """
+    A recognized command after normalization.
+
+    Attributes:
+        raw: Text as recognized
+        text: Lowercased, whitespace-collapsed text
+        language: "english", "urdu" or "mixed"
+        english: English text (translated from Roman Urdu when needed)
+        was_translated: True if english differs from text by translation
+        wake_word: Leading wake word that was stripped, if any
+        command: English text without the wake word
+        canonical: command with aliases resolved (what dispatch matches on)
+        tokens: Words of canonical
+        is_shutdown: True if the utterance asks Gideon to shut down
+    """
+
+    def __init__(
+        self,
+        raw: str,
+        text: str,
+        language: str,
+        english: str,
+        was_translated: bool,
+        wake_word: Optional[str],
+        command: str,
+        canonical: str,
+        is_shutdown: bool
+    ):
+        self.raw = raw
+        self.text = text
+        self.language = language
+        self.english = english
+        self.was_translated = was_translated
+        self.wake_word = wake_word
+        self.command = command
+        self.canonical = canonical
+        self.tokens = canonical.split()
+        self.is_shutdown = is_shutdown
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        """Metadata in the format of multilingual.process_multilingual_command"""
+        return {
+            "original_command": self.raw,
+            "language": self.language,
+            "was_translated": str(self.was_translated),
+            "english_command": self.english,
+        }
+
+    def __repr__(self) -> str:
+        return f"Utterance({self.raw!r} -> {self.canonical!r})"
+
+
+# ==================== COMPILED RULES ====================
+
+class _NormalizationRules:
+    """Regexes and lookup tables compiled once from config"""
+
+    def __init__(self):
+        self.wake_word = _phrase_regex(config.WAKE_WORDS, prefix=r"^", suffix=r"\s+")
+        self.fillers = _phrase_regex(FILLER_WORDS, prefix=r"\b", suffix=r"\b")
+        self.shutdown = _phrase_regex(PRIORITY_EXITS + list(config.SHUTDOWN_TRIGGERS), prefix=r"\b", suffix=r"\b")
+        self.aliases: Dict[str, str] = {
+            alias.lower(): base for base, aliases in config.COMMAND_ALIASES.items() for alias in aliases
+        }
+
+
+def _phrase_regex(phrases: List[str], prefix: str, suffix: str) -> Pattern:
+    """One alternation of phrases, longest first so "hey gideon" beats "gideon" """
+    ordered = sorted({" ".join(p.lower().split()) for p in phrases}, key=len, reverse=True)
+    alternation = "|".join(re.escape(p).replace(r"\ ", r"\s+") for p in ordered)
+    return re.compile(f"{prefix}(?:{alternation}){suffix}")
+
+
+_rules: Optional[_NormalizationRules] = None
+
+
+def _get_rules() -> _NormalizationRules:
+    """Get the compiled rules, building them on first use"""
+    global _rules
+
+    if _rules is None:
+        _rules = _NormalizationRules()
+    return _rules
+
+
+def reset_normalization() -> None:
+    """Recompile the rules from config (the old rules serve until the new ones are ready)"""
+    global _rules
+    _rules = _NormalizationRules()
+
+
+# ==================== NORMALIZATION ====================
+
+def clean_text(text: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return " ".join(text.lower().split())
+
+
+def strip_wake_word(text: str) -> str:
+    """Remove a leading wake word from cleaned text"""
+    return _get_rules().wake_word.sub("", text, count=1)
+
+
+def resolve_alias(text: str) -> str:
+    """Map an alias ("what's the time") to its base command ("time")"""
+    return _get_rules().aliases.get(text, text)
+
+
+def is_shutdown_text(text: str) -> bool:
+    """
+    Check cleaned text for a shutdown request.
+
+    Shutdown phrases must appear as whole words ("quit gideon", "exit"),
+    so words such as "quite" or "exited" never trigger it. A bare exit
+    word like "bye" only counts as the complete command.
+    """
+    rules = _get_rules()
+    if rules.shutdown.search(text):
+        return True
+    without_fillers = " ".join(rules.fillers.sub(" ", text).split())
+    return without_fillers in STANDALONE_EXITS or bool(rules.shutdown.search(without_fillers))
+
+
+def normalize_utterance(raw: str, translate: bool = True) -> Utterance:
+    """
+    Normalize a recognized command in a single pass.
+
+    Args:
+        raw: Recognized text
+        translate: Translate Roman Urdu (False for text already in English)
+
+    Returns:
+        The canonical Utterance
+    """
+    text = clean_text(raw)
+
+    if translate:
+        language = multilingual.detect_language(text)
+        english, was_translated = multilingual.translate_urdu_to_english(text)
+        english = clean_text(english)
+    else:
+        language, english, was_translated = "english", text, False
+
+    match = _get_rules().wake_word.match(english)
+    wake_word = match.group(0).strip() if match else None
+    command = english[match.end():] if match else english
+    canonical = resolve_alias(command)
+
+    is_shutdown = is_shutdown_text(text) or (english != text and is_shutdown_text(english))
+    if is_shutdown:
+        logger.info(f"Shutdown requested: {raw}")
+
+    return Utterance(raw, text, language, english, was_translated, wake_word, command, canonical, is_shutdown)
@@ -84,6 +84,22 @@ MODELS = {
 }
 
 
+def resolve_model_path(model: str, model_dir: str = ".") -> Path:
+    """
+    Turn a model key (e.g. "large-en") or a directory into a model path.
+
+    Args:
+        model: Key from MODELS or path to a model directory
+        model_dir: Directory the models were downloaded into
+
+    Returns:
+        Path to the model directory
+    """
+    if model in MODELS:
+        return Path(model_dir) / MODELS[model]["name"]
+    return Path(model)
+
+
 class DownloadProgressBar(tqdm):
     """Progress bar for file downloads"""
 